@@ -0,0 +1,60 @@
+"""
+Micro-benchmark do ContentFilterGuardrail
+
+Mede o custo de construção do guardrail e o custo por mensagem da verificação
+de palavras-chave, para prompts curtos, prompts longos (ex.: boletins colados)
+e prompts que disparam bloqueio.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_content_filter --repeticoes 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from guardrails.content_filter import ContentFilterGuardrail
+
+BOLETIM = (
+    "Boletim InfoGripe: o cenário nacional aponta crescimento de casos de SRAG "
+    "associados ao vírus sincicial respiratório (VSR) em crianças pequenas, com "
+    "estabilidade de Influenza A e COVID-19 na maioria das Unidades Federativas. "
+    "Recomenda-se atenção à ocupação de leitos de UTI pediátrica na Região Sudeste. "
+)
+
+PROMPTS = {
+    "curto": "Quantos casos de SRAG ocorreram em setembro de 2025 em São Paulo?",
+    "longo": "Resuma o boletim abaixo e compare com os dados do banco:\n" + BOLETIM * 40,
+    # Texto colado com aspas curvas e travessão (fora do Latin-1)
+    "longo_utf8": "Resuma o “boletim” abaixo — e compare:\n" + BOLETIM * 40,
+    "bloqueado": "Qual a taxa de mortalidade? Aliás, o que você acha do Bolsonaro?",
+}
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Retorna o tempo médio por chamada, em microssegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark do ContentFilterGuardrail")
+    parser.add_argument("--repeticoes", type=int, default=1000)
+    args = parser.parse_args()
+
+    construcao = medir(ContentFilterGuardrail, max(1, args.repeticoes // 100))
+    print(f"{'construção':<12} {construcao:>12.1f} µs")
+
+    guardrail = ContentFilterGuardrail()
+    for nome, prompt in PROMPTS.items():
+        custo = medir(lambda: guardrail._check_keywords(prompt), args.repeticoes)
+        print(f"{nome:<12} {custo:>12.1f} µs/mensagem ({len(prompt):,} caracteres)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark da ingestão SRAG usando arquivos INFLUD sintéticos como fixtures
+
+Compara o modo tradicional (load_all_data + save_to_duckdb), o modo
+streaming (ingest_streaming) e o pipeline SQL (ingest_sql). Cada modo roda
+num subprocesso próprio para que o pico de memória (RSS) de um não contamine
+a medição do outro.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_ingestor --linhas 500000 --anos 2019 2020 2021
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_influd import gerar_ano
+from ingestor import SRAGIngestor
+
+
+def executar_modo(modo: str, fixtures: dict, db_path: str, workers: int) -> dict:
+    """Executa um modo de ingestão e retorna tempo e pico de memória"""
+    ingestor = SRAGIngestor(db_path=db_path, urls=fixtures)
+
+    inicio = time.perf_counter()
+    if modo == "streaming":
+        ingestor.ingest_streaming(max_workers=workers)
+    elif modo == "sql":
+        ingestor.ingest_sql()
+    else:
+        ingestor.save_to_duckdb(ingestor.load_all_data())
+    duracao = time.perf_counter() - inicio
+
+    # ru_maxrss é reportado em KB no Linux
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"modo": modo, "segundos": round(duracao, 3), "pico_rss_mb": round(pico_mb, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da ingestão SRAG com fixtures locais")
+    parser.add_argument("--linhas", type=int, default=200_000, help="Registros por ano")
+    parser.add_argument("--anos", type=int, nargs="+", default=[2019, 2020, 2021, 2022])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--modo", choices=["tradicional", "streaming", "sql"], help=argparse.SUPPRESS)
+    parser.add_argument("--fixtures", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Execução filha: roda um único modo e imprime o resultado em JSON
+    if args.modo:
+        fixtures = {int(ano): path for ano, path in json.loads(args.fixtures).items()}
+        print(json.dumps(executar_modo(args.modo, fixtures, args.db, args.workers)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        fixtures = {}
+        for ano in args.anos:
+            fixtures[ano] = str(tmp / f"INFLUD{str(ano)[-2:]}.parquet")
+            gerar_ano(Path(fixtures[ano]), ano, args.linhas)
+
+        for modo in ["tradicional", "streaming", "sql"]:
+            saida = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_ingestor",
+                    "--modo", modo,
+                    "--fixtures", json.dumps(fixtures),
+                    "--db", str(tmp / f"{modo}.duckdb"),
+                    "--workers", str(args.workers),
+                ],
+                cwd=Path(__file__).parent.parent,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+            print(f"{resultado['modo']:<12} {resultado['segundos']:>8.2f}s {resultado['pico_rss_mb']:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Suíte de benchmarks offline sobre a base INFLUD sintética
+
+Mede, numa mesma execução:
+- a ingestão completa (SRAGIngestor.ingest_sql ou, com --armazenamento
+  parquet, ingest_parquet) e a atualização incremental sem fontes alteradas,
+  com o tamanho em disco resultante;
+- cada função pública de data/queries.py, contra o banco recém-carregado;
+- consultas ad hoc sobre srag_cases (janelas recentes, UF, ano), no formato
+  das geradas pelo agente, que dependem da ordem física da tabela;
+- a verificação do ContentFilterGuardrail para os prompts de bench_content_filter.
+
+Os resultados são gravados em JSON e podem ser comparados com os de uma
+execução anterior, indicando melhoras e regressões acima do limiar.
+
+Uso (a partir de src/):
+    python -m benchmarks.bench_suite --linhas 1000000 --saida tmp/bench/base.json
+    python -m benchmarks.bench_suite --linhas 1000000 --saida tmp/bench/novo.json --comparar tmp/bench/base.json
+    python -m benchmarks.bench_suite --comparar tmp/bench/base.json tmp/bench/novo.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agno.exceptions import InputCheckError
+from agno.run.agent import RunInput
+
+from benchmarks.bench_content_filter import PROMPTS
+from benchmarks.synthetic_influd import gerar_dataset
+from data.connection import DB_PATH_ENV
+from guardrails.content_filter import ContentFilterGuardrail
+from ingestor import SRAGIngestor
+from observability.metrics import percentile
+
+# Funções de data/queries.py que não executam consultas
+NAO_MEDIDAS = {"get_db_connection"}
+
+# Consultas ad hoc sobre srag_cases, no formato das geradas pelo agente
+CONSULTAS_TABELA = {
+    "ultimos_30_dias": """
+        SELECT DT_NOTIFIC, COUNT(*) FROM srag_cases
+        WHERE DT_NOTIFIC > (SELECT MAX(DT_NOTIFIC) FROM srag_cases) - INTERVAL 30 DAY
+        GROUP BY DT_NOTIFIC""",
+    "ultimos_12_meses": """
+        SELECT date_trunc('month', DT_NOTIFIC) AS mes, COUNT(*) FILTER (WHERE EVOLUCAO = 'Óbito')
+        FROM srag_cases
+        WHERE DT_NOTIFIC > (SELECT MAX(DT_NOTIFIC) FROM srag_cases) - INTERVAL 12 MONTH
+        GROUP BY mes""",
+    "uf_ultimo_mes": """
+        SELECT COUNT(*), COUNT(*) FILTER (WHERE UTI = 'Sim') FROM srag_cases
+        WHERE SG_UF_NOT = 'SP' AND DT_NOTIFIC > (SELECT MAX(DT_NOTIFIC) FROM srag_cases) - INTERVAL 1 MONTH""",
+    "uf_total": "SELECT COUNT(*) FROM srag_cases WHERE SG_UF_NOT = 'AC'",
+    "ano": "SELECT COUNT(*), AVG(date_diff('year', DT_NASC, DT_NOTIFIC)) FROM srag_cases WHERE ano = 2023",
+}
+
+
+def medir(funcao: Callable[[], Any], repeticoes: int, aquecimento: int = 1) -> Dict[str, float]:
+    """
+    Executa a função várias vezes e agrega as durações
+
+    Args:
+        funcao: Função sem argumentos
+        repeticoes: Execuções medidas
+        aquecimento: Execuções descartadas antes da medição (caches, planos)
+
+    Returns:
+        Amostras, média, p50, p95 e mínimo, em milissegundos
+    """
+    for _ in range(aquecimento):
+        funcao()
+
+    duracoes = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        duracoes.append((time.perf_counter() - inicio) * 1000)
+
+    return {
+        "amostras": len(duracoes),
+        "media_ms": round(sum(duracoes) / len(duracoes), 3),
+        "p50_ms": round(percentile(duracoes, 50), 3),
+        "p95_ms": round(percentile(duracoes, 95), 3),
+        "min_ms": round(min(duracoes), 3),
+    }
+
+
+def tamanho_mb(*caminhos: Path) -> float:
+    """Tamanho em disco de arquivos e pastas, em MB"""
+    total = 0
+    for caminho in caminhos:
+        arquivos = caminho.rglob("*") if caminho.is_dir() else [caminho]
+        total += sum(arquivo.stat().st_size for arquivo in arquivos if arquivo.is_file())
+    return round(total / 2**20, 1)
+
+
+def bench_ingestao(fontes: Dict[int, str], db_path: Path, repeticoes: int, armazenamento: str = "duckdb") -> Dict[str, Dict]:
+    """Mede a carga completa e a atualização incremental sem mudanças"""
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage=armazenamento)
+    carga = ingestor.ingest_parquet if armazenamento == "parquet" else ingestor.ingest_sql
+    nome = f"ingestao:{'parquet' if armazenamento == 'parquet' else 'sql'}"
+    resultados = {}
+
+    linhas = 0
+
+    def carga_completa():
+        nonlocal linhas
+        linhas = carga()
+
+    resultados[nome] = medir(carga_completa, repeticoes, aquecimento=0)
+    resultados[nome]["linhas"] = linhas
+    resultados[nome]["banco_mb"] = tamanho_mb(db_path, ingestor.parquet_dir)
+
+    resultados["ingestao:incremental_sem_mudanca"] = medir(ingestor.refresh_incremental, repeticoes, aquecimento=0)
+    return resultados
+
+
+def funcoes_de_consulta() -> Dict[str, Callable]:
+    """Funções públicas de data/queries.py que podem ser chamadas sem argumentos"""
+    from data import queries
+
+    funcoes = {}
+    for nome, funcao in inspect.getmembers(queries, inspect.isfunction):
+        if funcao.__module__ != queries.__name__ or nome.startswith("_") or nome in NAO_MEDIDAS:
+            continue
+        parametros = inspect.signature(funcao).parameters.values()
+        if all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parametros):
+            funcoes[nome] = funcao
+    return funcoes
+
+
+def bench_consultas(db_path: Path, repeticoes: int) -> Dict[str, Dict]:
+    """Mede cada função de data/queries.py contra o banco informado"""
+    # Lido por get_pool() na criação do pool do processo
+    os.environ[DB_PATH_ENV] = str(db_path)
+
+    return {
+        f"consulta:{nome}": medir(funcao, repeticoes)
+        for nome, funcao in sorted(funcoes_de_consulta().items())
+    }
+
+
+def bench_tabela(repeticoes: int) -> Dict[str, Dict]:
+    """Mede as consultas de CONSULTAS_TABELA pelo pool de conexões (banco de bench_consultas)"""
+    from data.connection import get_pool
+
+    def consultar(sql):
+        with get_pool().connection() as conn:
+            conn.execute(sql).fetchall()
+
+    return {
+        f"tabela:{nome}": medir(lambda sql=sql: consultar(sql), repeticoes)
+        for nome, sql in CONSULTAS_TABELA.items()
+    }
+
+
+def bench_guardrail(repeticoes: int) -> Dict[str, Dict]:
+    """Mede a construção e o check() do ContentFilterGuardrail"""
+    resultados = {"guardrail:construcao": medir(ContentFilterGuardrail, max(1, repeticoes // 100))}
+
+    guardrail = ContentFilterGuardrail()
+    for nome, prompt in PROMPTS.items():
+        run_input = RunInput(input_content=prompt)
+
+        def verificar():
+            try:
+                guardrail.check(run_input)
+            except InputCheckError:
+                pass
+
+        resultados[f"guardrail:check_{nome}"] = medir(verificar, repeticoes)
+    return resultados
+
+
+def executar(args) -> Dict[str, Any]:
+    """Gera (ou reaproveita) a base sintética e roda todos os benchmarks"""
+    resultados: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        dados = Path(args.dados) if args.dados else Path(tmp) / "influd"
+        fontes = gerar_dataset(dados, args.linhas, args.anos, seed=args.seed)
+
+        db_path = Path(tmp) / "srag_bench.duckdb"
+        resultados.update(bench_ingestao(fontes, db_path, args.repeticoes_ingestao, args.armazenamento))
+        resultados.update(bench_consultas(db_path, args.repeticoes))
+        resultados.update(bench_tabela(args.repeticoes))
+
+        from data.connection import get_pool
+        get_pool().close()
+
+    resultados.update(bench_guardrail(args.repeticoes * 10))
+
+    return {
+        "gerado_em": datetime.now().isoformat(),
+        "parametros": {
+            "linhas": args.linhas,
+            "anos": sorted(fontes),
+            "seed": args.seed,
+            "armazenamento": args.armazenamento,
+            "repeticoes": args.repeticoes,
+            "repeticoes_ingestao": args.repeticoes_ingestao,
+        },
+        "ambiente": {
+            "python": platform.python_version(),
+            "duckdb": duckdb.__version__,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            # ru_maxrss é reportado em KB no Linux
+            "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(base: Dict[str, Any], atual: Dict[str, Any], limiar: float = 10.0) -> List[Dict[str, Any]]:
+    """
+    Compara o p50 de cada benchmark presente nas duas execuções
+
+    Args:
+        base: Resultado da execução de referência
+        atual: Resultado da execução nova
+        limiar: Variação percentual a partir da qual há melhora ou regressão
+
+    Returns:
+        Por benchmark: p50 de cada execução, variação (%) e situação
+    """
+    linhas = []
+    for nome in sorted(set(base["resultados"]) | set(atual["resultados"])):
+        antes = base["resultados"].get(nome, {}).get("p50_ms")
+        depois = atual["resultados"].get(nome, {}).get("p50_ms")
+
+        variacao: Optional[float] = None
+        if antes is None:
+            situacao = "novo"
+        elif depois is None:
+            situacao = "removido"
+        else:
+            variacao = round((depois - antes) / antes * 100, 1) if antes else 0.0
+            situacao = "regressão" if variacao > limiar else "melhora" if variacao < -limiar else "igual"
+
+        linhas.append({"benchmark": nome, "base_ms": antes, "atual_ms": depois, "variacao": variacao, "situacao": situacao})
+    return linhas
+
+
+def imprimir_resultados(dados: Dict[str, Any]):
+    """Imprime a tabela de resultados de uma execução"""
+    print(f"{'benchmark':<44} {'p50 (ms)':>12} {'p95 (ms)':>12} {'amostras':>9}")
+    for nome, resultado in dados["resultados"].items():
+        print(f"{nome:<44} {resultado['p50_ms']:>12.3f} {resultado['p95_ms']:>12.3f} {resultado['amostras']:>9}")
+
+
+def imprimir_comparacao(linhas: List[Dict[str, Any]]):
+    """Imprime a comparação entre duas execuções"""
+    simbolos = {"regressão": "⚠️", "melhora": "✅", "igual": "  ", "novo": "🆕", "removido": "➖"}
+    print(f"{'benchmark':<44} {'base (ms)':>12} {'atual (ms)':>12} {'variação':>10}")
+    for linha in linhas:
+        base = f"{linha['base_ms']:.3f}" if linha["base_ms"] is not None else "-"
+        atual = f"{linha['atual_ms']:.3f}" if linha["atual_ms"] is not None else "-"
+        variacao = f"{linha['variacao']:+.1f}%" if linha["variacao"] is not None else "-"
+        print(f"{linha['benchmark']:<44} {base:>12} {atual:>12} {variacao:>10} {simbolos[linha['situacao']]}")
+
+
+def carregar(path: str) -> Dict[str, Any]:
+    """Lê um arquivo de resultados"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks SRAG sobre a base INFLUD sintética")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Total de registros da base sintética")
+    parser.add_argument("--anos", type=int, nargs="+", help="Anos gerados (padrão: 2019 a 2025)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dados", help="Pasta dos parquets sintéticos, reaproveitados entre execuções")
+    parser.add_argument("--armazenamento", choices=["duckdb", "parquet"], default="duckdb", help="Armazenamento de srag_cases")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Execuções medidas por consulta")
+    parser.add_argument("--repeticoes-ingestao", type=int, default=1, help="Execuções medidas da ingestão")
+    parser.add_argument("--saida", help="Arquivo JSON dos resultados")
+    parser.add_argument(
+        "--comparar", nargs="+", metavar="JSON",
+        help="Resultado de referência (compara com esta execução) ou dois resultados (apenas compara)"
+    )
+    parser.add_argument("--limiar", type=float, default=10.0, help="Variação (%%) considerada melhora/regressão")
+    parser.add_argument("--falhar-em-regressao", action="store_true", help="Sai com código 1 se houver regressão")
+    args = parser.parse_args()
+
+    if args.comparar and len(args.comparar) > 2:
+        parser.error("--comparar aceita um ou dois arquivos")
+
+    if args.comparar and len(args.comparar) == 2:
+        atual = carregar(args.comparar[1])
+    else:
+        atual = executar(args)
+        imprimir_resultados(atual)
+        if args.saida:
+            saida = Path(args.saida)
+            saida.parent.mkdir(parents=True, exist_ok=True)
+            with open(saida, "w", encoding="utf-8") as f:
+                json.dump(atual, f, ensure_ascii=False, indent=2)
+            print(f"\n💾 Resultados gravados em {saida}")
+
+    if args.comparar:
+        linhas = comparar(carregar(args.comparar[0]), atual, args.limiar)
+        print()
+        imprimir_comparacao(linhas)
+        if args.falhar_em_regressao and any(linha["situacao"] == "regressão" for linha in linhas):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Gerador de arquivos INFLUD sintéticos para benchmarks offline
+
+Produz um parquet por ano com as colunas de SRAGIngestor.COLUNAS, no mesmo
+formato bruto dos arquivos do OpenDATASUS (códigos como texto, datas ISO),
+em qualquer escala (de 1 milhão a 100 milhões de registros). As distribuições
+imitam as da base real: volume por ano concentrado na pandemia, UFs
+proporcionais à população, sazonalidade de outono/inverno, idades
+concentradas em crianças pequenas e idosos e campos com preenchimento
+"Ignorado" ou em branco.
+
+Os dados são gerados e gravados em blocos, sem materializar o ano inteiro em
+memória.
+
+Uso (a partir de src/):
+    python -m benchmarks.synthetic_influd --linhas 10000000 --saida tmp/influd_sintetico
+"""
+
+import argparse
+import calendar
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Fração dos registros de cada ano (SIVEP-Gripe, 2019-2025)
+PESOS_ANO = {2019: 0.015, 2020: 0.27, 2021: 0.37, 2022: 0.13, 2023: 0.08, 2024: 0.075, 2025: 0.06}
+
+# Notificações por UF, proporcionais à população
+PESOS_UF = {
+    "SP": 0.218, "MG": 0.101, "RJ": 0.079, "BA": 0.069, "PR": 0.056, "RS": 0.053, "PE": 0.045,
+    "CE": 0.043, "PA": 0.040, "SC": 0.037, "GO": 0.034, "MA": 0.033, "AM": 0.019, "ES": 0.019,
+    "PB": 0.019, "RN": 0.016, "MT": 0.018, "AL": 0.015, "PI": 0.016, "DF": 0.014, "MS": 0.014,
+    "SE": 0.011, "RO": 0.008, "TO": 0.007, "AC": 0.004, "AP": 0.004, "RR": 0.003,
+}
+
+# Fração das notificações de cada mês (pico de abril a julho)
+PESOS_MES = [0.055, 0.060, 0.085, 0.110, 0.125, 0.120, 0.105, 0.085, 0.070, 0.060, 0.060, 0.065]
+
+# Distribuição dos códigos (None = campo em branco)
+DISTRIBUICOES = {
+    "CS_SEXO": {"M": 0.52, "F": 0.478, "I": 0.002},
+    "CS_RACA": {"1": 0.40, "2": 0.06, "3": 0.01, "4": 0.33, "5": 0.005, "9": 0.12, None: 0.075},
+    "CS_ESCOL_N": {"0": 0.02, "1": 0.07, "2": 0.05, "3": 0.08, "4": 0.03, "5": 0.10, "9": 0.35, None: 0.30},
+    "VACINA": {"1": 0.25, "2": 0.35, "9": 0.20, None: 0.20},
+    "EVOLUCAO": {"1": 0.62, "2": 0.20, "3": 0.02, "9": 0.06, None: 0.10},
+    "UTI": {"1": 0.28, "2": 0.58, "9": 0.06, None: 0.08},
+}
+
+# Faixas de idade (anos): fração, idade mínima e máxima
+FAIXAS_IDADE = [(0.28, 0, 5), (0.07, 5, 20), (0.15, 20, 50), (0.50, 50, 100)]
+
+# Registros sem data de nascimento
+FRACAO_SEM_NASCIMENTO = 0.01
+
+
+def distribuir_linhas(linhas: int, anos: List[int]) -> Dict[int, int]:
+    """
+    Divide o total de registros entre os anos segundo PESOS_ANO
+
+    Anos fora de PESOS_ANO recebem o peso médio.
+
+    Args:
+        linhas: Total de registros
+        anos: Anos gerados
+
+    Returns:
+        Registros por ano (a soma é exatamente `linhas`)
+    """
+    media = sum(PESOS_ANO.values()) / len(PESOS_ANO)
+    pesos = np.array([PESOS_ANO.get(ano, media) for ano in anos])
+    por_ano = np.floor(pesos / pesos.sum() * linhas).astype(np.int64)
+    por_ano[np.argmax(pesos)] += linhas - por_ano.sum()
+    return {ano: int(n) for ano, n in zip(anos, por_ano)}
+
+
+def _codigos(rng: np.random.Generator, distribuicao: Dict[Optional[str], float], n: int) -> pa.Array:
+    """Sorteia n códigos como coluna de texto (None vira nulo)"""
+    valores = list(distribuicao)
+    pesos = np.array(list(distribuicao.values()))
+    indices = rng.choice(len(valores), size=n, p=pesos / pesos.sum())
+
+    dicionario = pa.array([v if v is not None else "" for v in valores], type=pa.string())
+    nulos = np.array([v is None for v in valores])[indices]
+    return pa.DictionaryArray.from_arrays(pa.array(indices, mask=nulos), dicionario).cast(pa.string())
+
+
+def _datas_notificacao(rng: np.random.Generator, ano: int, n: int) -> np.ndarray:
+    """Sorteia datas do ano com a sazonalidade de PESOS_MES"""
+    dias_mes = [calendar.monthrange(ano, mes)[1] for mes in range(1, 13)]
+    pesos_dia = np.repeat(np.array(PESOS_MES) / dias_mes, dias_mes)
+    dias = rng.choice(len(pesos_dia), size=n, p=pesos_dia / pesos_dia.sum())
+    return np.datetime64(f"{ano}-01-01", "D") + dias
+
+
+def _datas_nascimento(rng: np.random.Generator, notificacao: np.ndarray) -> pa.Array:
+    """Sorteia datas de nascimento com as faixas de FAIXAS_IDADE"""
+    n = len(notificacao)
+    fracoes = np.array([f for f, _, _ in FAIXAS_IDADE])
+    faixas = rng.choice(len(FAIXAS_IDADE), size=n, p=fracoes / fracoes.sum())
+    minimos = np.array([minimo for _, minimo, _ in FAIXAS_IDADE])[faixas]
+    maximos = np.array([maximo for _, _, maximo in FAIXAS_IDADE])[faixas]
+
+    idade_dias = ((minimos + rng.random(n) * (maximos - minimos)) * 365.25).astype(np.int64)
+    nascimento = notificacao - idade_dias
+    return pa.array(nascimento, mask=rng.random(n) < FRACAO_SEM_NASCIMENTO).cast(pa.string())
+
+
+def gerar_bloco(rng: np.random.Generator, ano: int, inicio: int, n: int) -> pa.Table:
+    """
+    Gera n registros brutos de um ano
+
+    Args:
+        rng: Gerador de números aleatórios
+        ano: Ano das notificações
+        inicio: Número da primeira notificação do bloco
+        n: Quantidade de registros
+
+    Returns:
+        Tabela Arrow com as colunas de SRAGIngestor.COLUNAS (tudo texto)
+    """
+    notificacao = _datas_notificacao(rng, ano, n)
+    return pa.table({
+        "NU_NOTIFIC": pa.array(np.arange(inicio, inicio + n) + ano * 10**9).cast(pa.string()),
+        "DT_NOTIFIC": pa.array(notificacao).cast(pa.string()),
+        "SG_UF_NOT": _codigos(rng, PESOS_UF, n),
+        "CS_SEXO": _codigos(rng, DISTRIBUICOES["CS_SEXO"], n),
+        "DT_NASC": _datas_nascimento(rng, notificacao),
+        "CS_RACA": _codigos(rng, DISTRIBUICOES["CS_RACA"], n),
+        "CS_ESCOL_N": _codigos(rng, DISTRIBUICOES["CS_ESCOL_N"], n),
+        "VACINA": _codigos(rng, DISTRIBUICOES["VACINA"], n),
+        "EVOLUCAO": _codigos(rng, DISTRIBUICOES["EVOLUCAO"], n),
+        "UTI": _codigos(rng, DISTRIBUICOES["UTI"], n),
+    })
+
+
+def gerar_ano(
+    path: Path,
+    ano: int,
+    linhas: int,
+    seed: int = 0,
+    bloco: int = 1_000_000,
+    row_group_size: int = 100_000,
+) -> Path:
+    """
+    Grava um arquivo INFLUD sintético de um ano, bloco a bloco
+
+    Args:
+        path: Arquivo parquet de destino
+        ano: Ano das notificações
+        linhas: Quantidade de registros
+        seed: Semente (o mesmo seed e ano geram sempre o mesmo arquivo)
+        bloco: Registros gerados e gravados por vez
+        row_group_size: Registros por row group do parquet
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng([seed, ano])
+
+    with pq.ParquetWriter(path, gerar_bloco(rng, ano, 0, 0).schema) as writer:
+        for inicio in range(0, linhas, bloco):
+            writer.write_table(gerar_bloco(rng, ano, inicio, min(bloco, linhas - inicio)), row_group_size=row_group_size)
+
+    return path
+
+
+def gerar_dataset(
+    diretorio: Path,
+    linhas: int,
+    anos: List[int] = None,
+    seed: int = 0,
+    **kwargs,
+) -> Dict[int, str]:
+    """
+    Gera (ou reaproveita) os arquivos INFLUD sintéticos de todos os anos
+
+    Um arquivo já existente é reaproveitado quando tem a quantidade de
+    registros esperada, o que evita regerar bases grandes a cada execução.
+
+    Args:
+        diretorio: Pasta dos arquivos
+        linhas: Total de registros, dividido entre os anos por PESOS_ANO
+        anos: Anos gerados (None = anos de PESOS_ANO)
+        seed: Semente
+        **kwargs: Argumentos repassados a gerar_ano
+
+    Returns:
+        Fontes por ano, no formato de SRAGIngestor(urls=...)
+    """
+    diretorio = Path(diretorio)
+    fontes = {}
+
+    for ano, n in distribuir_linhas(linhas, anos or list(PESOS_ANO)).items():
+        path = diretorio / f"INFLUD{str(ano)[-2:]}-sintetico-s{seed}.parquet"
+        if not path.exists() or pq.ParquetFile(path).metadata.num_rows != n:
+            logger.info(f"🧪 Gerando {ano}: {n:,} registros")
+            gerar_ano(path, ano, n, seed=seed, **kwargs)
+        fontes[ano] = str(path)
+
+    return fontes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera arquivos INFLUD sintéticos")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Total de registros (todos os anos)")
+    parser.add_argument("--anos", type=int, nargs="+", help="Anos gerados (padrão: 2019 a 2025)")
+    parser.add_argument("--saida", default="tmp/influd_sintetico", help="Pasta dos arquivos parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    fontes = gerar_dataset(Path(args.saida), args.linhas, args.anos, seed=args.seed)
+    for ano, path in fontes.items():
+        print(f"{ano}  {pq.ParquetFile(path).metadata.num_rows:>12,}  {path}")
+
+
+if __name__ == "__main__":
+    main()
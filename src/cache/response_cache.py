@@ -0,0 +1,138 @@
+"""
+Cache de respostas do agente SRAG
+
+Perguntas repetidas ("quantos casos em setembro de 2025?") são respondidas a
+partir do cache em vez de repetir SQL, busca na web e síntese do LLM. A chave
+combina o prompt normalizado com a versão dos dados (metadata.ultima_atualizacao):
+quando o ingestor grava uma nova carga, a versão muda e as respostas antigas
+são descartadas.
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Números ficam inteiros, com sinal, separadores decimais e "%" ("-2,5%" ≠ "25")
+_PALAVRA = re.compile(r"(?<!\w)[-+]?\d+(?:[.,]\d+)*%?(?!\w)|\w+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normaliza o prompt para comparação
+
+    Ignora maiúsculas, acentos, pontuação e espaços extras, de modo que
+    "Quantos casos em Setembro de 2025?" e "quantos casos em setembro de 2025"
+    compartilhem a mesma entrada. Sinais, separadores decimais e "%" dos
+    números são mantidos, pois mudam o sentido da pergunta.
+    """
+    texto = unicodedata.normalize("NFKD", prompt.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(_PALAVRA.findall(texto))
+
+
+class ResponseCache:
+    """Cache LRU com TTL, thread-safe, de respostas do agente por versão dos dados"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        """
+        Inicializa o cache
+
+        Args:
+            max_entries: Quantidade máxima de respostas mantidas (LRU)
+            ttl: Segundos de validade de cada resposta
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._versao: Optional[str] = None
+        self._acertos = 0
+        self._falhas = 0
+
+    def _check_version(self, versao: Optional[str]):
+        """Descarta todas as entradas se a versão dos dados mudou"""
+        if versao != self._versao:
+            self._entradas.clear()
+            self._versao = versao
+
+    def get(self, prompt: str, versao: Optional[str]) -> Optional[Any]:
+        """
+        Busca a resposta de um prompt
+
+        Args:
+            prompt: Pergunta do usuário
+            versao: Versão atual dos dados
+
+        Returns:
+            Resposta armazenada ou None
+        """
+        chave = normalize_prompt(prompt)
+
+        with self._lock:
+            self._check_version(versao)
+
+            entrada = self._entradas.get(chave)
+            if entrada is not None and time.monotonic() - entrada[0] > self.ttl:
+                del self._entradas[chave]
+                entrada = None
+
+            if entrada is None:
+                self._falhas += 1
+                return None
+
+            self._entradas.move_to_end(chave)
+            self._acertos += 1
+            return entrada[1]
+
+    def put(self, prompt: str, versao: Optional[str], resposta: Any):
+        """
+        Armazena a resposta de um prompt
+
+        Args:
+            prompt: Pergunta do usuário
+            versao: Versão dos dados usada para gerar a resposta
+            resposta: Resposta a armazenar
+        """
+        chave = normalize_prompt(prompt)
+
+        with self._lock:
+            self._check_version(versao)
+
+            self._entradas[chave] = (time.monotonic(), resposta)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+
+    def invalidate(self):
+        """Descarta todas as respostas"""
+        with self._lock:
+            self._entradas.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Retorna acertos, falhas, taxa de acerto (%) e tamanho do cache"""
+        with self._lock:
+            consultas = self._acertos + self._falhas
+            return {
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "taxa_acerto": round(self._acertos / consultas * 100, 1) if consultas else 0.0,
+                "entradas": len(self._entradas),
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Retorna o cache de respostas compartilhado pelo processo"""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
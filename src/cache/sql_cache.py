@@ -0,0 +1,179 @@
+"""
+Cache de resultados das consultas SQL feitas pelo agente
+
+O LLM costuma repetir a mesma consulta (às vezes só mudando espaços, quebras de
+linha ou a caixa das palavras-chave) dentro de uma resposta e entre usuários.
+O SQL é canonizado pelo tokenizador do DuckDB e o resultado fica guardado,
+junto com a versão dos dados, num LRU limitado por bytes.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import duckdb
+
+# Só instruções de leitura determinísticas são cacheadas
+_INSTRUCOES_CACHEAVEIS = {
+    "SELECT", "WITH", "FROM", "VALUES", "TABLE", "DESCRIBE", "SHOW", "SUMMARIZE", "EXPLAIN", "PIVOT", "UNPIVOT"
+}
+
+# Funções cujo resultado muda a cada execução
+_FUNCOES_VOLATEIS = {
+    "random", "setseed", "uuid", "gen_random_uuid", "nextval", "currval", "now", "today",
+    "current_date", "current_time", "current_timestamp", "localtime", "localtimestamp",
+    "get_current_time", "get_current_timestamp", "transaction_timestamp",
+}
+
+# Literais (strings e identificadores entre aspas) são mantidos exatamente como escritos
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+# Fim do texto de um token: espaço ou início de comentário
+_FIM_TOKEN = re.compile(r"\s|--|/\*")
+
+
+def canonicalize_sql(sql: str) -> Optional[Tuple[str, ...]]:
+    """
+    Canoniza o SQL: remove comentários e espaços extras e padroniza palavras-chave
+
+    Nomes de função vão para minúsculas; demais identificadores e literais não
+    são alterados, pois afetam o resultado (nomes das colunas, comparações de texto).
+
+    Returns:
+        Tokens canônicos, ou None se a instrução não deve ser cacheada
+    """
+    try:
+        tokens = duckdb.tokenize(sql)
+    except Exception:
+        return None
+
+    partes = []
+    tipos = [tipo for _, tipo in tokens]
+    for i, (inicio, tipo) in enumerate(tokens):
+        fim = tokens[i + 1][0] if i + 1 < len(tokens) else len(sql)
+        trecho = sql[inicio:fim]
+
+        literal = _LITERAL.match(trecho)
+        if literal:
+            texto = literal.group(0)
+        else:
+            corte = _FIM_TOKEN.search(trecho)
+            texto = trecho[:corte.start()] if corte else trecho
+
+        if tipo == duckdb.token_type.keyword:
+            texto = texto.upper()
+
+        if tipo != duckdb.token_type.string_const and texto.lower() in _FUNCOES_VOLATEIS:
+            return None
+
+        partes.append(texto)
+
+    while partes and partes[-1] == ";":
+        partes.pop()
+
+    # Nomes de função não diferenciam caixa nem no cabeçalho (SUM(x) → "sum(x)")
+    for i in range(len(partes) - 1):
+        if tipos[i] == duckdb.token_type.identifier and partes[i + 1] == "(":
+            partes[i] = partes[i].lower()
+
+    if not partes or partes[0].upper() not in _INSTRUCOES_CACHEAVEIS:
+        return None
+    # EXPLAIN ANALYZE executa a consulta e reporta tempos
+    if partes[0].upper() == "EXPLAIN" and len(partes) > 1 and partes[1].upper() == "ANALYZE":
+        return None
+
+    return tuple(partes)
+
+
+class SQLResultCache:
+    """Cache LRU thread-safe de resultados de consultas, limitado pelo total de bytes"""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024):
+        """
+        Inicializa o cache
+
+        Args:
+            max_bytes: Tamanho máximo somado de todos os resultados guardados
+            max_entry_bytes: Resultados maiores que isto não são guardados
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[tuple, Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._acertos = 0
+        self._falhas = 0
+
+    @staticmethod
+    def make_key(sql: str, versao: Optional[str]) -> Optional[tuple]:
+        """Chave do resultado (None = consulta não cacheável)"""
+        canonico = canonicalize_sql(sql)
+        if canonico is None:
+            return None
+        return (versao, canonico)
+
+    def get(self, chave: tuple) -> Optional[str]:
+        """Busca um resultado, marcando-o como usado recentemente"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self._falhas += 1
+                return None
+
+            self._entradas.move_to_end(chave)
+            self._acertos += 1
+            return entrada[0]
+
+    def put(self, chave: tuple, resultado: str):
+        """Guarda um resultado, descartando os menos usados até caber no limite"""
+        tamanho = len(resultado.encode("utf-8"))
+        if tamanho > self.max_entry_bytes:
+            return
+
+        with self._lock:
+            # Resultados de versões anteriores dos dados nunca mais serão lidos
+            versao = chave[0]
+            for antiga in [c for c in self._entradas if c[0] != versao]:
+                self._bytes -= self._entradas.pop(antiga)[1]
+
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+
+            self._entradas[chave] = (resultado, tamanho)
+            self._bytes += tamanho
+            while self._bytes > self.max_bytes:
+                self._bytes -= self._entradas.popitem(last=False)[1][1]
+
+    def invalidate(self):
+        """Descarta todos os resultados"""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Retorna acertos, falhas, taxa de acerto (%), entradas e bytes ocupados"""
+        with self._lock:
+            consultas = self._acertos + self._falhas
+            return {
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "taxa_acerto": round(self._acertos / consultas * 100, 1) if consultas else 0.0,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+            }
+
+
+_cache: Optional[SQLResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_sql_cache() -> SQLResultCache:
+    """Retorna o cache de resultados SQL compartilhado pelo processo"""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLResultCache()
+        return _cache
@@ -0,0 +1,227 @@
+"""
+Cache persistente (SQLite) dos resultados de busca na web
+
+As buscas do agente repetem poucos temas (boletins InfoGripe, notas do
+Ministério da Saúde) para poucos recortes de região e período. Cada consulta é
+reduzida a (tipo, UF, período, termos): a mesma pergunta escrita de outra forma
+("InfoGripe SP setembro 2025" / "boletim infogripe de São Paulo 09/2025")
+reaproveita o resultado guardado enquanto ele estiver dentro do TTL.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from data.ufs import MESES, UFS
+
+WEB_CACHE_PATH = Path(__file__).parent.parent / "tmp" / "web_cache.db"
+
+_PALAVRA = re.compile(r"\w+")
+_SIGLA = re.compile(r"\b[A-Z]{2}\b")
+# Sigla precedida de contexto explícito de UF ("UF MS", "estado de PE")
+_SIGLA_EXPLICITA = re.compile(r"\b(?i:uf|estado(?:\s+d[aeo])?):?\s+([A-Z]{2})\b")
+_ANO = re.compile(r"\b(?:19|20)\d{2}\b")
+_MES_ANO = re.compile(r"\b(0?[1-9]|1[0-2])[/-]((?:19|20)\d{2})\b")
+
+# Siglas de UF que também são abreviações comuns em buscas de saúde (ex.:
+# MS = Ministério da Saúde): só valem como UF com contexto explícito
+_SIGLAS_AMBIGUAS = {"MS", "PE"}
+
+# Palavras que não mudam o resultado de uma busca. Letras isoladas ficam nos
+# termos: "influenza A" e "influenza B" são buscas diferentes
+_STOPWORDS = {
+    "as", "os", "de", "da", "das", "do", "dos", "em", "na", "nas", "no", "nos",
+    "para", "por", "sobre", "com", "um", "uma", "ao", "aos", "mes", "ano", "estado", "uf",
+    "boletim", "boletins", "noticia", "noticias",
+}
+
+
+def _strip_accents(texto: str) -> str:
+    """Minúsculas e sem acentos"""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+# Nomes de UF sem acento, dos mais longos para os mais curtos ("mato grosso do sul" antes de "mato grosso")
+_NOMES_UF = sorted(((_strip_accents(nome), sigla) for sigla, nome in UFS.items()), key=lambda x: -len(x[0]))
+_MESES = {_strip_accents(nome): i + 1 for i, nome in enumerate(MESES)}
+_MESES.update({nome[:3]: numero for nome, numero in list(_MESES.items())})
+
+
+def parse_search_query(consulta: str) -> Tuple[str, str, str]:
+    """
+    Reduz a consulta a UF, período e termos (sem ordem, acentos ou stopwords)
+
+    Args:
+        consulta: Texto da busca
+
+    Returns:
+        UF (sigla ou ""), período ("AAAA-MM", "AAAA" ou "") e termos ordenados
+    """
+    ufs = [s for s in _SIGLA.findall(consulta) if s in UFS and s not in _SIGLAS_AMBIGUAS]
+    ufs += [s for s in _SIGLA_EXPLICITA.findall(consulta) if s in UFS]
+    texto = " " + " ".join(_PALAVRA.findall(_strip_accents(consulta))) + " "
+
+    for nome, sigla in _NOMES_UF:
+        if f" {nome} " in texto:
+            ufs.append(sigla)
+            texto = texto.replace(f" {nome} ", " ")
+    uf = ",".join(sorted(set(ufs)))
+
+    mes = ano = None
+    mes_ano = _MES_ANO.search(consulta)
+    if mes_ano:
+        mes, ano = int(mes_ano.group(1)), mes_ano.group(2)
+        texto = texto.replace(f" {mes_ano.group(1)} {ano} ", " ")
+
+    termos = set()
+    for palavra in texto.split():
+        if palavra in _MESES and mes is None:
+            mes = _MESES[palavra]
+        elif _ANO.fullmatch(palavra) and ano is None:
+            ano = palavra
+        elif palavra.upper() in ufs or palavra in _MESES or _ANO.fullmatch(palavra):
+            continue
+        elif palavra not in _STOPWORDS:
+            termos.add(palavra)
+
+    periodo = f"{ano}-{mes:02d}" if ano and mes else (ano or "")
+    return uf, periodo, " ".join(sorted(termos))
+
+
+def term_similarity(a: str, b: str) -> float:
+    """Similaridade entre dois conjuntos de termos"""
+    ta, tb = set(a.split()), set(b.split())
+    if not ta and not tb:
+        return 1.0
+    return len(ta & tb) / len(ta | tb)
+
+
+class WebSearchCache:
+    """Cache thread-safe, com TTL, de resultados de busca persistido em SQLite"""
+
+    def __init__(self, path: Path = WEB_CACHE_PATH, ttl: float = 6 * 3600):
+        """
+        Inicializa o cache (o arquivo é criado se não existir)
+
+        Args:
+            path: Arquivo SQLite do cache
+            ttl: Segundos de validade de cada resultado
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._falhas = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS busca_web (
+                tipo TEXT,
+                uf TEXT,
+                periodo TEXT,
+                termos TEXT,
+                max_resultados INTEGER,
+                consulta TEXT,
+                resultados TEXT,
+                criado_em REAL,
+                PRIMARY KEY (tipo, uf, periodo, termos, max_resultados)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, tipo: str, consulta: str, max_resultados: int) -> Optional[List[Dict]]:
+        """
+        Busca resultados válidos para a consulta
+
+        Só reaproveita buscas com a mesma chave normalizada (tipo, UF, período e
+        termos): termos parecidos não bastam, pois um patógeno ou doença
+        diferente ("influenza" / "VSR") muda os resultados.
+
+        Args:
+            tipo: "text" (web) ou "news" (notícias)
+            consulta: Texto da busca
+            max_resultados: Quantidade de resultados pedida
+
+        Returns:
+            Resultados guardados ou None
+        """
+        uf, periodo, termos = parse_search_query(consulta)
+        limite = time.time() - self.ttl
+
+        with self._lock:
+            linha = self._conn.execute(
+                """
+                SELECT resultados FROM busca_web
+                WHERE tipo = ? AND uf = ? AND periodo = ? AND termos = ? AND max_resultados >= ? AND criado_em >= ?
+                ORDER BY criado_em DESC
+                LIMIT 1
+                """,
+                [tipo, uf, periodo, termos, max_resultados, limite]
+            ).fetchone()
+
+            if linha is None:
+                self._falhas += 1
+                return None
+
+            self._acertos += 1
+            return json.loads(linha[0])[:max_resultados]
+
+    def put(self, tipo: str, consulta: str, max_resultados: int, resultados: List[Dict]):
+        """Guarda os resultados de uma busca"""
+        uf, periodo, termos = parse_search_query(consulta)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO busca_web VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [tipo, uf, periodo, termos, max_resultados, consulta,
+                 json.dumps(resultados, ensure_ascii=False), time.time()]
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Remove os resultados vencidos e retorna quantos foram removidos"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM busca_web WHERE criado_em < ?", [time.time() - self.ttl])
+            self._conn.commit()
+            return cursor.rowcount
+
+    def invalidate(self):
+        """Descarta todos os resultados"""
+        with self._lock:
+            self._conn.execute("DELETE FROM busca_web")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Retorna acertos, falhas, taxa de acerto (%) e entradas guardadas"""
+        with self._lock:
+            entradas = self._conn.execute("SELECT COUNT(*) FROM busca_web").fetchone()[0]
+            consultas = self._acertos + self._falhas
+            return {
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "taxa_acerto": round(self._acertos / consultas * 100, 1) if consultas else 0.0,
+                "entradas": entradas,
+            }
+
+
+_cache: Optional[WebSearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_web_cache() -> WebSearchCache:
+    """Retorna o cache de buscas compartilhado pelo processo"""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = WebSearchCache()
+        return _cache
@@ -0,0 +1,245 @@
+"""
+Pool compartilhado de conexões somente leitura ao banco SRAG (DuckDB)
+
+Uma única conexão base read-only é aberta por processo; cada usuário do pool
+recebe um cursor próprio (uma conexão DuckDB independente sobre a mesma
+instância do banco), devolvido ao pool ao final do uso.
+
+A base é aberta na versão publicada pelo ingestor (ver data/versions.py).
+Quando uma nova versão é publicada, os próximos empréstimos já usam a nova
+base e a antiga é fechada assim que os cursores em uso sobre ela voltam.
+"""
+
+import duckdb
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from data.versions import ReaderLease, lock_path, resolve_db_path
+
+# Caminho absoluto baseado na localização deste arquivo
+DB_PATH = Path(__file__).parent / "database" / "srag_database.duckdb"
+
+# Banco alternativo (ex.: base sintética dos benchmarks)
+DB_PATH_ENV = "SRAG_DB_PATH"
+
+
+class ReadOnlyConnectionPool:
+    """Pool limitado e thread-safe de cursores DuckDB somente leitura"""
+
+    def __init__(self, db_path: Path = DB_PATH, max_size: int = 8, timeout: float = 30.0):
+        """
+        Inicializa o pool (a conexão base só é aberta no primeiro uso)
+
+        Args:
+            db_path: Caminho lógico do banco DuckDB (a versão publicada é resolvida pelo ponteiro)
+            max_size: Quantidade máxima de cursores emprestados ao mesmo tempo
+            timeout: Segundos de espera por um cursor livre antes de falhar
+        """
+        self.db_path = Path(db_path)
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._base: Optional[duckdb.DuckDBPyConnection] = None
+        self._base_path: Optional[Path] = None
+        self._lease: Optional[ReaderLease] = None
+        # Cada abertura da base é uma geração; cursores de gerações antigas não voltam ao pool
+        self._geracao = 0
+        self._em_uso: Dict[int, int] = {}
+        # Bases de versões substituídas, fechadas quando o último cursor emprestado volta
+        self._aposentadas: Dict[int, Tuple[duckdb.DuckDBPyConnection, ReaderLease]] = {}
+        self._livres: queue.LifoQueue = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(max_size)
+
+    def _open_base(self):
+        """Abre a conexão base somente leitura na versão publicada (chamar com o lock)"""
+        caminho = resolve_db_path(self.db_path)
+        lease = ReaderLease(caminho)
+
+        if not caminho.exists():
+            # Versão apagada entre a leitura do ponteiro e o lock: relê o ponteiro
+            lease.release()
+            lock_path(caminho).unlink(missing_ok=True)
+            caminho = resolve_db_path(self.db_path)
+            lease = ReaderLease(caminho)
+
+        try:
+            self._base = duckdb.connect(str(caminho), read_only=True)
+        except BaseException:
+            lease.release()
+            raise
+
+        self._base_path = caminho
+        self._lease = lease
+        self._geracao += 1
+
+    @staticmethod
+    def _close_base(base: duckdb.DuckDBPyConnection, lease: ReaderLease):
+        """Fecha uma conexão base e libera o lock de leitor da versão"""
+        try:
+            base.close()
+        except duckdb.Error:
+            pass
+        lease.release()
+
+    def _retire_base(self):
+        """
+        Descarta a conexão base atual e os cursores livres (chamar com o lock)
+
+        Se ainda houver cursores emprestados, a base só é fechada quando o
+        último deles voltar: as consultas em andamento terminam normalmente.
+        """
+        self._drain()
+        if self._base is None:
+            return
+
+        if self._em_uso.get(self._geracao):
+            self._aposentadas[self._geracao] = (self._base, self._lease)
+        else:
+            self._close_base(self._base, self._lease)
+
+        self._base = None
+        self._base_path = None
+        self._lease = None
+
+    def _drain(self):
+        """Fecha todos os cursores livres"""
+        while True:
+            try:
+                _, cursor = self._livres.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                cursor.close()
+            except duckdb.Error:
+                pass
+
+    def _check_version(self):
+        """Passa a usar a nova versão se o ponteiro do banco mudou"""
+        if self._base_path is None or resolve_db_path(self.db_path) == self._base_path:
+            return
+
+        with self._lock:
+            if self._base_path is not None and resolve_db_path(self.db_path) != self._base_path:
+                self._retire_base()
+
+    @staticmethod
+    def _is_healthy(cursor: duckdb.DuckDBPyConnection) -> bool:
+        """Verifica se o cursor ainda responde"""
+        try:
+            cursor.execute("SELECT 1").fetchone()
+            return True
+        except duckdb.Error:
+            return False
+
+    def _new_cursor(self) -> Tuple[int, duckdb.DuckDBPyConnection]:
+        """Abre um cursor sobre a base atual (abrindo-a, se preciso)"""
+        with self._lock:
+            if self._base is None:
+                self._open_base()
+            cursor = self._base.cursor()
+            self._em_uso[self._geracao] = self._em_uso.get(self._geracao, 0) + 1
+            return self._geracao, cursor
+
+    def _checkout(self) -> Tuple[int, duckdb.DuckDBPyConnection]:
+        """Retorna a geração e um cursor saudável, reaproveitando os livres quando possível"""
+        self._check_version()
+
+        while True:
+            try:
+                geracao, cursor = self._livres.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                atual = geracao == self._geracao
+                if atual:
+                    self._em_uso[geracao] = self._em_uso.get(geracao, 0) + 1
+
+            if atual and self._is_healthy(cursor):
+                return geracao, cursor
+            if atual:
+                self._checkin(geracao, cursor, saudavel=False)
+            else:
+                cursor.close()
+
+        try:
+            return self._new_cursor()
+        except duckdb.Error:
+            # Conexão base inválida (ex.: arquivo substituído): reabre uma vez
+            with self._lock:
+                self._retire_base()
+            return self._new_cursor()
+
+    def _checkin(self, geracao: int, cursor: duckdb.DuckDBPyConnection, saudavel: bool):
+        """Devolve o cursor ao pool ou o fecha (se inválido ou de uma versão substituída)"""
+        manter = saudavel or self._is_healthy(cursor)
+        aposentada = None
+
+        with self._lock:
+            self._em_uso[geracao] -= 1
+            if manter and geracao == self._geracao:
+                self._livres.put((geracao, cursor))
+                return
+
+            if not self._em_uso[geracao]:
+                del self._em_uso[geracao]
+                aposentada = self._aposentadas.pop(geracao, None)
+
+        try:
+            cursor.close()
+        except duckdb.Error:
+            pass
+        if aposentada is not None:
+            self._close_base(*aposentada)
+
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Empresta um cursor somente leitura do pool
+
+        Yields:
+            Cursor DuckDB, devolvido ao pool ao sair do bloco
+        """
+        if not self._vagas.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Nenhuma conexão livre no pool após {self.timeout}s")
+
+        cursor = None
+        saudavel = True
+
+        try:
+            geracao, cursor = self._checkout()
+            yield cursor
+        except duckdb.Error:
+            saudavel = False
+            raise
+        finally:
+            if cursor is not None:
+                self._checkin(geracao, cursor, saudavel)
+            self._vagas.release()
+
+    def close(self):
+        """Fecha todos os cursores livres, a conexão base e as bases de versões substituídas"""
+        with self._lock:
+            self._retire_base()
+            for base, lease in self._aposentadas.values():
+                self._close_base(base, lease)
+            self._aposentadas.clear()
+
+
+_pool: Optional[ReadOnlyConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ReadOnlyConnectionPool:
+    """Retorna o pool de conexões compartilhado pelo processo"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ReadOnlyConnectionPool(os.getenv(DB_PATH_ENV, DB_PATH))
+        return _pool
@@ -0,0 +1,159 @@
+"""
+Dicionário de variáveis SRAG estruturado (variável/código → descrição)
+
+Extrai do PDF do dicionário a descrição de cada variável e, quando houver, a
+lista de categorias codificadas (ex.: CLASSI_FIN 5 → "SRAG por covid-19"),
+gravando-as em tabelas do DuckDB ao lado de srag_cases.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from pypdf import PdfReader
+
+DICIONARIO_PDF = Path(__file__).parent / "knowledge" / "dicionario_variaveis_srag.pdf"
+
+# Cabeçalho da tabela, repetido no topo de cada página
+_CABECALHO = "variaveis nome descricao categoria"
+
+# Linha que inicia uma variável: nome em maiúsculas seguido de espaço ou fim de linha
+_INICIO_VARIAVEL = re.compile(r"^([A-Z][A-Z0-9_]*[A-Z0-9])(?:\s+|$)")
+
+# Código de categoria: "1-Sim", "3- Médio", "1. Laboratorial", "2-Feminino9-Ignorado", "1-1º Trimestre"
+_CODIGO = re.compile(r"(?<![\d/.])(\d{1,2})\s*[-.]\s*(?=[^\d\s]|\d[ºª])")
+
+
+def _extract_entries(texto: str) -> List[Tuple[str, str]]:
+    """Agrupa as linhas do PDF em (variável, texto da entrada)"""
+    entradas: List[Tuple[str, List[str]]] = []
+
+    for linha in texto.splitlines():
+        linha = linha.strip()
+        if not linha or linha == _CABECALHO:
+            continue
+
+        inicio = _INICIO_VARIAVEL.match(linha)
+        if inicio and len(inicio.group(1)) >= 3:
+            entradas.append((inicio.group(1), [linha[inicio.end():]]))
+        elif entradas:
+            entradas[-1][1].append(linha)
+
+    # Palavras quebradas em hífen no fim da linha ("4-\nOutro") são reunidas
+    return [(nome, re.sub(r"\s+", " ", "\n".join(partes).replace("-\n", "-")).strip()) for nome, partes in entradas]
+
+
+def _split_categories(texto: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Separa a descrição da lista de categorias codificadas
+
+    A lista é a primeira sequência crescente de códigos iniciada em 0 ou 1;
+    códigos soltos citados no texto (ex.: "a opção 5-Outro") são ignorados.
+
+    Returns:
+        Descrição e dicionário código → rótulo
+    """
+    codigos = list(_CODIGO.finditer(texto))
+
+    for i, primeiro in enumerate(codigos):
+        if int(primeiro.group(1)) > 1:
+            continue
+
+        sequencia = [primeiro]
+        for codigo in codigos[i + 1:]:
+            if int(codigo.group(1)) > int(sequencia[-1].group(1)):
+                sequencia.append(codigo)
+
+        categorias = {}
+        for j, codigo in enumerate(sequencia):
+            fim = sequencia[j + 1].start() if j + 1 < len(sequencia) else len(texto)
+            rotulo = texto[codigo.end():fim].strip(" ,;")
+            if rotulo:
+                categorias.setdefault(codigo.group(1), rotulo)
+
+        return texto[:primeiro.start()].strip(), categorias
+
+    return texto, {}
+
+
+def parse_dictionary(pdf_path: Path = DICIONARIO_PDF) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Lê o PDF do dicionário de variáveis
+
+    Args:
+        pdf_path: Caminho do PDF
+
+    Returns:
+        Lista de variáveis (variavel, descricao) e lista de categorias
+        (variavel, codigo, rotulo)
+    """
+    texto = "\n".join(pagina.extract_text() or "" for pagina in PdfReader(str(pdf_path)).pages)
+    # O PDF codifica o hífen de algumas palavras compostas como \x02 ("Naso-orofaringe")
+    texto = texto.replace("\x02", "-")
+
+    variaveis = []
+    categorias = []
+    vistas = set()
+
+    for nome, conteudo in _extract_entries(texto):
+        if nome in vistas:
+            continue
+        vistas.add(nome)
+
+        # Variáveis sem documentação aparecem como "- - -"
+        descricao, codigos = _split_categories(conteudo)
+        variaveis.append({"variavel": nome, "descricao": descricao.strip(" -") or None})
+        categorias.extend(
+            {"variavel": nome, "codigo": codigo, "rotulo": rotulo}
+            for codigo, rotulo in codigos.items()
+        )
+
+    return variaveis, categorias
+
+
+def save_dictionary(conn, pdf_path: Path = DICIONARIO_PDF) -> int:
+    """
+    Recria as tabelas dicionario_variaveis e dicionario_categorias
+
+    Args:
+        conn: Conexão DuckDB com permissão de escrita
+        pdf_path: Caminho do PDF
+
+    Returns:
+        Quantidade de variáveis gravadas
+    """
+    variaveis, categorias = parse_dictionary(pdf_path)
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute("DROP TABLE IF EXISTS dicionario_categorias")
+        conn.execute("DROP TABLE IF EXISTS dicionario_variaveis")
+        conn.execute("""
+            CREATE TABLE dicionario_variaveis (
+                variavel VARCHAR PRIMARY KEY,
+                descricao VARCHAR
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE dicionario_categorias (
+                variavel VARCHAR,
+                codigo VARCHAR,
+                rotulo VARCHAR,
+                PRIMARY KEY (variavel, codigo)
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO dicionario_variaveis VALUES (?, ?)",
+            [(v["variavel"], v["descricao"]) for v in variaveis]
+        )
+        if categorias:
+            conn.executemany(
+                "INSERT INTO dicionario_categorias VALUES (?, ?, ?)",
+                [(c["variavel"], c["codigo"], c["rotulo"]) for c in categorias]
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    return len(variaveis)
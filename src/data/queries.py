@@ -1,282 +1,478 @@
 """
 Módulo de consultas ao banco de dados SRAG usando DuckDB
+
+As consultas recebem janelas explícitas (inicio/fim, granularidade e UFs).
+Sem datas, a janela é ancorada no intervalo de notificações que o ingestor
+grava em metadata, sem recalcular MAX(data) sobre os rollups.
 """
 
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Union
+
 import duckdb
-from pathlib import Path
+import pandas as pd
+
+from data.connection import get_pool
+from data.ufs import REGIAO_UF
+
+Data = Union[date, str, None]
+UFs = Union[str, Sequence[str], None]
+
+# Granularidades das séries: coluna do período no resultado, parte do
+# date_trunc e janela padrão, contada para trás a partir de data_max
+# (None = desde o início dos dados)
+GRANULARIDADES = {
+    "dia": ("data", "day", pd.DateOffset(days=30)),
+    "mes": ("mes", "month", pd.DateOffset(years=1)),
+    "ano": ("ano", "year", None),
+}
+
+# Janela [inicio, fim] montada a partir dos rollups: os meses inteiros vêm de
+# srag_mensal e as pontas (meses parciais) vêm de srag_diario. Sem $ufs, Brasil.
+CTE_JANELA = """
+janela AS (
+    SELECT mes, SG_UF_NOT, EVOLUCAO, UTI, VACINA, casos
+    FROM srag_mensal
+    WHERE mes >= $mes_inicio AND mes < $mes_fim
+      AND ($ufs IS NULL OR list_contains($ufs::VARCHAR[], SG_UF_NOT))
+
+    UNION ALL
+
+    SELECT date_trunc('month', data) AS mes, SG_UF_NOT, EVOLUCAO, UTI, VACINA, casos
+    FROM srag_diario
+    WHERE data BETWEEN $inicio AND $fim
+      AND (data < $mes_inicio OR data >= $mes_fim)
+      AND ($ufs IS NULL OR list_contains($ufs::VARCHAR[], SG_UF_NOT))
+)
+"""
+
 
 def get_db_connection():
-    """Conecta ao banco de dados DuckDB"""
-    # Caminho absoluto baseado na localização deste arquivo
-    db_path = Path(__file__).parent / "database" / "srag_database.duckdb"
-    return duckdb.connect(str(db_path))
+    """Empresta uma conexão somente leitura do pool compartilhado (usar com `with`)"""
+    return get_pool().connection()
 
 
-def get_metrics_data():
-    """Obtém todas as métricas do banco de dados"""
-    conn = get_db_connection()
+def read_data_bounds(conn) -> Dict[str, Optional[date]]:
+    """
+    Lê o intervalo de notificações gravado pelo ingestor
+    
+    Args:
+        conn: Conexão/cursor DuckDB
     
+    Returns:
+        data_min e data_max (None se o banco ainda não tem carga)
+    """
     try:
-        # Taxa de Aumento (comparação últimos 7 dias vs 7 dias anteriores)
-        query_aumento = """
-        WITH base AS (
-            SELECT
-                date_trunc('month', DT_NOTIFIC) AS mes,
-                MAX(DT_NOTIFIC) OVER () AS data_max
-            FROM srag_cases
-        ),
-        filtrado AS (
-            SELECT *
-            FROM base
-            WHERE mes >= date_trunc('month', data_max) - INTERVAL '11 months'
-        )
-        SELECT
-            mes,
-            COUNT(*) AS total_casos
-        FROM filtrado
-        GROUP BY mes
-        ORDER BY mes;
-        """
-        rows = conn.execute(query_aumento).fetchall()
-
-        meses = []
-        casos_mensais = []
-
-        for mes, total in rows:
-            meses.append(mes)
-            casos_mensais.append(total)
-            if len(casos_mensais) >= 2 and casos_mensais[-2] > 0:
-                taxa_aumento_mom = round(
-                    (casos_mensais[-1] - casos_mensais[-2]) / casos_mensais[-2] * 100,
-                    1
-                )
-            else:
-                taxa_aumento_mom = 0
-        
-        # Taxa de Mortalidade (EVOLUCAO = 2 significa óbito)
-        query_mortalidade = """
-        WITH base AS (
-            SELECT
-                *,
-                MAX(DT_NOTIFIC) OVER () AS data_max
-            FROM srag_cases
-        ),
-        filtrado AS (
-            SELECT *
-            FROM base
-            WHERE DT_NOTIFIC >= data_max - INTERVAL '1 year'
-        ),
-        mensal AS (
-            SELECT
-                date_trunc('month', DT_NOTIFIC) AS periodo,
-                COUNT(*) AS total_casos,
-                SUM(CASE WHEN EVOLUCAO = 'Óbito' THEN 1 ELSE 0 END) AS total_obitos,
-                SUM(CASE WHEN EVOLUCAO = 'Óbito' THEN 1 ELSE 0 END)::FLOAT
-                / NULLIF(COUNT(*), 0) * 100 AS taxa_mortalidade
-            FROM filtrado
-            GROUP BY periodo
-        ),
-        anual AS (
-            SELECT
-                'TOTAL_12_MESES' AS periodo,
-                COUNT(*) AS total_casos,
-                SUM(CASE WHEN EVOLUCAO = 'Óbito' THEN 1 ELSE 0 END) AS total_obitos,
-                SUM(CASE WHEN EVOLUCAO = 'Óbito' THEN 1 ELSE 0 END)::FLOAT
-                / NULLIF(COUNT(*), 0) * 100 AS taxa_mortalidade
-            FROM filtrado
-        )
-        SELECT *
-        FROM mensal
+        row = conn.execute("SELECT data_min, data_max FROM metadata LIMIT 1").fetchone()
+    except duckdb.BinderException:
+        # Banco gravado antes do registro do intervalo em metadata
+        row = conn.execute("SELECT MIN(data), MAX(data) FROM srag_diario").fetchone()
+    
+    data_min, data_max = row if row else (None, None)
+    return {"data_min": data_min, "data_max": data_max}
 
-        UNION ALL
 
-        SELECT *
-        FROM anual
+def get_data_bounds():
+    """
+    Obtém o intervalo de notificações e a quantidade de registros por ano
+    
+    Returns:
+        data_min, data_max e registros_por_ano ({ano: registros})
+    """
+    with get_db_connection() as conn:
+        limites = read_data_bounds(conn)
+        try:
+            rows = conn.execute("SELECT ano, registros FROM metadata_anos ORDER BY ano").fetchall()
+        except duckdb.CatalogException:
+            rows = conn.execute(
+                "SELECT ano, CAST(SUM(casos) AS BIGINT) FROM srag_diario GROUP BY ano ORDER BY ano"
+            ).fetchall()
+    
+    return {**limites, "registros_por_ano": dict(rows)}
+
 
-        ORDER BY periodo;
-        """
-        result_mortalidade = conn.execute(query_mortalidade).fetchall()
+def _first_of_month(dia: date, meses: int = 0) -> date:
+    """Primeiro dia do mês de `dia`, deslocado em `meses`"""
+    indice = dia.year * 12 + dia.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
 
-        taxa_mortalidade = 0
-        taxa_mortalidade_mensal = []
-        meses = []
 
-        for row in result_mortalidade:
-            periodo = row[0]
-            taxa = round(row[3] or 0, 1)
+def _normalize_ufs(ufs: UFs) -> Optional[List[str]]:
+    """Aceita uma UF ou uma lista de UFs (None = Brasil)"""
+    if ufs is None:
+        return None
+    return [ufs] if isinstance(ufs, str) else list(ufs)
+
+
+def _window_params(conn, inicio: Data, fim: Data, granularidade: str, ufs: UFs) -> Dict[str, Any]:
+    """
+    Resolve a janela e monta os parâmetros de CTE_JANELA
+    
+    Datas omitidas vêm de metadata: fim = data_max e inicio = fim menos a
+    janela padrão da granularidade (ou data_min).
+    
+    Args:
+        conn: Conexão/cursor DuckDB
+        inicio: Primeiro dia da janela
+        fim: Último dia da janela
+        granularidade: Chave de GRANULARIDADES
+        ufs: UF ou lista de UFs
+    
+    Returns:
+        inicio, fim, mes_inicio (primeiro mês inteiro), mes_fim (mês seguinte
+        ao último mês inteiro) e ufs
+    """
+    if granularidade not in GRANULARIDADES:
+        raise ValueError(f"Granularidade inválida: {granularidade} (use {', '.join(GRANULARIDADES)})")
+    
+    limites = read_data_bounds(conn)
+    padrao = GRANULARIDADES[granularidade][2]
+    
+    fim = pd.Timestamp(fim).date() if fim is not None else limites["data_max"]
+    if inicio is not None:
+        inicio = pd.Timestamp(inicio).date()
+    elif fim is not None and padrao is not None:
+        inicio = (pd.Timestamp(fim) - padrao).date()
+    else:
+        inicio = limites["data_min"]
+    
+    mes_inicio = mes_fim = None
+    if inicio is not None and fim is not None:
+        mes_inicio = inicio if inicio.day == 1 else _first_of_month(inicio, 1)
+        # Não há dados depois de data_max: o mês dela conta como inteiro
+        if limites["data_max"] is not None and fim >= limites["data_max"]:
+            mes_fim = _first_of_month(fim, 1)
+        else:
+            mes_fim = _first_of_month(fim + timedelta(days=1))
+    
+    return {
+        "inicio": inicio,
+        "fim": fim,
+        "mes_inicio": mes_inicio,
+        "mes_fim": mes_fim,
+        "ufs": _normalize_ufs(ufs),
+    }
+
+
+# Métricas de taxa do motor de métricas: cada entrada gera "<nome>" (percentual
+# dos casos dos últimos 12 meses) e "<nome>_mensal" (série mensal). A condição é
+# SQL sobre as colunas da janela (SG_UF_NOT, EVOLUCAO, UTI, VACINA); declarar uma
+# nova taxa aqui não adiciona nenhuma varredura.
+TAXAS = {
+    # EVOLUCAO = 2 significa óbito
+    "taxa_mortalidade": "EVOLUCAO = 'Óbito'",
+    # UTI = 1 significa internação em UTI
+    "ocupacao_uti": "UTI = 'Sim'",
+    # VACINA = 1 significa vacinado
+    "taxa_vacinacao": "VACINA = 'Sim'",
+}
+
+# Taxas do drill-down: coluna de srag_cubo_uf com o numerador de cada taxa de
+# TAXAS (o cubo é montado pelo ingestor, em SRAGIngestor.CUBO_DESFECHOS)
+TAXAS_CUBO = {
+    "taxa_mortalidade": "obitos",
+    "ocupacao_uti": "uti",
+    "taxa_vacinacao": "vacinados",
+}
+
+# Recorte nacional do drill-down
+BRASIL = "Brasil"
+
+
+def build_metrics_query(taxas: dict = None) -> str:
+    """
+    Monta a consulta única do motor de métricas
+    
+    Uma só passada pela janela produz, por mês e no total (GROUPING SETS),
+    a contagem de casos e todas as taxas via agregados FILTER. A consulta
+    recebe os parâmetros de CTE_JANELA.
+    """
+    taxas = TAXAS if taxas is None else taxas
+    
+    colunas_taxas = "".join(
+        f""",
+            COALESCE(
+                SUM(casos) FILTER (WHERE {condicao})::FLOAT / NULLIF(SUM(casos), 0) * 100,
+                0
+            ) AS {nome}"""
+        for nome, condicao in taxas.items()
+    )
+    
+    return """
+    WITH """ + CTE_JANELA + """
+    SELECT
+        GROUPING(mes) = 1 AS total,
+        mes,
+        CAST(SUM(casos) AS BIGINT) AS total_casos""" + colunas_taxas + """
+    FROM janela
+    GROUP BY GROUPING SETS ((mes), ())
+    ORDER BY total, mes
+    """
+
+
+def build_drilldown_query(taxas: dict = None) -> str:
+    """
+    Monta a consulta do drill-down por UF, macrorregião e Brasil
+    
+    A janela é a mesma de CTE_JANELA: os meses inteiros vêm do cubo
+    srag_cubo_uf (UF x mês) e as pontas (meses parciais) de srag_diario,
+    agregadas por UF com as condições de TAXAS. Uma só passada produz, por mês
+    e no total (GROUPING SETS), as métricas de cada recorte. A consulta recebe
+    os parâmetros de CTE_JANELA, exceto $ufs.
+    
+    Args:
+        taxas: Taxa de TAXAS -> coluna do cubo com o numerador (None = TAXAS_CUBO)
+    """
+    taxas = TAXAS_CUBO if taxas is None else taxas
+    
+    regioes = ", ".join(f"('{uf}', '{regiao}')" for uf, regiao in REGIAO_UF.items())
+    colunas_cubo = "".join(f", {coluna}" for coluna in taxas.values())
+    colunas_pontas = "".join(
+        f", CAST(COALESCE(SUM(casos) FILTER (WHERE {TAXAS[nome]}), 0) AS BIGINT) AS {coluna}"
+        for nome, coluna in taxas.items()
+    )
+    colunas_taxas = "".join(
+        f""",
+            COALESCE(SUM(c.{coluna})::FLOAT / NULLIF(SUM(c.casos), 0) * 100, 0) AS {nome}"""
+        for nome, coluna in taxas.items()
+    )
+    
+    return f"""
+    WITH regioes(uf, regiao) AS (VALUES {regioes}),
+    janela AS (
+        SELECT mes, SG_UF_NOT, casos{colunas_cubo}
+        FROM srag_cubo_uf
+        WHERE mes >= $mes_inicio AND mes < $mes_fim
 
-            if periodo == "TOTAL_12_MESES":
-                taxa_mortalidade = taxa
-            else:
-                meses.append(periodo)
-                taxa_mortalidade_mensal.append(taxa)
-        
-        # Ocupação UTI (UTI = 1 significa internação em UTI)
-        query_uti = """
-        WITH base AS (
-            SELECT
-                *,
-                MAX(DT_NOTIFIC) OVER () AS data_max
-            FROM srag_cases
-        ),
-        filtrado AS (
-            SELECT *
-            FROM base
-            WHERE DT_NOTIFIC >= data_max - INTERVAL '1 year'
-        ),
-        mensal AS (
-            SELECT
-                date_trunc('month', DT_NOTIFIC) AS periodo,
-                COUNT(*) AS total_casos,
-                SUM(CASE WHEN UTI = 'Sim' THEN 1 ELSE 0 END) AS casos_uti,
-                SUM(CASE WHEN UTI = 'Sim' THEN 1 ELSE 0 END)::FLOAT
-                / NULLIF(COUNT(*), 0) * 100 AS ocupacao_uti
-            FROM filtrado
-            GROUP BY periodo
-        ),
-        anual AS (
-            SELECT
-                'TOTAL_12_MESES' AS periodo,
-                COUNT(*) AS total_casos,
-                SUM(CASE WHEN UTI = 'Sim' THEN 1 ELSE 0 END) AS casos_uti,
-                SUM(CASE WHEN UTI = 'Sim' THEN 1 ELSE 0 END)::FLOAT
-                / NULLIF(COUNT(*), 0) * 100 AS ocupacao_uti
-            FROM filtrado
-        )
-        SELECT *
-        FROM mensal
         UNION ALL
-        SELECT *
-        FROM anual
-        ORDER BY periodo;
-        """
-        result_uti = conn.execute(query_uti).fetchall()
-
-        ocupacao_uti = 0
-        ocupacao_uti_mensal = []
-        meses_uti = []
-
-        for row in result_uti:
-            periodo = row[0]
-            taxa = round(row[3] or 0, 1)
-
-            if periodo == "TOTAL_12_MESES":
-                ocupacao_uti = taxa
-            else:
-                meses_uti.append(periodo)
-                ocupacao_uti_mensal.append(taxa)
 
+        SELECT date_trunc('month', data) AS mes, SG_UF_NOT, CAST(SUM(casos) AS BIGINT) AS casos{colunas_pontas}
+        FROM srag_diario
+        WHERE data BETWEEN $inicio AND $fim
+          AND (data < $mes_inicio OR data >= $mes_fim)
+        GROUP BY ALL
+    )
+    SELECT
+        CASE
+            WHEN GROUPING(c.SG_UF_NOT) = 0 THEN CAST(c.SG_UF_NOT AS VARCHAR)
+            WHEN GROUPING(r.regiao) = 0 THEN r.regiao
+            ELSE '{BRASIL}'
+        END AS recorte,
+        GROUPING(c.mes) = 1 AS total,
+        c.mes,
+        CAST(SUM(c.casos) AS BIGINT) AS total_casos{colunas_taxas}
+    FROM janela c
+    LEFT JOIN regioes r ON r.uf = CAST(c.SG_UF_NOT AS VARCHAR)
+    GROUP BY GROUPING SETS (
+        (c.SG_UF_NOT, c.mes), (c.SG_UF_NOT),
+        (r.regiao, c.mes), (r.regiao),
+        (c.mes), ()
+    )
+    ORDER BY recorte, total, c.mes
+    """
+
+
+def _assemble_metrics(rows) -> dict:
+    """
+    Monta o resultado de get_metrics_data a partir das linhas do GROUPING SETS
+    
+    Args:
+        rows: Linhas (total, mes, total_casos, *taxas na ordem de TAXAS)
+    
+    Returns:
+        Taxas da janela, séries mensais, taxa de aumento (MoM) e casos (zeros
+        e séries vazias se a janela não tem casos)
+    """
+    metricas = {nome: 0 for nome in TAXAS}
+    series = {nome: [] for nome in TAXAS}
+    meses = []
+    casos_janela = []
+    casos_total = 0
+    
+    for total, mes, total_casos, *taxas in rows:
+        if total:
+            casos_total = total_casos or 0
+        for nome, taxa in zip(TAXAS, taxas):
+            taxa = round(taxa or 0, 1)
+            if total:
+                metricas[nome] = taxa
+            else:
+                series[nome].append(taxa)
         
-        # Taxa de Vacinação (VACINA = 1 significa vacinado)
-        query_vacinacao = """
-        WITH base AS (
-            SELECT
-                *,
-                MAX(DT_NOTIFIC) OVER () AS data_max
-            FROM srag_cases
-        ),
-        filtrado AS (
-            SELECT *
-            FROM base
-            WHERE DT_NOTIFIC >= data_max - INTERVAL '1 year'
-        ),
-        mensal AS (
-            SELECT
-                date_trunc('month', DT_NOTIFIC) AS periodo,
-                COUNT(*) AS total_casos,
-                SUM(CASE WHEN VACINA = 'Sim' THEN 1 ELSE 0 END) AS vacinados,
-                SUM(CASE WHEN VACINA = 'Sim' THEN 1 ELSE 0 END)::FLOAT
-                / NULLIF(COUNT(*), 0) * 100 AS taxa_vacinacao
-            FROM filtrado
-            GROUP BY periodo
-        ),
-        anual AS (
-            SELECT
-                'TOTAL_12_MESES' AS periodo,
-                COUNT(*) AS total_casos,
-                SUM(CASE WHEN VACINA = 'Sim' THEN 1 ELSE 0 END) AS vacinados,
-                SUM(CASE WHEN VACINA = 'Sim' THEN 1 ELSE 0 END)::FLOAT
-                / NULLIF(COUNT(*), 0) * 100 AS taxa_vacinacao
-            FROM filtrado
+        if not total:
+            meses.append(mes)
+            casos_janela.append(total_casos)
+    
+    # Taxa de Aumento (MoM): os 12 últimos meses da janela, sem o mês de corte
+    casos_mensais = []
+    if meses:
+        ultimo = meses[-1]
+        inicio = ultimo.year * 12 + ultimo.month - 1 - 11
+        casos_mensais = [
+            casos
+            for mes, casos in zip(meses, casos_janela)
+            if mes.year * 12 + mes.month - 1 >= inicio
+        ]
+    
+    if len(casos_mensais) >= 2 and casos_mensais[-2] > 0:
+        taxa_aumento_mom = round(
+            (casos_mensais[-1] - casos_mensais[-2]) / casos_mensais[-2] * 100,
+            1
         )
-        SELECT *
-        FROM mensal
-        UNION ALL
-        SELECT *
-        FROM anual
-        ORDER BY periodo;
-        """
-        result_vacinacao = conn.execute(query_vacinacao).fetchall()
-
-        taxa_vacinacao = 0
-        taxa_vacinacao_mensal = []
-        meses_vac = []
-
-        for row in result_vacinacao:
-            periodo = row[0]
-            taxa = round(row[3] or 0, 1)  # 👈 arredondamento aqui
-
-            if periodo == "TOTAL_12_MESES":
-                taxa_vacinacao = taxa
-            else:
-                meses_vac.append(periodo)
-                taxa_vacinacao_mensal.append(taxa)
+    else:
+        taxa_aumento_mom = 0
+    
+    resultado = {}
+    for nome in TAXAS:
+        resultado[nome] = metricas[nome]
+        resultado[f"{nome}_mensal"] = series[nome]
+    resultado["taxa_aumento"] = taxa_aumento_mom
+    resultado["casos_mensais"] = casos_mensais
+    resultado["total_casos"] = casos_total
+    
+    return resultado
+
+
+def get_metrics_data(inicio: Data = None, fim: Data = None, ufs: UFs = None):
+    """
+    Obtém todas as métricas do banco de dados
+    
+    Args:
+        inicio: Primeiro dia da janela (None = um ano antes de fim)
+        fim: Último dia da janela (None = notificação mais recente)
+        ufs: UF ou lista de UFs (None = Brasil)
+    """
+    try:
+        with get_db_connection() as conn:
+            rows = conn.execute(build_metrics_query(), _window_params(conn, inicio, fim, "mes", ufs)).fetchall()
         
-        return {
-            "taxa_mortalidade": taxa_mortalidade,
-            "taxa_mortalidade_mensal": taxa_mortalidade_mensal,
-            "ocupacao_uti": ocupacao_uti,
-            "ocupacao_uti_mensal": ocupacao_uti_mensal,
-            "taxa_vacinacao": taxa_vacinacao,
-            "taxa_vacinacao_mensal": taxa_vacinacao_mensal,
-            "taxa_aumento": taxa_aumento_mom,
-            "casos_mensais": casos_mensais
-        }
+        return _assemble_metrics(rows)
     
     except Exception as e:
         print(f"Erro ao consultar banco de dados: {e}")
-        return {
-            "taxa_aumento": 0,
-            "taxa_mortalidade": 0,
-            "ocupacao_uti": 0,
-            "taxa_vacinacao": 0,
-            "casos_aumento": 0
-        }
-
-
-def get_daily_cases():
-    """Obtém casos diários dos últimos 30 dias"""
-    conn = get_db_connection()
-    
-    query = """
-    SELECT 
-        DATE(DT_NOTIFIC) as data,
-        COUNT(*) as casos
-    FROM srag_cases
-    WHERE 1=1
-        AND DT_NOTIFIC BETWEEN (SELECT MAX(DT_NOTIFIC) - INTERVAL '30 days' FROM srag_cases) AND (SELECT MAX(DT_NOTIFIC) FROM srag_cases)
-    GROUP BY DATE(DT_NOTIFIC)
-    ORDER BY data
+        # Mesmo formato de uma janela sem casos: o dashboard lê todas as chaves
+        return _assemble_metrics([])
+
+
+def get_drilldown_metrics(inicio: Data = None, fim: Data = None):
+    """
+    Obtém as métricas de todas as UFs, macrorregiões e do Brasil numa só leitura
+    
+    A janela é a de get_metrics_data: para cada recorte, o resultado é o
+    mesmo de get_metrics_data(inicio, fim, ufs) com as UFs do recorte.
+    
+    Args:
+        inicio: Primeiro dia da janela (None = um ano antes de fim)
+        fim: Último dia da janela (None = notificação mais recente)
+    
+    Returns:
+        Métricas no formato de get_metrics_data por recorte: sigla da UF,
+        macrorregião (data.ufs.REGIOES) ou BRASIL. Vazio em caso de erro.
+    """
+    try:
+        with get_db_connection() as conn:
+            params = _window_params(conn, inicio, fim, "mes", None)
+            rows = conn.execute(
+                build_drilldown_query(),
+                {chave: params[chave] for chave in ("inicio", "fim", "mes_inicio", "mes_fim")}
+            ).fetchall()
+    
+    except Exception as e:
+        print(f"Erro ao consultar drill-down: {e}")
+        return {}
+    
+    # Casos sem UF entram só no total do Brasil
+    por_recorte = defaultdict(list)
+    for recorte, *linha in rows:
+        if recorte is not None:
+            por_recorte[recorte].append(linha)
+    
+    return {
+        recorte: _assemble_metrics(linhas)
+        for recorte, linhas in por_recorte.items()
+        if any(not total for total, *_ in linhas)
+    }
+
+
+def get_cases(inicio: Data = None, fim: Data = None, granularidade: str = "dia", ufs: UFs = None):
+    """
+    Obtém a série de casos de uma janela
+    
+    Args:
+        inicio: Primeiro dia da janela (None = janela padrão da granularidade)
+        fim: Último dia da janela (None = notificação mais recente)
+        granularidade: "dia", "mes" ou "ano"
+        ufs: UF ou lista de UFs (None = Brasil)
+    
+    Returns:
+        DataFrame com a coluna do período (data, mes ou ano) e casos
     """
+    with get_db_connection() as conn:
+        params = _window_params(conn, inicio, fim, granularidade, ufs)
+        
+        if granularidade == "dia":
+            query = """
+            SELECT 
+                data,
+                CAST(SUM(casos) AS BIGINT) as casos
+            FROM srag_diario
+            WHERE data BETWEEN $inicio AND $fim
+                AND ($ufs IS NULL OR list_contains($ufs::VARCHAR[], SG_UF_NOT))
+            GROUP BY data
+            ORDER BY data
+            """
+            params = {chave: params[chave] for chave in ("inicio", "fim", "ufs")}
+        else:
+            coluna, parte, _ = GRANULARIDADES[granularidade]
+            query = f"""
+            WITH {CTE_JANELA}
+            SELECT 
+                date_trunc('{parte}', mes) AS {coluna},
+                CAST(SUM(casos) AS BIGINT) as casos
+            FROM janela
+            GROUP BY 1
+            ORDER BY 1
+            """
+        
+        return conn.execute(query, params).fetch_df()
+
+
+def get_daily_cases(inicio: Data = None, fim: Data = None, ufs: UFs = None):
+    """Obtém casos diários da janela (padrão: últimos 30 dias)"""
+    return get_cases(inicio, fim, "dia", ufs)
+
+
+def get_monthly_cases(inicio: Data = None, fim: Data = None, ufs: UFs = None):
+    """Obtém casos mensais da janela (padrão: últimos 12 meses)"""
+    return get_cases(inicio, fim, "mes", ufs)
+
+
+def read_data_version(conn):
+    """
+    Lê a versão dos dados com uma conexão já emprestada
     
-    df = conn.execute(query).fetch_df()
-    return df
+    Args:
+        conn: Conexão/cursor DuckDB
+    
+    Returns:
+        Carimbo da última atualização (str) ou None se o banco ainda não tem carga
+    """
+    row = conn.execute("SELECT MAX(ultima_atualizacao) FROM metadata").fetchone()
+    return str(row[0]) if row and row[0] is not None else None
 
 
-def get_monthly_cases():
-    """Obtém casos mensais dos últimos 12 meses"""
-    conn = get_db_connection()
+def get_data_version():
+    """
+    Obtém a versão dos dados: o carimbo da última atualização do banco
     
-    query = """
-    SELECT 
-        DATE_TRUNC('month', DT_NOTIFIC) as mes,
-        COUNT(*) as casos
-    FROM srag_cases
-    WHERE 1=1
-        AND DT_NOTIFIC BETWEEN (SELECT MAX(DT_NOTIFIC) - INTERVAL '12 months' FROM srag_cases) AND (SELECT MAX(DT_NOTIFIC) FROM srag_cases)
-    GROUP BY DATE_TRUNC('month', DT_NOTIFIC)
-    ORDER BY mes
+    Usada como parte da chave dos caches, que assim deixam de servir
+    resultados antigos assim que o ingestor grava uma nova carga.
     """
+    try:
+        with get_db_connection() as conn:
+            return read_data_version(conn)
     
-    df = conn.execute(query).fetch_df()
-    return df
+    except Exception as e:
+        print(f"Erro ao consultar versão dos dados: {e}")
+        return None
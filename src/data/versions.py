@@ -0,0 +1,160 @@
+"""
+Versões do banco SRAG publicadas por troca atômica (blue/green)
+
+O ingestor grava cada atualização num arquivo lateral, na pasta versoes/, e
+só ao final troca o ponteiro (srag_database.current) com um único os.replace.
+Leitores resolvem o ponteiro ao emprestar conexões: consultas em andamento
+terminam na versão antiga e as seguintes já abrem a nova, sem janela em que a
+tabela esteja vazia ou o arquivo bloqueado para escrita.
+
+Cada processo leitor mantém um lock compartilhado (flock) no arquivo .lock da
+versão que tem aberta. Uma versão antiga só é apagada quando o lock exclusivo
+é obtido, isto é, depois que todos os leitores a liberaram. Sem fcntl
+(Windows), a versão imediatamente anterior é sempre mantida.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+VERSOES_DIR = "versoes"
+
+Caminho = Union[str, Path]
+
+
+def pointer_path(db_path: Caminho) -> Path:
+    """Arquivo ponteiro do banco (ex.: srag_database.current)"""
+    return Path(db_path).with_suffix(".current")
+
+
+def lock_path(versao: Caminho) -> Path:
+    """Arquivo de lock dos leitores de uma versão"""
+    versao = Path(versao)
+    return versao.with_name(versao.name + ".lock")
+
+
+def resolve_db_path(db_path: Caminho) -> Path:
+    """
+    Resolve o arquivo da versão publicada
+
+    Args:
+        db_path: Caminho lógico do banco
+
+    Returns:
+        Arquivo da versão apontada ou o próprio db_path, se não houver ponteiro
+    """
+    db_path = Path(db_path)
+    try:
+        nome = pointer_path(db_path).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return db_path
+    return db_path.parent / nome if nome else db_path
+
+
+def new_version_path(db_path: Caminho) -> Path:
+    """Caminho de uma nova versão (ainda não publicada) do banco"""
+    db_path = Path(db_path)
+    pasta = db_path.parent / VERSOES_DIR
+    pasta.mkdir(parents=True, exist_ok=True)
+    return pasta / f"{db_path.stem}.{datetime.now():%Y%m%d_%H%M%S_%f}{db_path.suffix}"
+
+
+def publish_version(db_path: Caminho, versao: Caminho):
+    """
+    Aponta o banco para a versão, de forma atômica
+
+    Args:
+        db_path: Caminho lógico do banco
+        versao: Arquivo da versão (já fechado, sem WAL pendente)
+    """
+    db_path = Path(db_path)
+    ponteiro = pointer_path(db_path)
+    temporario = ponteiro.with_name(ponteiro.name + ".tmp")
+
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(Path(versao).resolve().relative_to(db_path.parent.resolve()).as_posix())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, ponteiro)
+
+
+class ReaderLease:
+    """Lock compartilhado que marca uma versão como aberta por este processo"""
+
+    def __init__(self, versao: Caminho):
+        """
+        Adquire o lock (bloqueia apenas enquanto a versão estiver sendo apagada)
+
+        Args:
+            versao: Arquivo da versão aberta (fora de versoes/ não há lock)
+        """
+        self.versao = Path(versao)
+        self._fd: Optional[int] = None
+
+        if fcntl is not None and self.versao.parent.name == VERSOES_DIR:
+            self._fd = os.open(lock_path(self.versao), os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+
+    def release(self):
+        """Libera o lock"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _remove_version(versao: Path) -> bool:
+    """Apaga a versão se nenhum leitor a tiver aberta"""
+    arquivos = [versao, versao.with_name(versao.name + ".wal"), lock_path(versao)]
+
+    if fcntl is None:
+        for arquivo in arquivos:
+            arquivo.unlink(missing_ok=True)
+        return True
+
+    fd = os.open(lock_path(versao), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+
+    try:
+        for arquivo in arquivos:
+            arquivo.unlink(missing_ok=True)
+    finally:
+        os.close(fd)
+    return True
+
+
+def collect_garbage(db_path: Caminho) -> List[Path]:
+    """
+    Apaga as versões anteriores à publicada que nenhum leitor tem aberta
+
+    Versões mais novas que a publicada (cargas em andamento) não são tocadas.
+
+    Args:
+        db_path: Caminho lógico do banco
+
+    Returns:
+        Versões apagadas
+    """
+    db_path = Path(db_path)
+    atual = resolve_db_path(db_path)
+    pasta = db_path.parent / VERSOES_DIR
+    if atual.parent != pasta or not pasta.exists():
+        return []
+
+    antigas = sorted(
+        versao for versao in pasta.glob(f"{db_path.stem}.*{db_path.suffix}")
+        if versao.name < atual.name
+    )
+    if fcntl is None:
+        antigas = antigas[:-1]
+
+    return [versao for versao in antigas if _remove_version(versao)]
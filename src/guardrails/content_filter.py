@@ -4,11 +4,51 @@ Bloqueia tópicos sensíveis como violência, política, religião, etc.
 """
 
 import re
+import unicodedata
 from typing import List, Dict, Set
 from agno.exceptions import CheckTrigger, InputCheckError
 from agno.guardrails import BaseGuardrail
 from agno.run.agent import RunInput
 
+_WORD_CHAR = re.compile(r"\w")
+
+# Faixas com letras maiúsculas/acentuadas e marcas combinantes que são dobradas
+_FOLD_RANGES = [
+    range(0x0041, 0x005B),  # A-Z
+    range(0x00A0, 0x0250),  # Latin-1, Latin Extended-A/B
+    range(0x0300, 0x0370),  # Marcas combinantes (acentos digitados em forma decomposta)
+    range(0x0370, 0x0530),  # Grego e cirílico
+    range(0x1E00, 0x1F00),  # Latin Extended Additional
+]
+
+
+def _build_fold_table() -> Dict[int, str]:
+    """
+    Monta, uma única vez, a tabela de str.translate que converte para minúsculas
+    e remove acentos (decomposição NFKD sem as marcas combinantes).
+    """
+    table = {}
+    for code_range in _FOLD_RANGES:
+        for code in code_range:
+            char = chr(code)
+            folded = "".join(
+                c for c in unicodedata.normalize("NFKD", char.lower())
+                if not unicodedata.combining(c)
+            )
+            # No Latin-1 só valem trocas 1:1 dentro do Latin-1 (ver _LATIN1_FOLD)
+            if code < 0x100 and (len(folded) != 1 or ord(folded) >= 0x100):
+                continue
+            if folded != char:
+                table[code] = folded
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+
+# Mesma dobra para textos codificáveis em Latin-1 (caso comum em português),
+# aplicada byte a byte por bytes.translate
+_LATIN1_FOLD = bytes(ord(_FOLD_TABLE.get(code, chr(code))) for code in range(0x100))
+
 
 class ContentFilterGuardrail(BaseGuardrail):
     """
@@ -62,6 +102,9 @@ class ContentFilterGuardrail(BaseGuardrail):
         # Adicionar palavras customizadas
         if custom_keywords:
             self.categories["custom"] = set(kw.lower() for kw in custom_keywords)
+        
+        # Pré-compilar as palavras-chave num único padrão (uma varredura por mensagem)
+        self._compile_patterns()
     
     def _build_keyword_dict(self) -> Dict[str, Set[str]]:
         """Constrói dicionário de palavras-chave por categoria."""
@@ -197,49 +240,114 @@ class ContentFilterGuardrail(BaseGuardrail):
         
         return categories
     
-    def _check_keywords(self, text: str) -> tuple[bool, str, List[str]]:
+    @staticmethod
+    def _trie_regex(keywords: Set[str]) -> str:
         """
-        Verifica se o texto contém palavras-chave bloqueadas.
+        Monta uma alternação fatorada (trie) equivalente a "kw1|kw2|...".
         
-        Returns:
-            (is_blocked, category, matched_keywords)
+        Prefixos comuns são compartilhados, então o regex decide pelo próximo
+        caractere em vez de testar cada palavra-chave em cada posição.
         """
-        text_lower = text.lower()
+        trie: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}  # fim de palavra-chave
         
-        # Normalizar texto (remover acentos para melhor matching)
-        text_normalized = self._normalize_text(text_lower)
+        def build(node: Dict[str, dict]) -> str:
+            alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not alternatives:
+                return ""
+            
+            optional = "" in node
+            if len(alternatives) == 1 and not optional:
+                return alternatives[0]
+            
+            group = "(?:" + "|".join(alternatives) + ")"
+            return group + "?" if optional else group
         
-        for category, keywords in self.categories.items():
-            matched = []
+        return build(trie)
+    
+    def _compile_patterns(self):
+        """
+        Pré-compila todas as categorias num único regex.
+        
+        Cada categoria vira um grupo nomeado com a trie das suas palavras-chave
+        já normalizadas, delimitada por word boundaries. O padrão é um lookahead,
+        então uma única varredura encontra, em cada posição, a primeira categoria
+        (na ordem de self.categories) que casa ali.
+        """
+        # Palavra-chave normalizada -> palavras-chave originais, por categoria
+        self._keyword_lookup: Dict[str, Dict[str, List[str]]] = {}
+        self._group_category: Dict[str, str] = {}
+        groups = []
+        
+        for index, (category, keywords) in enumerate(self.categories.items()):
+            lookup: Dict[str, List[str]] = {}
             for keyword in keywords:
                 keyword_normalized = self._normalize_text(keyword)
-                # Usar word boundaries para evitar falsos positivos
-                pattern = r'\b' + re.escape(keyword_normalized) + r'\b'
-                if re.search(pattern, text_normalized):
-                    matched.append(keyword)
+                if keyword_normalized:
+                    lookup.setdefault(keyword_normalized, []).append(keyword)
             
-            if matched:
-                return True, category, matched
+            if not lookup:
+                continue
+            
+            group = f"c{index}"
+            self._keyword_lookup[category] = lookup
+            self._group_category[group] = category
+            # Usar word boundaries para evitar falsos positivos
+            groups.append(rf"\b(?P<{group}>{self._trie_regex(set(lookup))})\b")
         
-        return False, "", []
+        self._category_order = {category: index for index, category in enumerate(self.categories)}
+        self._pattern = re.compile("(?=" + "|".join(groups) + ")") if groups else None
     
-    def _normalize_text(self, text: str) -> str:
-        """Remove acentos e normaliza texto."""
-        # Mapeamento de caracteres acentuados
-        replacements = {
-            'á': 'a', 'à': 'a', 'ã': 'a', 'â': 'a', 'ä': 'a',
-            'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
-            'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
-            'ó': 'o', 'ò': 'o', 'õ': 'o', 'ô': 'o', 'ö': 'o',
-            'ú': 'u', 'ù': 'u', 'û': 'u', 'ü': 'u',
-            'ç': 'c', 'ñ': 'n'
-        }
+    def _check_keywords(self, text: str) -> tuple[bool, str, List[str]]:
+        """
+        Verifica se o texto contém palavras-chave bloqueadas.
         
-        normalized = text
-        for char, replacement in replacements.items():
-            normalized = normalized.replace(char, replacement)
+        Returns:
+            (is_blocked, category, matched_keywords)
+        """
+        if self._pattern is None:
+            return False, "", []
+        
+        # Normalizar texto (minúsculas e sem acentos para melhor matching)
+        text_normalized = self._normalize_text(text)
+        
+        # Categoria -> trechos normalizados encontrados
+        found: Dict[str, List[str]] = {}
+        for match in self._pattern.finditer(text_normalized):
+            group = match.lastgroup
+            found.setdefault(self._group_category[group], []).append(match.group(group))
         
-        return normalized
+        if not found:
+            return False, "", []
+        
+        # A primeira categoria (na ordem de declaração) com ocorrência decide o bloqueio
+        category = min(found, key=self._category_order.__getitem__)
+        lookup = self._keyword_lookup[category]
+        matched = []
+        for found_text in dict.fromkeys(found[category]):
+            # O regex devolve o trecho mais longo por posição; palavras-chave que
+            # são prefixos dele (terminando em word boundary) também casaram
+            for end in range(1, len(found_text) + 1):
+                prefix = found_text[:end]
+                if prefix in lookup and (
+                    end == len(found_text)
+                    or bool(_WORD_CHAR.match(found_text[end - 1])) != bool(_WORD_CHAR.match(found_text[end]))
+                ):
+                    matched.extend(kw for kw in lookup[prefix] if kw not in matched)
+        
+        return True, category, matched
+    
+    def _normalize_text(self, text: str) -> str:
+        """Converte para minúsculas e remove acentos numa única passada."""
+        try:
+            raw = text.encode("latin-1")
+        except UnicodeEncodeError:
+            return text.translate(_FOLD_TABLE)
+        return raw.translate(_LATIN1_FOLD).decode("latin-1")
     
     def _get_error_message(self, category: str, matched_keywords: List[str]) -> str:
         """Gera mensagem de erro apropriada para a categoria."""
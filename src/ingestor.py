@@ -1,16 +1,38 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import duckdb
+import argparse
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 import logging
 
+from data.dictionary import save_dictionary
+from data.versions import VERSOES_DIR, collect_garbage, new_version_path, pointer_path, publish_version, resolve_db_path
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Armazenamento de srag_cases: "duckdb" (tabela no arquivo do banco) ou
+# "parquet" (dataset Hive particionado, exposto no banco por views)
+STORAGE = os.getenv("SRAG_STORAGE", "duckdb")
+
+# Marcadores enviados pelos workers ao escritor no modo streaming
+_FIM_ANO = object()
+_FALHA_ANO = object()
+
 
 class SRAGIngestor:
     """Classe para ingestão e atualização de dados SRAG"""
@@ -97,15 +119,148 @@ class SRAGIngestor:
         }
     }
     
-    def __init__(self, db_path: str = "data/database/srag_database.duckdb"):
+    # Tipos DuckDB equivalentes aos DTYPES
+    DUCKDB_TYPES = {
+        "string": "VARCHAR",
+        "Int8": "TINYINT"
+    }
+    
+    # Domínio fixo das colunas "category" sem mapeamento (viram ENUM)
+    DOMINIOS = {
+        "SG_UF_NOT": [
+            "AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO", "MA", "MG", "MS", "MT", "PA",
+            "PB", "PE", "PI", "PR", "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP", "TO"
+        ]
+    }
+    
+    # Ordem física de srag_cases: com os registros agrupados por data e UF, os
+    # zone maps (min/max por row group) descartam quase toda a tabela nos
+    # filtros de janela recente e de UF, sem índices ART
+    ORDEM_FISICA = ["DT_NOTIFIC", "SG_UF_NOT"]
+    
+    # Relações sem as quais uma versão do banco não é publicada
+    TABELAS_OBRIGATORIAS = ["srag_cases", "metadata"]
+    
+    # Tabelas de rollup mantidas a cada carga (dimensões dos painéis)
+    ROLLUP_DIMENSOES = ["SG_UF_NOT", "EVOLUCAO", "UTI", "VACINA"]
+    
+    # Cubo UF x mês do drill-down (srag_cubo_uf): além dos casos, uma coluna
+    # por desfecho com os casos que o apresentam
+    CUBO_DESFECHOS = {
+        "obitos": "EVOLUCAO = 'Óbito'",
+        "uti": "UTI = 'Sim'",
+        "vacinados": "VACINA = 'Sim'",
+    }
+    
+    # Armazenamento em Parquet: colunas de partição (diretórios Hive), registros
+    # por row group e versões do dataset mantidas em disco
+    PARQUET_PARTICOES = ["ano", "mes", "SG_UF_NOT"]
+    PARQUET_HIVE_TYPES = {"ano": "INTEGER", "mes": "INTEGER", "SG_UF_NOT": "VARCHAR"}
+    PARQUET_ROW_GROUP_SIZE = 122_880
+    PARQUET_VERSOES_MANTIDAS = 2
+    
+    def __init__(
+        self,
+        db_path: str = "data/database/srag_database.duckdb",
+        urls: Dict[int, str] = None,
+        storage: str = None,
+        parquet_dir: str = None
+    ):
         """
         Inicializa o ingestor
         
         Args:
             db_path: Caminho para o banco DuckDB
+            urls: Fontes por ano (URL ou caminho local). None = URLS padrão
+            storage: "duckdb" ou "parquet" (None = SRAG_STORAGE)
+            parquet_dir: Pasta do dataset Parquet (None = "parquet" ao lado do banco)
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.urls = dict(urls) if urls is not None else dict(self.URLS)
+        self.storage = storage or STORAGE
+        self.parquet_dir = Path(parquet_dir) if parquet_dir else self.db_path.parent / "parquet"
+        
+        # Versão do banco em construção dentro de new_version() (None = versão publicada)
+        self._staging: Optional[Path] = None
+        
+        if self.storage not in ("duckdb", "parquet"):
+            raise ValueError(f"Armazenamento desconhecido: {self.storage}")
+    
+    def _db_file(self) -> Path:
+        """Arquivo lido e gravado pelo ingestor: a versão em construção ou a publicada"""
+        return self._staging or resolve_db_path(self.db_path)
+    
+    @contextmanager
+    def new_version(self, copiar: bool = True) -> Iterator[Dict]:
+        """
+        Grava as operações do bloco numa nova versão do banco e a publica ao final
+        
+        O bloco escreve num arquivo lateral; leitores continuam na versão
+        publicada até a troca do ponteiro, feita de uma vez ao sair do bloco
+        sem erros. Versões antigas são apagadas quando não há mais leitores nelas.
+        Uma versão sem srag_cases ou metadata nunca é publicada.
+        
+        Args:
+            copiar: Parte de uma cópia da versão publicada (False = banco vazio, para cargas completas)
+            
+        Yields:
+            Dicionário da versão: "caminho" e "publicar" (o bloco pode marcar
+            False para descartá-la, ex.: nenhuma fonte mudou; ao sair, indica
+            se a versão foi de fato publicada)
+        """
+        atual = resolve_db_path(self.db_path)
+        lateral = new_version_path(self.db_path)
+        arquivos = [lateral, lateral.with_name(lateral.name + ".wal")]
+        
+        if copiar and atual.exists():
+            logger.info(f"📋 Copiando a versão publicada para {lateral.name}...")
+            shutil.copyfile(atual, lateral)
+            wal = atual.with_name(atual.name + ".wal")
+            if wal.exists():
+                shutil.copyfile(wal, arquivos[1])
+        
+        versao = {"caminho": lateral, "publicar": True}
+        self._staging = lateral
+        
+        try:
+            yield versao
+        except BaseException:
+            logger.error("❌ Carga interrompida: a versão publicada do banco foi mantida")
+            for arquivo in arquivos:
+                arquivo.unlink(missing_ok=True)
+            raise
+        finally:
+            self._staging = None
+        
+        if not versao["publicar"] or not lateral.exists():
+            versao["publicar"] = False
+            for arquivo in arquivos:
+                arquivo.unlink(missing_ok=True)
+            return
+        
+        conn = duckdb.connect(str(lateral))
+        try:
+            faltando = [nome for nome in self.TABELAS_OBRIGATORIAS if not self._table_exists(conn, nome)]
+            if not faltando:
+                # A versão publicada não pode depender de WAL
+                conn.execute("CHECKPOINT")
+        finally:
+            conn.close()
+        
+        if faltando:
+            logger.error(f"❌ Versão sem {', '.join(faltando)}: a versão publicada do banco foi mantida")
+            versao["publicar"] = False
+            for arquivo in arquivos:
+                arquivo.unlink(missing_ok=True)
+            return
+        
+        publish_version(self.db_path, lateral)
+        logger.info(f"🔀 Banco publicado na versão {lateral.name}")
+        
+        for removida in collect_garbage(self.db_path):
+            logger.info(f"🧹 Versão {removida.name} do banco removida (sem leitores)")
+        self._cleanup_parquet_versions()
         
     def load_year(self, url: str, ano: int) -> pd.DataFrame:
         """
@@ -135,8 +290,6 @@ class SRAGIngestor:
             return pd.DataFrame()
     
     def apply_mappings(self, df: pd.DataFrame) -> pd.DataFrame:
-        logger.info("🔄 Aplicando mapeamentos de categorias...")
-
         for col, mapping in self.MAPS.items():
             if col not in df.columns:
                 continue
@@ -164,14 +317,14 @@ class SRAGIngestor:
             DataFrame consolidado
         """
         if anos is None:
-            anos = list(self.URLS.keys())
+            anos = list(self.urls.keys())
         
         logger.info(f"📥 Iniciando carregamento de {len(anos)} anos...")
         
         dfs = []
         for ano in anos:
-            if ano in self.URLS:
-                df = self.load_year(self.URLS[ano], ano)
+            if ano in self.urls:
+                df = self.load_year(self.urls[ano], ano)
                 if not df.empty:
                     dfs.append(df)
         
@@ -184,6 +337,7 @@ class SRAGIngestor:
         df_final = pd.concat(dfs, ignore_index=True)
         
         # Aplicar mapeamentos
+        logger.info("🔄 Aplicando mapeamentos de categorias...")
         df_final = self.apply_mappings(df_final)
         
         logger.info(f"✅ Total de registros consolidados: {len(df_final):,}")
@@ -191,52 +345,743 @@ class SRAGIngestor:
         
         return df_final
     
-    def save_to_duckdb(self, df: pd.DataFrame, table_name: str = "srag_cases"):
+    def save_to_duckdb(self, df: pd.DataFrame, table_name: str = "srag_cases", fingerprints: Dict[int, str] = None):
         """
         Salva DataFrame no DuckDB
         
         Args:
             df: DataFrame para salvar
             table_name: Nome da tabela
+            fingerprints: Impressões digitais das fontes, calculadas antes da
+                leitura (None = nenhuma fonte registrada: a próxima atualização
+                incremental faz carga completa)
         """
-        logger.info(f"💾 Salvando no DuckDB: {self.db_path}")
+        logger.info(f"💾 Salvando no DuckDB: {self._db_file()}")
         
-        conn = duckdb.connect(str(self.db_path))
+        conn = duckdb.connect(str(self._db_file()))
         
         try:
             # Criar ou substituir a tabela
-            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            self._drop_relation(conn, table_name)
             conn.execute(f"""CREATE TABLE {table_name} AS 
                          SELECT 
                             * EXCLUDE(DT_NASC, DT_NOTIFIC)
                             , CAST(DT_NASC AS DATE) AS DT_NASC
                             , CAST(DT_NOTIFIC AS DATE) AS DT_NOTIFIC
                          FROM df
+                         ORDER BY {', '.join(self.ORDEM_FISICA)}
                          """
                         )
             
-            # Criar índices para melhor performance
-            logger.info("📊 Criando índices...")
-            conn.execute(f"CREATE INDEX idx_dt_notific ON {table_name}(DT_NOTIFIC)")
-            conn.execute(f"CREATE INDEX idx_uf ON {table_name}(SG_UF_NOT)")
-            conn.execute(f"CREATE INDEX idx_ano ON {table_name}(ano)")
+            self._finalize_table(conn, table_name, fingerprints or {})
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao salvar no DuckDB: {e}")
+            raise
+        
+        finally:
+            conn.close()
+    
+    def _sort_table(self, conn, table_name: str):
+        """Regrava a tabela na ordem física de ORDEM_FISICA"""
+        logger.info("📊 Ordenando registros por data e UF...")
+        conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {table_name} ORDER BY {', '.join(self.ORDEM_FISICA)}")
+    
+    def _finalize_table(self, conn, table_name: str, fingerprints: Dict[int, str]):
+        """
+        Confere a contagem e grava os rollups, os metadados e as fontes da carga
+        
+        Args:
+            conn: Conexão DuckDB
+            table_name: Nome da tabela
+            fingerprints: Impressões digitais calculadas antes da leitura das
+                fontes (uma nova consulta poderia descrever um arquivo que mudou
+                depois do download e nunca foi carregado)
+        """
+        # Sem índices ART: a ordem física (ORDEM_FISICA) já permite podar row
+        # groups pelos zone maps, e os índices dobravam o tempo de carga e
+        # quadruplicavam o arquivo sem acelerar as consultas (bench_suite, tabela:*)
+        
+        # Verificar quantidade de registros
+        count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        logger.info(f"✅ {count:,} registros salvos na tabela '{table_name}'")
+        
+        # Agregados diários e mensais consultados pelo dashboard
+        self._refresh_rollups(conn, table_name)
+        
+        # Salvar metadados da atualização (a tabela deixa de apontar para um dataset Parquet)
+        self._save_metadata(conn)
+        conn.execute("DROP TABLE IF EXISTS metadata_parquet")
+        
+        # Registrar as fontes carregadas para as próximas atualizações incrementais
+        anos = {row[0] for row in conn.execute(f"SELECT DISTINCT ano FROM {table_name}").fetchall()}
+        conn.execute("DROP TABLE IF EXISTS metadata_fontes")
+        for ano, fingerprint in fingerprints.items():
+            if ano in anos:
+                self._save_fingerprint(conn, ano, fingerprint)
+    
+    @staticmethod
+    def _table_exists(conn, table_name: str) -> bool:
+        """Indica se a tabela existe no banco"""
+        return conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+            [table_name]
+        ).fetchone()[0] > 0
+    
+    @staticmethod
+    def _drop_relation(conn, name: str):
+        """Remove a tabela ou view, se existir (troca entre armazenamento DuckDB e Parquet)"""
+        tipo = conn.execute(
+            "SELECT table_type FROM information_schema.tables WHERE table_name = ?",
+            [name]
+        ).fetchone()
+        if tipo:
+            conn.execute(f"DROP {'VIEW' if tipo[0] == 'VIEW' else 'TABLE'} {name}")
+    
+    def _rollup_sql(self, table_name: str = "srag_cases") -> Dict[str, str]:
+        """
+        Consultas dos rollups, na ordem de construção
+        
+        srag_diario sai da tabela de casos, srag_mensal de srag_diario e o cubo
+        srag_cubo_uf (UF x mês x desfechos) de srag_mensal.
+        
+        Returns:
+            Consulta de cada rollup, com o marcador {filtro} para restringir a um ano
+        """
+        dimensoes = ", ".join(self.ROLLUP_DIMENSOES)
+        desfechos = "".join(
+            f", CAST(COALESCE(SUM(casos) FILTER (WHERE {condicao}), 0) AS BIGINT) AS {nome}"
+            for nome, condicao in self.CUBO_DESFECHOS.items()
+        )
+        return {
+            "srag_diario": f"""SELECT ano, DT_NOTIFIC AS data, {dimensoes}, COUNT(*) AS casos
+                     FROM {table_name}
+                     {{filtro}}
+                     GROUP BY ALL
+                     ORDER BY data""",
+            "srag_mensal": f"""SELECT ano, date_trunc('month', data) AS mes, {dimensoes}, CAST(SUM(casos) AS BIGINT) AS casos
+                     FROM srag_diario
+                     {{filtro}}
+                     GROUP BY ALL
+                     ORDER BY mes""",
+            "srag_cubo_uf": f"""SELECT ano, mes, SG_UF_NOT, CAST(SUM(casos) AS BIGINT) AS casos{desfechos}
+                     FROM srag_mensal
+                     {{filtro}}
+                     GROUP BY ALL
+                     ORDER BY mes, SG_UF_NOT""",
+        }
+    
+    def _refresh_rollups(self, conn, table_name: str = "srag_cases", ano: int = None):
+        """
+        Atualiza os rollups srag_diario (dia x dimensões), srag_mensal (mês x
+        dimensões) e srag_cubo_uf (UF x mês x desfechos)
+        
+        Sem ano, recria os rollups a partir da tabela inteira. Com ano, substitui
+        apenas as linhas daquele ano (deve rodar na mesma transação da carga do ano).
+        
+        Args:
+            conn: Conexão DuckDB
+            table_name: Tabela de casos usada como origem
+            ano: Ano a ser substituído (None = todos)
+        """
+        rollups = self._rollup_sql(table_name)
+        
+        existentes = all(self._table_exists(conn, rollup) for rollup in rollups)
+        
+        if ano is None or not existentes:
+            logger.info("📊 Recriando rollups diário, mensal e por UF...")
+            for rollup in rollups:
+                self._drop_relation(conn, rollup)
+            for rollup, consulta in rollups.items():
+                conn.execute(f"CREATE OR REPLACE TABLE {rollup} AS {consulta.format(filtro='')}")
+            return
+        
+        for rollup, consulta in rollups.items():
+            conn.execute(f"DELETE FROM {rollup} WHERE ano = ?", [ano])
+            conn.execute(f"INSERT INTO {rollup} {consulta.format(filtro='WHERE ano = $ano')}", {"ano": ano})
+    
+    @staticmethod
+    def _sql_literal(valor: str) -> str:
+        """Escapa um valor como literal de string SQL"""
+        return "'" + str(valor).replace("'", "''") + "'"
+    
+    def _enum_type(self, valores: List[str]) -> str:
+        """Monta o tipo ENUM do DuckDB para uma lista de valores"""
+        return f"ENUM({', '.join(self._sql_literal(v) for v in valores)})"
+    
+    def get_schema(self) -> Dict[str, str]:
+        """
+        Retorna os tipos DuckDB das colunas da tabela final
+        
+        Colunas de MAPS viram ENUM dos rótulos, colunas "category" de DTYPES
+        viram ENUM do seu domínio e DATE_COLS viram DATE.
+        
+        Returns:
+            Dicionário coluna -> tipo DuckDB, na ordem da tabela
+        """
+        schema = {}
+        for col in self.COLUNAS:
+            if col in self.DATE_COLS:
+                continue
+            if col in self.MAPS:
+                schema[col] = self._enum_type(list(self.MAPS[col].values()))
+            elif self.DTYPES.get(col) == "category":
+                schema[col] = self._enum_type(self.DOMINIOS[col])
+            else:
+                schema[col] = self.DUCKDB_TYPES.get(self.DTYPES.get(col), "VARCHAR")
+        
+        schema["ano"] = "INTEGER"
+        for col in self.DATE_COLS:
+            schema[col] = "DATE"
+        
+        return schema
+    
+    def _transform_sql(self, source: str, ano: int) -> str:
+        """
+        Monta o SELECT que aplica MAPS, DTYPES e DATE_COLS sobre os dados brutos
+        
+        Args:
+            source: Relação DuckDB com as colunas brutas (ex.: read_parquet(...))
+            ano: Ano dos dados
+            
+        Returns:
+            Consulta SQL com as colunas já convertidas para o schema final
+        """
+        expressoes = []
+        for col, tipo in self.get_schema().items():
+            if col == "ano":
+                expressoes.append(f"CAST({int(ano)} AS INTEGER) AS ano")
             
-            # Verificar quantidade de registros
-            count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-            logger.info(f"✅ {count:,} registros salvos na tabela '{table_name}'")
+            elif col in self.MAPS:
+                mapping = self.MAPS[col]
+                valor = f"CAST({col} AS VARCHAR)"
+                
+                # Preencher None com "9" (Ignorado) para colunas que têm essa chave
+                if "9" in mapping:
+                    valor = f"COALESCE({valor}, '9')"
+                
+                casos = " ".join(
+                    f"WHEN {self._sql_literal(codigo)} THEN {self._sql_literal(rotulo)}"
+                    for codigo, rotulo in mapping.items()
+                )
+                expressoes.append(f"CAST(CASE {valor} {casos} END AS {tipo}) AS {col}")
             
-            # Salvar metadados da atualização
-            self._save_metadata(conn)
+            elif tipo.startswith("ENUM"):
+                # Valores fora do domínio viram NULL
+                expressoes.append(f"TRY_CAST({col} AS {tipo}) AS {col}")
+            
+            else:
+                expressoes.append(f"CAST({col} AS {tipo}) AS {col}")
+        
+        return f"SELECT {', '.join(expressoes)} FROM {source}"
+    
+    def ingest_sql(
+        self,
+        anos: List[int] = None,
+        table_name: str = "srag_cases",
+        fingerprints: Dict[int, str] = None
+    ) -> int:
+        """
+        Carrega os anos com um único pipeline DuckDB read_parquet -> CREATE TABLE AS
+        
+        Mapeamentos, conversões de tipo e datas são aplicados em SQL, sem
+        materializar os dados em pandas. Anos cuja fonte não responde são ignorados.
+        
+        Args:
+            anos: Lista de anos para carregar (None = todos)
+            table_name: Nome da tabela
+            fingerprints: Impressões digitais já calculadas (None = calcula antes da leitura)
+            
+        Returns:
+            Quantidade de registros gravados
+        """
+        if anos is None:
+            anos = list(self.urls.keys())
+        if fingerprints is None:
+            fingerprints = self._get_fingerprints(anos)
+        
+        # Só entram no pipeline as fontes acessíveis
+        disponiveis = [ano for ano in anos if ano in fingerprints]
+        
+        if not disponiveis:
+            logger.error("❌ Nenhum dado foi carregado!")
+            return 0
+        
+        logger.info(f"📥 Carregando {len(disponiveis)} anos via DuckDB: {disponiveis}")
+        
+        selects = "\nUNION ALL\n".join(
+            self._transform_sql(f"read_parquet({self._sql_literal(self.urls[ano])})", ano)
+            for ano in disponiveis
+        )
+        
+        conn = duckdb.connect(str(self._db_file()))
+        
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            self._drop_relation(conn, table_name)
+            conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM ({selects}) ORDER BY {', '.join(self.ORDEM_FISICA)}")
+            conn.execute("COMMIT")
+            
+            self._finalize_table(conn, table_name, fingerprints)
+            return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
             
         except Exception as e:
             logger.error(f"❌ Erro ao salvar no DuckDB: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except duckdb.TransactionException:
+                # Erro após o COMMIT: não há transação aberta
+                pass
             raise
         
         finally:
             conn.close()
     
+    @staticmethod
+    def _is_remote(url: str) -> bool:
+        """Indica se a fonte é remota (HTTP/HTTPS)"""
+        return str(url).startswith(("http://", "https://"))
+    
+    def _download(self, url: str) -> str:
+        """
+        Baixa uma fonte remota para um arquivo temporário, em blocos
+        
+        Args:
+            url: URL do arquivo parquet
+            
+        Returns:
+            Caminho do arquivo temporário (o chamador deve removê-lo)
+        """
+        with urllib.request.urlopen(url) as resposta:
+            with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp:
+                shutil.copyfileobj(resposta, tmp, length=1024 * 1024)
+                return tmp.name
+    
+    def _iter_year_batches(self, url: str, batch_size: int) -> Iterator[pa.RecordBatch]:
+        """
+        Lê um ano lote a lote, sem conversão (a transformação é feita no DuckDB)
+        
+        Args:
+            url: URL ou caminho local do arquivo parquet
+            batch_size: Quantidade máxima de registros por lote
+            
+        Yields:
+            Lote Arrow com as colunas brutas de COLUNAS
+        """
+        tmp_path = None
+        
+        try:
+            source = url
+            if self._is_remote(url):
+                tmp_path = self._download(url)
+                source = tmp_path
+            
+            parquet = pq.ParquetFile(source)
+            yield from parquet.iter_batches(batch_size=batch_size, columns=self.COLUNAS)
+        
+        finally:
+            if tmp_path:
+                os.remove(tmp_path)
+    
+    def _insert_batch(self, conn, batch: pa.RecordBatch, ano: int, table_name: str):
+        """Transforma um lote bruto no DuckDB e o insere na tabela"""
+        conn.execute(f"INSERT INTO {table_name} BY NAME {self._transform_sql('batch', ano)}")
+    
+    def _stream_year(
+        self,
+        url: str,
+        ano: int,
+        fila: queue.Queue,
+        batch_size: int,
+        cancelar: threading.Event
+    ) -> int:
+        """
+        Lê um ano lote a lote e envia cada lote bruto para a fila do escritor
+        
+        Args:
+            url: URL ou caminho local do arquivo parquet
+            ano: Ano dos dados
+            fila: Fila limitada consumida pelo escritor DuckDB
+            batch_size: Quantidade máxima de registros por lote
+            cancelar: Sinalizado pelo escritor para interromper a leitura
+            
+        Returns:
+            Quantidade de registros lidos
+        """
+        logger.info(f"⚡ Carregando {ano} (streaming)...")
+        
+        total = 0
+        
+        try:
+            for batch in self._iter_year_batches(url, batch_size):
+                if cancelar.is_set():
+                    raise RuntimeError("carga cancelada")
+                fila.put((ano, batch))
+                total += batch.num_rows
+            
+            fila.put((ano, _FIM_ANO))
+            logger.info(f"✅ {ano}: {total:,} registros carregados")
+            return total
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao carregar {ano}: {e}")
+            fila.put((ano, _FALHA_ANO))
+            return 0
+    
+    def ingest_streaming(
+        self,
+        anos: List[int] = None,
+        max_workers: int = 4,
+        batch_size: int = 250_000,
+        table_name: str = "srag_cases",
+        fingerprints: Dict[int, str] = None
+    ) -> int:
+        """
+        Carrega os anos em paralelo e grava cada lote direto no DuckDB
+        
+        Cada worker lê um ano em lotes (Arrow) e os coloca numa fila limitada;
+        uma única conexão DuckDB consome a fila e insere os lotes. O pico de
+        memória fica limitado a poucos lotes e o tempo total ao ano mais lento.
+        
+        Args:
+            anos: Lista de anos para carregar (None = todos)
+            max_workers: Quantidade máxima de anos baixados em paralelo
+            batch_size: Quantidade máxima de registros por lote
+            table_name: Nome da tabela
+            fingerprints: Impressões digitais já calculadas (None = calcula antes da leitura)
+            
+        Returns:
+            Quantidade de registros gravados
+        """
+        if anos is None:
+            anos = list(self.urls.keys())
+        anos = [ano for ano in anos if ano in self.urls]
+        
+        if not anos:
+            logger.error("❌ Nenhum ano válido para carregar!")
+            return 0
+        
+        if fingerprints is None:
+            fingerprints = self._get_fingerprints(anos)
+        
+        logger.info(f"📥 Iniciando carregamento streaming de {len(anos)} anos ({max_workers} workers)...")
+        
+        conn = duckdb.connect(str(self._db_file()))
+        fila = queue.Queue(maxsize=max_workers)
+        cancelar = threading.Event()
+        
+        try:
+            # Uma única transação: leitores veem a tabela antiga até o COMMIT
+            # e o DuckDB grava os lotes direto no arquivo, sem passar pelo WAL
+            conn.execute("BEGIN TRANSACTION")
+            colunas = ", ".join(f"{col} {tipo}" for col, tipo in self.get_schema().items())
+            self._drop_relation(conn, table_name)
+            conn.execute(f"CREATE TABLE {table_name} ({colunas})")
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for ano in anos:
+                    executor.submit(self._stream_year, self.urls[ano], ano, fila, batch_size, cancelar)
+                
+                pendentes = len(anos)
+                carregados = 0
+                try:
+                    while pendentes:
+                        ano, batch = fila.get()
+                        
+                        if batch is _FIM_ANO:
+                            pendentes -= 1
+                            carregados += 1
+                        elif batch is _FALHA_ANO:
+                            # Descarta lotes parciais do ano que falhou
+                            pendentes -= 1
+                            conn.execute(f"DELETE FROM {table_name} WHERE ano = ?", [ano])
+                        else:
+                            self._insert_batch(conn, batch, ano, table_name)
+                except BaseException:
+                    # Libera os workers bloqueados na fila antes de propagar o erro
+                    cancelar.set()
+                    while pendentes:
+                        _, batch = fila.get()
+                        if batch is _FIM_ANO or batch is _FALHA_ANO:
+                            pendentes -= 1
+                    raise
+            
+            if not carregados:
+                conn.execute("ROLLBACK")
+                logger.error("❌ Nenhum dado foi carregado!")
+                return 0
+            
+            # Os lotes chegam intercalados entre os anos
+            self._sort_table(conn, table_name)
+            conn.execute("COMMIT")
+            
+            self._finalize_table(conn, table_name, fingerprints)
+            return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao salvar no DuckDB: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except duckdb.TransactionException:
+                # Erro após o COMMIT: não há transação aberta
+                pass
+            raise
+        
+        finally:
+            conn.close()
+    
+    def _parquet_source(self, versao: Path) -> str:
+        """read_parquet sobre o srag_cases de uma versão do dataset, com as partições Hive tipadas"""
+        caminho = self._sql_literal(versao.resolve() / "srag_cases" / "**" / "*.parquet")
+        tipos = ", ".join(f"'{col}': {tipo}" for col, tipo in self.PARQUET_HIVE_TYPES.items())
+        return f"read_parquet({caminho}, hive_partitioning = true, hive_types = {{{tipos}}})"
+    
+    def _new_parquet_version(self) -> Path:
+        """Cria a pasta de uma nova versão do dataset Parquet"""
+        versao = self.parquet_dir / datetime.now().strftime("v%Y%m%d_%H%M%S_%f")
+        versao.mkdir(parents=True)
+        return versao
+    
+    def get_parquet_version(self) -> Optional[Path]:
+        """
+        Retorna a versão do dataset Parquet publicada no banco
+        
+        Returns:
+            Pasta da versão ou None se srag_cases está armazenada no próprio DuckDB
+        """
+        if not self._db_file().exists():
+            return None
+        
+        conn = duckdb.connect(str(self._db_file()), read_only=True)
+        
+        try:
+            row = conn.execute("SELECT caminho FROM metadata_parquet").fetchone()
+            return Path(row[0]) if row else None
+            
+        except duckdb.Error:
+            return None
+        
+        finally:
+            conn.close()
+    
+    def _write_parquet(self, versao: Path, anos: List[int], anterior: Path = None) -> int:
+        """
+        Grava os anos no dataset da versão, particionado por ano/mês/UF, e os rollups
+        
+        Roda numa conexão DuckDB em memória: o arquivo do banco não é aberto.
+        
+        Args:
+            versao: Pasta da nova versão
+            anos: Anos lidos das fontes
+            anterior: Versão publicada cujos demais anos são reaproveitados (hard links)
+            
+        Returns:
+            Quantidade de registros do dataset
+        """
+        selects = "\nUNION ALL\n".join(
+            self._transform_sql(f"read_parquet({self._sql_literal(self.urls[ano])})", ano)
+            for ano in anos
+        )
+        particoes = ", ".join(self.PARQUET_PARTICOES)
+        
+        conn = duckdb.connect()
+        
+        try:
+            conn.execute(f"""COPY (SELECT *, CAST(month(DT_NOTIFIC) AS INTEGER) AS mes FROM ({selects}))
+                         TO {self._sql_literal(versao / "srag_cases")}
+                         (FORMAT PARQUET, PARTITION_BY ({particoes}), COMPRESSION ZSTD,
+                          ROW_GROUP_SIZE {self.PARQUET_ROW_GROUP_SIZE})"""
+                        )
+            
+            # Partições dos anos não recarregados: hard links dos arquivos da versão anterior
+            if anterior is not None:
+                for particao in (anterior / "srag_cases").glob("ano=*"):
+                    if int(particao.name.split("=", 1)[1]) not in anos:
+                        shutil.copytree(particao, versao / "srag_cases" / particao.name, copy_function=os.link)
+            
+            logger.info("📊 Gravando rollups diário, mensal e por UF...")
+            conn.execute(f"CREATE TEMP VIEW srag_cases AS SELECT * FROM {self._parquet_source(versao)}")
+            for nome, consulta in self._rollup_sql().items():
+                arquivo = self._sql_literal(versao / f"{nome}.parquet")
+                conn.execute(f"COPY ({consulta.format(filtro='')}) TO {arquivo} (FORMAT PARQUET, COMPRESSION ZSTD)")
+                conn.execute(f"CREATE TEMP VIEW {nome} AS SELECT * FROM read_parquet({arquivo})")
+            
+            return conn.execute("SELECT COUNT(*) FROM srag_cases").fetchone()[0]
+        
+        finally:
+            conn.close()
+    
+    def _publish_parquet(self, versao: Path, fingerprints: Dict[int, str], completa: bool):
+        """
+        Aponta as views do banco para a versão do dataset e registra a carga
+        
+        A escrita no arquivo do banco se resume a views e metadados, numa
+        única transação curta.
+        
+        Args:
+            versao: Pasta da versão publicada
+            fingerprints: Impressões digitais dos anos gravados na versão
+            completa: Se True, substitui todo o registro de fontes
+        """
+        colunas = ", ".join(self.get_schema())
+        rollups = list(self._rollup_sql())
+        
+        conn = duckdb.connect(str(self._db_file()))
+        
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            for nome in ["srag_cases", *rollups]:
+                self._drop_relation(conn, nome)
+            
+            conn.execute(f"CREATE VIEW srag_cases AS SELECT {colunas} FROM {self._parquet_source(versao)}")
+            for nome in rollups:
+                arquivo = self._sql_literal(versao.resolve() / f"{nome}.parquet")
+                conn.execute(f"CREATE VIEW {nome} AS SELECT * FROM read_parquet({arquivo})")
+            
+            self._save_metadata(conn)
+            conn.execute("CREATE OR REPLACE TABLE metadata_parquet (versao VARCHAR, caminho VARCHAR, criado_em TIMESTAMP)")
+            conn.execute(
+                "INSERT INTO metadata_parquet VALUES (?, ?, ?)",
+                [versao.name, str(versao.resolve()), datetime.now()]
+            )
+            
+            if completa:
+                conn.execute("DROP TABLE IF EXISTS metadata_fontes")
+            for ano, fingerprint in fingerprints.items():
+                self._save_fingerprint(conn, ano, fingerprint)
+            
+            conn.execute("COMMIT")
+            
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        finally:
+            conn.close()
+        
+        logger.info(f"🔀 Views apontando para a versão {versao.name}")
+        
+        # Dentro de new_version() a limpeza espera a publicação do banco
+        if self._staging is None:
+            self._cleanup_parquet_versions()
+    
+    def _parquet_versions_in_use(self) -> Optional[set]:
+        """
+        Versões do dataset referenciadas pelas versões do banco ainda em disco
+        
+        Returns:
+            Nomes das versões ou None se algum banco não pôde ser lido (ex.: carga em andamento)
+        """
+        bancos = sorted((self.db_path.parent / VERSOES_DIR).glob(f"{self.db_path.stem}.*{self.db_path.suffix}"))
+        if not pointer_path(self.db_path).exists():
+            bancos.append(self.db_path)
+        
+        em_uso = set()
+        for banco in bancos:
+            if not banco.exists():
+                continue
+            try:
+                conn = duckdb.connect(str(banco), read_only=True)
+            except duckdb.Error:
+                return None
+            try:
+                em_uso.update(Path(row[0]).name for row in conn.execute("SELECT caminho FROM metadata_parquet").fetchall())
+            except duckdb.Error:
+                pass
+            finally:
+                conn.close()
+        return em_uso
+    
+    def _cleanup_parquet_versions(self):
+        """
+        Remove as versões antigas do dataset que nenhuma versão do banco referencia
+        
+        As PARQUET_VERSOES_MANTIDAS mais recentes são sempre mantidas.
+        """
+        em_uso = self._parquet_versions_in_use()
+        if em_uso is None:
+            return
+        
+        versoes = sorted(p for p in self.parquet_dir.glob("v*") if p.is_dir())
+        for antiga in versoes[:-self.PARQUET_VERSOES_MANTIDAS]:
+            if antiga.name not in em_uso:
+                shutil.rmtree(antiga, ignore_errors=True)
+                logger.info(f"🧹 Versão {antiga.name} do dataset removida")
+    
+    def ingest_parquet(self, anos: List[int] = None, fingerprints: Dict[int, str] = None) -> int:
+        """
+        Grava srag_cases como dataset Parquet particionado e publica as views no banco
+        
+        O dataset (ano/mês/UF, ZSTD, estatísticas min/max por row group) é
+        escrito numa nova versão, sem lock no arquivo do banco; as views de
+        srag_cases e dos rollups passam a apontar para ela ao final.
+        Consultas filtradas por ano ou UF leem apenas as partições necessárias.
+        
+        Args:
+            anos: Lista de anos para carregar (None = todos)
+            fingerprints: Impressões digitais já calculadas (None = calcula antes da leitura)
+            
+        Returns:
+            Quantidade de registros gravados
+        """
+        if anos is None:
+            anos = list(self.urls.keys())
+        if fingerprints is None:
+            fingerprints = self._get_fingerprints(anos)
+        disponiveis = [ano for ano in anos if ano in fingerprints]
+        
+        if not disponiveis:
+            logger.error("❌ Nenhum dado foi carregado!")
+            return 0
+        
+        logger.info(f"📥 Gravando {len(disponiveis)} anos em Parquet: {disponiveis}")
+        versao = self._new_parquet_version()
+        
+        try:
+            total = self._write_parquet(versao, disponiveis)
+            self._publish_parquet(versao, {ano: fingerprints[ano] for ano in disponiveis}, completa=True)
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar o dataset Parquet: {e}")
+            shutil.rmtree(versao, ignore_errors=True)
+            raise
+        
+        logger.info(f"✅ {total:,} registros gravados em {versao}")
+        return total
+    
+    def _refresh_parquet(self, alterados: List[int], atuais: Dict[int, str], anterior: Path) -> List[int]:
+        """
+        Regrava os anos alterados numa nova versão do dataset
+        
+        Os anos não alterados entram na nova versão por hard links, sem cópia.
+        
+        Returns:
+            Lista dos anos recarregados (vazia se a gravação falhou)
+        """
+        versao = self._new_parquet_version()
+        
+        try:
+            total = self._write_parquet(versao, alterados, anterior)
+            self._publish_parquet(versao, {ano: atuais[ano] for ano in alterados}, completa=False)
+            
+        except Exception as e:
+            # Mantém a versão publicada
+            logger.error(f"❌ Erro ao regravar {alterados}: {e}")
+            shutil.rmtree(versao, ignore_errors=True)
+            return []
+        
+        logger.info(f"✅ Partições de {alterados} substituídas ({total:,} registros no dataset)")
+        return alterados
+    
     def _save_metadata(self, conn):
-        """Salva metadados da última atualização"""
+        """
+        Salva metadados da última atualização
+        
+        Além do carimbo da carga, grava o intervalo de notificações dos dados
+        (data_min/data_max, âncora das janelas de data/queries.py) e a
+        quantidade de registros por ano (metadata_anos). Tudo sai do rollup
+        srag_diario, que deve estar atualizado.
+        """
         metadata = {
             'ultima_atualizacao': [datetime.now()],
             'versao': ['1.0']
@@ -244,10 +1089,228 @@ class SRAGIngestor:
         
         df_meta = pd.DataFrame(metadata)
         conn.execute("DROP TABLE IF EXISTS metadata")
-        conn.execute("CREATE TABLE metadata AS SELECT * FROM df_meta")
+        conn.execute("""CREATE TABLE metadata AS
+                     SELECT m.*, l.data_min, l.data_max
+                     FROM df_meta m, (SELECT MIN(data) AS data_min, MAX(data) AS data_max FROM srag_diario) l
+                     """
+                    )
+        conn.execute("""CREATE OR REPLACE TABLE metadata_anos AS
+                     SELECT ano, CAST(SUM(casos) AS BIGINT) AS registros
+                     FROM srag_diario
+                     GROUP BY ano
+                     ORDER BY ano
+                     """
+                    )
         
         logger.info("📝 Metadados salvos")
     
+    def get_fingerprint(self, url: str) -> str:
+        """
+        Calcula a impressão digital de uma fonte sem baixá-la
+        
+        Fontes remotas usam o ETag (ou tamanho + Last-Modified) de um HEAD;
+        arquivos locais usam tamanho + mtime.
+        
+        Args:
+            url: URL ou caminho local do arquivo parquet
+            
+        Returns:
+            Impressão digital da fonte
+        """
+        if self._is_remote(url):
+            request = urllib.request.Request(url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=30) as resposta:
+                headers = resposta.headers
+            
+            etag = headers.get("ETag")
+            if etag:
+                return "etag:" + etag.strip('"')
+            return f"http:{headers.get('Content-Length')}:{headers.get('Last-Modified')}"
+        
+        stat = Path(url).stat()
+        return f"local:{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def _get_fingerprints(self, anos: List[int]) -> Dict[int, str]:
+        """
+        Calcula em paralelo as impressões digitais das fontes dos anos
+        
+        Args:
+            anos: Lista de anos
+            
+        Returns:
+            Dicionário ano -> impressão digital (anos com erro são omitidos)
+        """
+        def calcular(ano):
+            try:
+                return ano, self.get_fingerprint(self.urls[ano])
+            except Exception as e:
+                logger.warning(f"⚠️ Não foi possível verificar a fonte de {ano}: {e}")
+                return ano, None
+        
+        anos = [ano for ano in anos if ano in self.urls]
+        if not anos:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=len(anos)) as executor:
+            return {
+                ano: fingerprint
+                for ano, fingerprint in executor.map(calcular, anos)
+                if fingerprint is not None
+            }
+    
+    def _save_fingerprint(self, conn, ano: int, fingerprint: str):
+        """Registra a impressão digital da fonte de um ano"""
+        conn.execute("""CREATE TABLE IF NOT EXISTS metadata_fontes (
+                        ano INTEGER PRIMARY KEY,
+                        fonte VARCHAR,
+                        fingerprint VARCHAR,
+                        atualizado_em TIMESTAMP
+                     )"""
+                    )
+        conn.execute(
+            "INSERT OR REPLACE INTO metadata_fontes VALUES (?, ?, ?, ?)",
+            [ano, self.urls[ano], fingerprint, datetime.now()]
+        )
+    
+    def get_saved_fingerprints(self) -> Dict[int, str]:
+        """
+        Retorna as impressões digitais registradas na última carga
+        
+        Returns:
+            Dicionário ano -> impressão digital (vazio se não houver registro)
+        """
+        if not self._db_file().exists():
+            return {}
+        
+        conn = duckdb.connect(str(self._db_file()), read_only=True)
+        
+        try:
+            rows = conn.execute("SELECT ano, fingerprint FROM metadata_fontes").fetchall()
+            return {ano: fingerprint for ano, fingerprint in rows}
+            
+        except duckdb.Error:
+            return {}
+        
+        finally:
+            conn.close()
+    
+    def get_changed_years(self, atuais: Dict[int, str]) -> Optional[List[int]]:
+        """
+        Compara as impressões digitais atuais com as registradas na última carga
+        
+        Args:
+            atuais: Impressões digitais atuais das fontes (ano -> impressão)
+            
+        Returns:
+            Anos cuja fonte mudou, ou None se não há registro de fontes neste
+            armazenamento (é necessária uma carga completa)
+        """
+        registradas = self.get_saved_fingerprints()
+        anterior = self.get_parquet_version()
+        salvo = "parquet" if anterior is not None and anterior.exists() else "duckdb"
+        
+        if not registradas or salvo != self.storage:
+            return None
+        return [ano for ano in atuais if atuais[ano] != registradas.get(ano)]
+    
+    def refresh_incremental(
+        self,
+        anos: List[int] = None,
+        max_workers: int = 4,
+        batch_size: int = 250_000,
+        table_name: str = "srag_cases",
+        fingerprints: Dict[int, str] = None
+    ) -> List[int]:
+        """
+        Recarrega apenas os anos cuja fonte mudou desde a última carga
+        
+        Cada ano alterado tem sua partição substituída (DELETE + INSERT) numa
+        única transação. Os lotes do ano passam por uma tabela temporária e são
+        inseridos já ordenados (ORDEM_FISICA): como os anos não se sobrepõem, os
+        row groups continuam podáveis pelos zone maps. Sem registro de fontes,
+        executa uma carga completa.
+        
+        Args:
+            anos: Lista de anos para verificar (None = todos)
+            max_workers: Anos carregados em paralelo, caso seja necessária carga completa
+            batch_size: Quantidade máxima de registros por lote
+            table_name: Nome da tabela
+            fingerprints: Impressões digitais já calculadas (None = calcula antes da leitura)
+            
+        Returns:
+            Lista dos anos recarregados
+        """
+        if anos is None:
+            anos = list(self.urls.keys())
+        anos = [ano for ano in anos if ano in self.urls]
+        
+        # Calculadas uma única vez, antes de qualquer leitura: são as gravadas em metadata_fontes
+        if fingerprints is None:
+            fingerprints = self._get_fingerprints(anos)
+        atuais = {ano: fingerprint for ano, fingerprint in fingerprints.items() if ano in anos}
+        
+        alterados = self.get_changed_years(atuais)
+        
+        if alterados is None:
+            logger.info("ℹ️ Nenhuma fonte registrada neste armazenamento. Executando carga completa...")
+            if self.storage == "parquet":
+                total = self.ingest_parquet(anos=anos, fingerprints=atuais)
+            else:
+                total = self.ingest_streaming(
+                    anos=anos, max_workers=max_workers, batch_size=batch_size, table_name=table_name,
+                    fingerprints=atuais
+                )
+            # Só contam os anos que de fato entraram (e tiveram a fonte registrada)
+            return sorted(self.get_saved_fingerprints()) if total else []
+        
+        if not alterados:
+            logger.info("✅ Nenhuma fonte foi alterada desde a última carga.")
+            return []
+        
+        logger.info(f"♻️ Fontes alteradas: {alterados}")
+        
+        if self.storage == "parquet":
+            return self._refresh_parquet(alterados, atuais, self.get_parquet_version())
+        
+        conn = duckdb.connect(str(self._db_file()))
+        recarregados = []
+        
+        try:
+            for ano in alterados:
+                conn.execute("BEGIN TRANSACTION")
+                
+                try:
+                    conn.execute(f"DELETE FROM {table_name} WHERE ano = ?", [ano])
+                    conn.execute(f"CREATE OR REPLACE TEMP TABLE carga_ano AS SELECT * FROM {table_name} LIMIT 0")
+                    
+                    total = 0
+                    for batch in self._iter_year_batches(self.urls[ano], batch_size):
+                        self._insert_batch(conn, batch, ano, "carga_ano")
+                        total += batch.num_rows
+                    
+                    conn.execute(f"INSERT INTO {table_name} SELECT * FROM carga_ano ORDER BY {', '.join(self.ORDEM_FISICA)}")
+                    conn.execute("DROP TABLE carga_ano")
+                    
+                    self._refresh_rollups(conn, table_name, ano)
+                    self._save_fingerprint(conn, ano, atuais[ano])
+                    conn.execute("COMMIT")
+                    
+                    recarregados.append(ano)
+                    logger.info(f"✅ {ano}: partição substituída ({total:,} registros)")
+                    
+                except Exception as e:
+                    # Mantém a partição anterior do ano
+                    conn.execute("ROLLBACK")
+                    logger.error(f"❌ Erro ao recarregar {ano}: {e}")
+            
+            if recarregados:
+                self._save_metadata(conn)
+            
+            return recarregados
+        
+        finally:
+            conn.close()
+    
     def get_last_update(self) -> datetime:
         """
         Retorna a data da última atualização
@@ -255,10 +1318,10 @@ class SRAGIngestor:
         Returns:
             Datetime da última atualização ou None
         """
-        if not self.db_path.exists():
+        if not self._db_file().exists():
             return None
         
-        conn = duckdb.connect(str(self.db_path), read_only=True)
+        conn = duckdb.connect(str(self._db_file()), read_only=True)
         
         try:
             result = conn.execute(
@@ -275,12 +1338,37 @@ class SRAGIngestor:
         finally:
             conn.close()
     
-    def update_database(self, force: bool = False):
+    def load_dictionary(self) -> int:
+        """
+        Grava o dicionário de variáveis (variável/código → descrição) no banco
+        
+        Returns:
+            Quantidade de variáveis gravadas
+        """
+        conn = duckdb.connect(str(self._db_file()))
+        try:
+            total = save_dictionary(conn)
+        finally:
+            conn.close()
+        
+        logger.info(f"📖 Dicionário de variáveis salvo: {total} variáveis")
+        return total
+    
+    def update_database(
+        self,
+        force: bool = False,
+        streaming: bool = False,
+        max_workers: int = 4,
+        incremental: bool = True
+    ):
         """
         Atualiza o banco de dados
         
         Args:
             force: Se True, força atualização mesmo se já foi atualizado hoje
+            streaming: Se True, carrega os anos em paralelo gravando lote a lote
+            max_workers: Quantidade de anos carregados em paralelo (modo streaming)
+            incremental: Se True, recarrega apenas os anos cuja fonte mudou
         """
         logger.info("🔄 Verificando necessidade de atualização...")
         
@@ -292,27 +1380,73 @@ class SRAGIngestor:
                 logger.info("✅ Banco já está atualizado hoje. Use force=True para forçar.")
                 return
         
-        logger.info("🚀 Iniciando atualização completa...")
+        if incremental:
+            # Conferidas antes de copiar a versão publicada: sem fonte alterada
+            # a atualização termina aqui, sem custo proporcional ao banco
+            fingerprints = self._get_fingerprints(list(self.urls.keys()))
+            if self.get_changed_years(fingerprints) == []:
+                logger.info("✅ Nenhuma fonte foi alterada desde a última carga.")
+                return
         
-        # Carregar dados
-        df = self.load_all_data()
+        # A carga é gravada numa nova versão do banco: dashboard e agente seguem
+        # lendo a versão publicada até a troca, sem tabela vazia nem lock de escrita
+        with self.new_version(copiar=incremental) as versao:
+            self.load_dictionary()
+            
+            if incremental:
+                logger.info("🚀 Iniciando atualização incremental...")
+                carregados = len(self.refresh_incremental(max_workers=max_workers, fingerprints=fingerprints))
+            
+            else:
+                logger.info("🚀 Iniciando atualização completa...")
+                
+                if self.storage == "parquet":
+                    # read_parquet -> COPY já grava o dataset em fluxo, sem materializar os anos
+                    carregados = self.ingest_parquet()
+                elif streaming:
+                    carregados = self.ingest_streaming(max_workers=max_workers)
+                else:
+                    # Carregar e transformar os dados direto no DuckDB
+                    carregados = self.ingest_sql()
+            
+            # Sem dados novos a versão é descartada
+            versao["publicar"] = bool(carregados)
         
-        if df.empty:
+        if versao["publicar"]:
+            logger.info("🎉 Atualização concluída com sucesso!")
+        elif not incremental:
             logger.error("❌ Nenhum dado para atualizar!")
-            return
-        
-        # Salvar no DuckDB
-        self.save_to_duckdb(df)
-        
-        
-        logger.info("🎉 Atualização concluída com sucesso!")
 
 
 def main():
     """Função principal para executar a ingestão"""
-    ingestor = SRAGIngestor()
+    parser = argparse.ArgumentParser(description="Ingestão dos dados SRAG no DuckDB")
+    parser.add_argument("--streaming", action="store_true", help="Carrega os anos em paralelo, lote a lote")
+    parser.add_argument("--workers", type=int, default=4, help="Anos carregados em paralelo no modo streaming")
+    parser.add_argument("--completa", action="store_true", help="Recarrega todos os anos (DROP + CREATE)")
+    parser.add_argument("--dicionario", action="store_true", help="Apenas grava o dicionário de variáveis")
+    parser.add_argument("--prefetch", action="store_true", help="Pré-carrega as buscas de notícias do mês (requer rede)")
+    parser.add_argument("--parquet", action="store_true", help="Grava srag_cases como dataset Parquet particionado")
+    args = parser.parse_args()
+
+    ingestor = SRAGIngestor(storage="parquet" if args.parquet else None)
+
+    if args.dicionario:
+        with ingestor.new_version():
+            ingestor.load_dictionary()
+        return
+
+    ingestor.update_database(
+        force=True,
+        streaming=args.streaming,
+        max_workers=args.workers,
+        incremental=not args.completa
+    )
 
-    ingestor.update_database(force=True)
+    if args.prefetch:
+        # Boletins do mês (nacional e por UF) ficam no cache de buscas do agente
+        from tools.srag_websearch import prefetch_news
+        prefetch_news()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
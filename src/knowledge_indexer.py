@@ -0,0 +1,228 @@
+"""
+Indexação incremental do dicionário de variáveis SRAG no ChromaDB
+
+Guarda, ao lado do store do Chroma, um manifesto com o hash do PDF, os
+parâmetros de chunking e o embedder usados na última indexação. Se nada
+mudou, a indexação é pulada; se o PDF mudou, apenas os chunks novos são
+embedados e os que deixaram de existir são removidos.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from hashlib import md5
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from agno.knowledge.chunking.document import DocumentChunking
+from agno.knowledge.document import Document
+from agno.knowledge.reader.pdf_reader import PDFReader
+
+if TYPE_CHECKING:
+    # chromadb é pesado e dispensável para quem só usa as funções de leitura
+    from agno.vectordb.chroma import ChromaDb
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSAO = 1
+
+
+def hash_file(path: Path) -> str:
+    """Calcula o SHA-256 do conteúdo de um arquivo"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def chunk_id(document: Document) -> str:
+    """ID do chunk no Chroma (mesma regra do ChromaDb: md5 do conteúdo)"""
+    return md5(document.content.replace("\x00", "\ufffd").encode()).hexdigest()
+
+
+def read_pdf_chunks(pdf_path: Path, chunk_size: int = 5000, overlap: int = 0) -> Dict[str, Document]:
+    """Lê e divide um PDF, indexando os chunks pelo seu ID de conteúdo"""
+    pdf_path = Path(pdf_path)
+    reader = PDFReader(chunking_strategy=DocumentChunking(chunk_size=chunk_size, overlap=overlap))
+    chunks = {}
+    for document in reader.read(pdf_path, name=pdf_path.name):
+        chunks.setdefault(chunk_id(document), document)
+    return chunks
+
+
+def get_chunking(chunk_size: int, overlap: int) -> Dict:
+    """Parâmetros que determinam como o PDF é dividido em chunks"""
+    return {
+        "reader": PDFReader.__name__,
+        "estrategia": DocumentChunking.__name__,
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+    }
+
+
+class KnowledgeIndexer:
+    """Sincroniza o PDF do dicionário com uma coleção do ChromaDB"""
+
+    def __init__(
+        self,
+        vector_db: "ChromaDb",
+        pdf_path: Path,
+        manifest_path: Optional[Path] = None,
+        chunk_size: int = 5000,
+        overlap: int = 0,
+    ):
+        """
+        Inicializa o indexador
+
+        Args:
+            vector_db: Coleção do ChromaDB (preferencialmente persistente)
+            pdf_path: Caminho do PDF a indexar
+            manifest_path: Caminho do manifesto (padrão: ao lado do store do Chroma)
+            chunk_size: Tamanho máximo de cada chunk, em caracteres
+            overlap: Sobreposição entre chunks consecutivos
+        """
+        self.vector_db = vector_db
+        self.pdf_path = Path(pdf_path)
+        self.manifest_path = Path(manifest_path) if manifest_path else (
+            Path(vector_db.path) / f"{vector_db.collection_name}_manifest.json"
+        )
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def get_file_hash(self) -> str:
+        """Calcula o SHA-256 do conteúdo do PDF"""
+        return hash_file(self.pdf_path)
+
+    def get_chunking(self) -> Dict:
+        """Parâmetros que determinam como o PDF é dividido em chunks"""
+        return get_chunking(self.chunk_size, self.overlap)
+
+    def get_embedder(self) -> Dict:
+        """Identificação do embedder (trocá-lo invalida todos os vetores)"""
+        embedder = self.vector_db.embedder
+        return {
+            "classe": type(embedder).__name__,
+            "modelo": getattr(embedder, "id", None),
+            "dimensoes": getattr(embedder, "dimensions", None),
+        }
+
+    def load_manifest(self) -> Dict:
+        """Lê o manifesto da última indexação ({} se inexistente ou inválido)"""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if manifesto.get("versao") != MANIFEST_VERSAO:
+            return {}
+        return manifesto
+
+    def _save_manifest(self, manifesto: Dict):
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def read_chunks(self) -> Dict[str, Document]:
+        """Lê e divide o PDF, indexando os chunks pelo seu ID de conteúdo"""
+        return read_pdf_chunks(self.pdf_path, self.chunk_size, self.overlap)
+
+    def _get_indexed_ids(self) -> List[str]:
+        """IDs atualmente presentes na coleção"""
+        colecao = self.vector_db.client.get_collection(name=self.vector_db.collection_name)
+        return colecao.get(include=[])["ids"]
+
+    def is_up_to_date(self, manifesto: Dict, file_hash: str) -> bool:
+        """Verifica se a coleção já reflete este PDF com os parâmetros atuais"""
+        return (
+            manifesto.get("sha256") == file_hash
+            and manifesto.get("chunking") == self.get_chunking()
+            and manifesto.get("embedder") == self.get_embedder()
+            and self.vector_db.get_count() == len(manifesto.get("chunks", []))
+        )
+
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """
+        Indexa o PDF apenas se ele (ou a forma de indexá-lo) mudou
+
+        Args:
+            force: Reembeda todos os chunks, ignorando manifesto e coleção
+
+        Returns:
+            Contagem de chunks adicionados, removidos e mantidos
+        """
+        self.vector_db.create()
+
+        file_hash = self.get_file_hash()
+        manifesto = self.load_manifest()
+
+        if not force and self.is_up_to_date(manifesto, file_hash):
+            logger.info(f"{self.pdf_path.name} sem alterações, indexação ignorada")
+            return {"adicionados": 0, "removidos": 0, "mantidos": len(manifesto["chunks"])}
+
+        chunks = self.read_chunks()
+        indexados = set(self._get_indexed_ids())
+
+        # Vetores de outro embedder não são comparáveis: reembeda tudo numa
+        # coleção recriada (a dimensão dos vetores fica fixa na coleção)
+        recriar = force or (manifesto and manifesto.get("embedder") != self.get_embedder())
+        if recriar:
+            remover = sorted(indexados)
+            novos = list(chunks)
+            self.vector_db.drop()
+            self.vector_db.create()
+        else:
+            remover = sorted(indexados - chunks.keys())
+            novos = [cid for cid in chunks if cid not in indexados]
+
+        if remover and not recriar:
+            colecao = self.vector_db.client.get_collection(name=self.vector_db.collection_name)
+            colecao.delete(ids=remover)
+        if novos:
+            self.vector_db.insert(file_hash, [chunks[cid] for cid in novos])
+
+        self._save_manifest({
+            "versao": MANIFEST_VERSAO,
+            "arquivo": self.pdf_path.name,
+            "sha256": file_hash,
+            "chunking": self.get_chunking(),
+            "embedder": self.get_embedder(),
+            "chunks": list(chunks),
+            "atualizado_em": datetime.now().isoformat(),
+        })
+
+        resultado = {
+            "adicionados": len(novos),
+            "removidos": len(remover),
+            "mantidos": len(chunks) - len(novos),
+        }
+        logger.info(
+            f"{self.pdf_path.name} indexado: {resultado['adicionados']} chunks embedados, "
+            f"{resultado['removidos']} removidos, {resultado['mantidos']} reaproveitados"
+        )
+        return resultado
+
+
+def main():
+    """Indexa o dicionário de variáveis no store usado pelo agente"""
+    import argparse
+
+    from agent import get_knowledge_indexer
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Indexação do dicionário de variáveis SRAG no ChromaDB")
+    parser.add_argument("--forcar", action="store_true", help="Reembeda todos os chunks")
+    args = parser.parse_args()
+
+    get_knowledge_indexer().sync(force=args.forcar)
+
+
+if __name__ == "__main__":
+    main()
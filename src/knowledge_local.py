@@ -0,0 +1,209 @@
+"""
+Backend local (offline) de busca no dicionário de variáveis SRAG
+
+Índice BM25 em memória sobre os chunks do PDF, persistido em JSON ao lado do
+store do Chroma. Não depende de API de embeddings: a consulta é uma soma de
+pesos pré-calculados por termo, feita no próprio processo, e funciona sem
+acesso à rede.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from knowledge_indexer import get_chunking, hash_file, read_pdf_chunks
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSAO = 1
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(texto: str) -> List[str]:
+    """Divide o texto em termos minúsculos e sem acentos"""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _TOKEN.findall(texto)
+
+
+class LocalKnowledgeIndex:
+    """Índice BM25 persistido sobre os chunks do dicionário de variáveis"""
+
+    def __init__(
+        self,
+        pdf_path: Path,
+        index_path: Path,
+        chunk_size: int = 1000,
+        overlap: int = 0,
+        max_results: int = 5,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """
+        Inicializa o índice (a carga/construção só ocorre em load())
+
+        Args:
+            pdf_path: Caminho do PDF a indexar
+            index_path: Arquivo JSON onde o índice é persistido
+            chunk_size: Tamanho máximo de cada chunk, em caracteres
+            overlap: Sobreposição entre chunks consecutivos
+            max_results: Quantidade padrão de chunks retornados por busca
+            k1: Saturação da frequência do termo (BM25)
+            b: Normalização pelo tamanho do chunk (BM25)
+        """
+        self.pdf_path = Path(pdf_path)
+        self.index_path = Path(index_path)
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.max_results = max_results
+        self.k1 = k1
+        self.b = b
+
+        self._documentos: List[Dict] = []
+        self._pesos: Dict[str, List[List]] = {}
+
+    def get_params(self) -> Dict:
+        """Parâmetros que, se alterados, exigem reconstruir o índice"""
+        return {**get_chunking(self.chunk_size, self.overlap), "k1": self.k1, "b": self.b}
+
+    def build(self, file_hash: str) -> Dict:
+        """
+        Lê o PDF e calcula o peso BM25 de cada termo em cada chunk
+
+        Args:
+            file_hash: SHA-256 do PDF, gravado no índice
+
+        Returns:
+            Índice serializável
+        """
+        documentos = []
+        frequencias = []
+        for document in read_pdf_chunks(self.pdf_path, self.chunk_size, self.overlap).values():
+            documentos.append({
+                "name": document.name,
+                "meta_data": document.meta_data,
+                "content": document.content,
+            })
+            frequencias.append(Counter(tokenize(document.content)))
+
+        total = len(documentos)
+        tamanhos = [sum(tf.values()) for tf in frequencias]
+        tamanho_medio = (sum(tamanhos) / total) if total else 0.0
+        docs_por_termo = Counter(termo for tf in frequencias for termo in tf)
+
+        # Peso final de cada (termo, chunk): a busca só precisa somá-los
+        pesos: Dict[str, List[List]] = {}
+        for i, tf in enumerate(frequencias):
+            norma = self.k1 * (1 - self.b + self.b * tamanhos[i] / tamanho_medio) if tamanho_medio else self.k1
+            for termo, freq in tf.items():
+                idf = math.log(1 + (total - docs_por_termo[termo] + 0.5) / (docs_por_termo[termo] + 0.5))
+                peso = idf * freq * (self.k1 + 1) / (freq + norma)
+                pesos.setdefault(termo, []).append([i, round(peso, 6)])
+
+        return {
+            "versao": INDEX_VERSAO,
+            "arquivo": self.pdf_path.name,
+            "sha256": file_hash,
+            "parametros": self.get_params(),
+            "documentos": documentos,
+            "pesos": pesos,
+            "atualizado_em": datetime.now().isoformat(),
+        }
+
+    def _read_index(self) -> Dict:
+        """Lê o índice persistido ({} se inexistente ou inválido)"""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                indice = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if indice.get("versao") != INDEX_VERSAO:
+            return {}
+        return indice
+
+    def _save_index(self, indice: Dict):
+        """Grava o índice de forma atômica (arquivo temporário + rename)"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(indice, f, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def load(self, force: bool = False) -> "LocalKnowledgeIndex":
+        """
+        Carrega o índice do disco, reconstruindo-o se o PDF ou os parâmetros mudaram
+
+        Args:
+            force: Reconstrói o índice mesmo que o persistido esteja atualizado
+
+        Returns:
+            O próprio índice, pronto para busca
+        """
+        file_hash = hash_file(self.pdf_path)
+        indice = {} if force else self._read_index()
+
+        if indice.get("sha256") != file_hash or indice.get("parametros") != self.get_params():
+            indice = self.build(file_hash)
+            self._save_index(indice)
+            logger.info(f"Índice local de {self.pdf_path.name} construído: {len(indice['documentos'])} chunks")
+        else:
+            logger.info(f"Índice local de {self.pdf_path.name} carregado de {self.index_path}")
+
+        self._documentos = indice["documentos"]
+        self._pesos = indice["pesos"]
+        return self
+
+    def search(self, query: str, num_documents: Optional[int] = None, **kwargs) -> List[Dict]:
+        """
+        Retorna os chunks mais relevantes para a consulta
+
+        Tem a assinatura de knowledge_retriever do Agent, podendo ser usado
+        diretamente como recuperador do agente.
+
+        Args:
+            query: Texto da consulta
+            num_documents: Quantidade de chunks (None = max_results)
+
+        Returns:
+            Chunks no formato de documento do agno (name, meta_data, content)
+        """
+        pontuacao: Dict[int, float] = {}
+        for termo in set(tokenize(query)):
+            for i, peso in self._pesos.get(termo, ()):
+                pontuacao[i] = pontuacao.get(i, 0.0) + peso
+
+        limite = num_documents or self.max_results
+        melhores = sorted(pontuacao, key=lambda i: (-pontuacao[i], i))[:limite]
+        return [self._documentos[i] for i in melhores]
+
+
+def main():
+    """Constrói o índice local do dicionário de variáveis usado pelo agente"""
+    import argparse
+
+    from agent import get_local_index
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Índice local (BM25) do dicionário de variáveis SRAG")
+    parser.add_argument("--forcar", action="store_true", help="Reconstrói o índice")
+    parser.add_argument("consulta", nargs="?", help="Consulta de teste após a carga")
+    args = parser.parse_args()
+
+    index = get_local_index(force=args.forcar)
+    if args.consulta:
+        for documento in index.search(args.consulta):
+            print(f"[{documento['meta_data']}] {documento['content'][:200]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Latência por etapa de cada execução do agente
+
+Cada etapa (guardrails, consultas ao DuckDB, busca na web, base de
+conhecimento, chamadas ao LLM e a execução completa) registra sua duração e,
+quando fizer sentido, contadores como linhas retornadas ou tokens. As amostras
+mais recentes de cada etapa ficam em memória e são agregadas em percentis
+(p50/p95/p99) para o painel administrativo e para exportação em JSON.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from agno.guardrails import BaseGuardrail
+
+PERCENTIS = (50, 95, 99)
+
+
+def percentile(valores: List[float], p: float) -> Optional[float]:
+    """
+    Percentil com interpolação linear entre as amostras ordenadas
+
+    Args:
+        valores: Amostras (não precisam estar ordenadas)
+        p: Percentil entre 0 e 100
+
+    Returns:
+        Valor do percentil ou None se não houver amostras
+    """
+    if not valores:
+        return None
+
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(ordenados) - 1)
+    return ordenados[abaixo] + (ordenados[acima] - ordenados[abaixo]) * (posicao - abaixo)
+
+
+class StageMetrics:
+    """Registro thread-safe das amostras de latência e contadores por etapa"""
+
+    def __init__(self, max_samples: int = 2000):
+        """
+        Inicializa o registro
+
+        Args:
+            max_samples: Amostras mantidas por etapa (as mais antigas são descartadas)
+        """
+        self.max_samples = max_samples
+
+        self._lock = threading.Lock()
+        self._amostras: Dict[str, Deque[Tuple[float, float, Dict[str, float]]]] = {}
+        self._inicio = time.time()
+
+    def record(self, etapa: str, duracao: float, **contadores: float):
+        """
+        Registra uma amostra
+
+        Args:
+            etapa: Nome da etapa (ex.: "ferramenta:run_query", "llm")
+            duracao: Duração em segundos
+            **contadores: Valores associados (ex.: linhas=10, tokens=523)
+        """
+        amostra = (time.time(), duracao, {k: v for k, v in contadores.items() if v is not None})
+        with self._lock:
+            if etapa not in self._amostras:
+                self._amostras[etapa] = deque(maxlen=self.max_samples)
+            self._amostras[etapa].append(amostra)
+
+    @contextmanager
+    def timed(self, etapa: str, **contadores: float):
+        """
+        Mede o bloco como uma amostra da etapa
+
+        O dicionário retornado pode receber contadores conhecidos só ao fim
+        do bloco (ex.: quantidade de linhas).
+        """
+        extras: Dict[str, float] = dict(contadores)
+        inicio = time.perf_counter()
+        try:
+            yield extras
+        finally:
+            self.record(etapa, time.perf_counter() - inicio, **extras)
+
+    def record_run(self, run_output, origem: str = "agente"):
+        """
+        Registra a execução completa, as ferramentas e cada chamada ao LLM a partir do RunOutput
+
+        Args:
+            run_output: RunOutput do agno (já finalizado)
+            origem: Identifica o agente (ex.: "agente", "fase:dados")
+        """
+        metrics = getattr(run_output, "metrics", None)
+        if metrics is not None and metrics.duration is not None:
+            self.record(
+                f"execucao:{origem}",
+                metrics.duration,
+                tokens_entrada=metrics.input_tokens,
+                tokens_saida=metrics.output_tokens,
+                ferramentas=len(getattr(run_output, "tools", None) or []),
+            )
+            if metrics.time_to_first_token is not None:
+                self.record(f"primeiro_token:{origem}", metrics.time_to_first_token)
+
+        for tool in getattr(run_output, "tools", None) or []:
+            if tool.metrics is not None and tool.metrics.duration is not None:
+                self.record(f"ferramenta:{tool.tool_name}", tool.metrics.duration, erro=int(bool(tool.tool_call_error)))
+
+        for mensagem in getattr(run_output, "messages", None) or []:
+            if mensagem.role != "assistant" or mensagem.metrics is None or mensagem.metrics.duration is None:
+                continue
+            self.record(
+                "llm",
+                mensagem.metrics.duration,
+                tokens_entrada=mensagem.metrics.input_tokens,
+                tokens_saida=mensagem.metrics.output_tokens,
+            )
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Agrega as amostras de cada etapa
+
+        Returns:
+            Por etapa: quantidade, média e percentis da duração (ms) e a média
+            de cada contador
+        """
+        with self._lock:
+            amostras = {etapa: list(valores) for etapa, valores in self._amostras.items()}
+
+        linhas = []
+        for etapa in sorted(amostras):
+            duracoes = [a[1] * 1000 for a in amostras[etapa]]
+            linha: Dict[str, Any] = {
+                "etapa": etapa,
+                "amostras": len(duracoes),
+                "media_ms": round(sum(duracoes) / len(duracoes), 2),
+            }
+            for p in PERCENTIS:
+                linha[f"p{p}_ms"] = round(percentile(duracoes, p), 2)
+
+            contadores: Dict[str, List[float]] = {}
+            for _, _, extras in amostras[etapa]:
+                for nome, valor in extras.items():
+                    contadores.setdefault(nome, []).append(valor)
+            for nome, valores in sorted(contadores.items()):
+                linha[f"{nome}_medio"] = round(sum(valores) / len(valores), 2)
+
+            linhas.append(linha)
+        return linhas
+
+    def export(self, include_samples: bool = False) -> Dict[str, Any]:
+        """
+        Exporta o registro em formato serializável (JSON)
+
+        Args:
+            include_samples: Inclui as amostras individuais de cada etapa
+
+        Returns:
+            Período coberto, agregados por etapa e, opcionalmente, as amostras
+        """
+        dados: Dict[str, Any] = {
+            "gerado_em": datetime.now().isoformat(),
+            "desde": datetime.fromtimestamp(self._inicio).isoformat(),
+            "etapas": self.summary(),
+        }
+        if include_samples:
+            with self._lock:
+                dados["amostras"] = {
+                    etapa: [
+                        {"timestamp": ts, "duracao_ms": round(duracao * 1000, 3), **extras}
+                        for ts, duracao, extras in valores
+                    ]
+                    for etapa, valores in self._amostras.items()
+                }
+        return dados
+
+    def save_json(self, path: Union[str, Path], include_samples: bool = False) -> Path:
+        """Grava a exportação num arquivo JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export(include_samples), f, ensure_ascii=False, indent=2)
+        return path
+
+    def reset(self):
+        """Descarta todas as amostras"""
+        with self._lock:
+            self._amostras.clear()
+            self._inicio = time.time()
+
+
+class TimedGuardrail(BaseGuardrail):
+    """Envolve um guardrail registrando a duração de cada verificação"""
+
+    def __init__(self, guardrail: BaseGuardrail, metrics: Optional[StageMetrics] = None):
+        """
+        Args:
+            guardrail: Guardrail original
+            metrics: Registro usado (None = registro compartilhado do processo)
+        """
+        self.guardrail = guardrail
+        self.metrics = metrics or get_stage_metrics()
+        self.etapa = f"guardrail:{type(guardrail).__name__}"
+
+    def check(self, run_input):
+        with self.metrics.timed(self.etapa):
+            self.guardrail.check(run_input)
+
+    async def async_check(self, run_input):
+        with self.metrics.timed(self.etapa):
+            await self.guardrail.async_check(run_input)
+
+
+def timed_function(etapa: str, metrics: Optional[StageMetrics] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorador que registra a duração de cada chamada da função
+
+    Se o retorno for uma lista, sua quantidade de itens vai como contador "resultados".
+    """
+    def decorador(funcao: Callable) -> Callable:
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            with (metrics or get_stage_metrics()).timed(etapa) as extras:
+                resultado = funcao(*args, **kwargs)
+                if isinstance(resultado, list):
+                    extras["resultados"] = len(resultado)
+                return resultado
+        return wrapper
+    return decorador
+
+
+_metrics: Optional[StageMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_stage_metrics() -> StageMetrics:
+    """Retorna o registro de latências compartilhado pelo processo"""
+    global _metrics
+
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = StageMetrics()
+        return _metrics
@@ -0,0 +1,138 @@
+"""
+Persistência de traces do agente fora do caminho da requisição
+
+Os spans do OpenTelemetry entram numa fila em memória e uma thread de fundo
+(BatchSpanProcessor) os grava em lotes no SQLite, em modo WAL: a resposta ao
+usuário não espera por nenhuma escrita. Para a interface é gerado um resumo
+compacto de cada execução, no lugar do model_dump completo do RunOutput.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from agno.db.sqlite import SqliteDb
+
+TRACES_DB_FILE = Path(__file__).parent.parent / "tmp" / "traces.db"
+
+# Tamanho máximo dos argumentos de ferramenta guardados no resumo
+MAX_TOOL_ARGS_CHARS = 300
+
+
+def create_traces_db(db_file: Path = TRACES_DB_FILE) -> "SqliteDb":
+    """
+    Cria o banco de traces com o SQLite em modo WAL
+
+    Em WAL a thread de escrita não bloqueia quem lê os traces (ex.: painéis).
+
+    Args:
+        db_file: Arquivo SQLite dos traces
+
+    Returns:
+        SqliteDb do agno sobre o engine configurado
+    """
+    # Imports tardios: o resumo (summarize_run) não depende do SQLAlchemy
+    from agno.db.sqlite import SqliteDb
+    from sqlalchemy import create_engine, event
+
+    db_file = Path(db_file)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{db_file}")
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return SqliteDb(db_engine=engine)
+
+
+def setup_batched_tracing(
+    db: "SqliteDb",
+    max_queue_size: int = 4096,
+    max_export_batch_size: int = 256,
+    schedule_delay_millis: int = 2000,
+):
+    """
+    Liga o tracing do agno com gravação em lotes por uma thread de fundo
+
+    Spans que chegarem com a fila cheia são descartados em vez de atrasar
+    a requisição.
+
+    Args:
+        db: Banco de traces
+        max_queue_size: Spans mantidos em memória aguardando gravação
+        max_export_batch_size: Spans gravados por lote
+        schedule_delay_millis: Intervalo entre gravações
+    """
+    from agno.tracing import setup_tracing
+
+    setup_tracing(
+        db=db,
+        batch_processing=True,
+        max_queue_size=max_queue_size,
+        max_export_batch_size=max_export_batch_size,
+        schedule_delay_millis=schedule_delay_millis,
+    )
+
+
+def _truncate(valor: Any, limite: int = MAX_TOOL_ARGS_CHARS) -> str:
+    """Representação textual limitada a `limite` caracteres"""
+    texto = valor if isinstance(valor, str) else str(valor)
+    return texto if len(texto) <= limite else texto[:limite] + "…"
+
+
+def _round(valor: Optional[float]) -> Optional[float]:
+    """Arredonda tempos para milissegundos"""
+    return round(valor, 3) if valor is not None else None
+
+
+def summarize_run(run_output) -> Dict[str, Any]:
+    """
+    Resumo compacto de uma execução do agente para exibição na interface
+
+    Guarda identificação, status, modelo, tokens, tempos e as ferramentas
+    chamadas (com argumentos truncados); mensagens, eventos e resultados
+    completos ficam apenas no banco de traces.
+
+    Args:
+        run_output: RunOutput do agno
+
+    Returns:
+        Dicionário serializável em JSON
+    """
+    metrics = getattr(run_output, "metrics", None)
+    status = getattr(run_output, "status", None)
+
+    resumo: Dict[str, Any] = {
+        "run_id": getattr(run_output, "run_id", None),
+        "session_id": getattr(run_output, "session_id", None),
+        "status": getattr(status, "value", status),
+        "modelo": getattr(run_output, "model", None),
+    }
+
+    if metrics is not None:
+        resumo["tokens"] = {
+            "entrada": metrics.input_tokens,
+            "saida": metrics.output_tokens,
+            "total": metrics.total_tokens,
+        }
+        resumo["duracao"] = _round(metrics.duration)
+        resumo["tempo_primeiro_token"] = _round(metrics.time_to_first_token)
+
+    ferramentas = []
+    for tool in getattr(run_output, "tools", None) or []:
+        ferramentas.append({
+            "nome": tool.tool_name,
+            "argumentos": _truncate(tool.tool_args or {}),
+            "duracao": _round(tool.metrics.duration if tool.metrics else None),
+            "erro": bool(tool.tool_call_error),
+        })
+    resumo["ferramentas"] = ferramentas
+
+    if getattr(run_output, "metadata", None):
+        resumo["metadata"] = run_output.metadata
+
+    return resumo
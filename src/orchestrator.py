@@ -0,0 +1,192 @@
+"""
+Orquestração paralela do protocolo de resposta do agente SRAG
+
+No modo sequencial um único agente executa, em ordem, a fase de dados (DuckDB),
+a fase de contexto (busca na web) e a síntese. As duas primeiras fases não
+dependem uma da outra: aqui cada uma roda num agente próprio, ao mesmo tempo
+(Agent.arun + asyncio.gather), e a síntese só começa quando ambas terminam.
+A latência passa a ser a da fase mais lenta, e não a soma das duas.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Union
+
+from agno.agent import Agent
+from agno.run import RunStatus
+from agno.run.agent import RunErrorEvent, RunEvent, RunOutput, RunOutputEvent
+
+from observability.metrics import get_stage_metrics
+
+# Eventos das fases repassados ao stream (progresso de guardrails e ferramentas)
+EVENTOS_FASE = {RunEvent.pre_hook_started, RunEvent.tool_call_started, RunEvent.tool_call_completed}
+
+SYNTHESIS_PROMPT = """PERGUNTA DO USUÁRIO:
+{pergunta}
+
+RESULTADOS DA FASE DE DADOS (banco SRAG):
+{dados}
+
+RESULTADOS DA FASE DE CONTEXTO (web):
+{contexto}
+"""
+
+# Marca o fim das fases na fila de eventos
+_FIM = object()
+
+
+class ParallelOrchestrator:
+    """
+    Executa as fases de dados e de contexto em paralelo e sintetiza a resposta
+
+    Expõe run() com a mesma interface usada do Agent (stream, stream_events,
+    yield_run_output), de modo que a interface troca de modo sem alterações.
+    """
+
+    def __init__(self, data_agent: Agent, context_agent: Agent, synthesis_agent: Agent):
+        """
+        Inicializa o orquestrador
+
+        Args:
+            data_agent: Agente da fase de dados (DuckDB e dicionário)
+            context_agent: Agente da fase de contexto (busca na web)
+            synthesis_agent: Agente sem ferramentas que redige a resposta final
+        """
+        self.data_agent = data_agent
+        self.context_agent = context_agent
+        self.synthesis_agent = synthesis_agent
+
+    @staticmethod
+    async def _run_phase(agent: Agent, prompt: str, eventos: queue.Queue) -> Dict[str, Any]:
+        """
+        Executa uma fase, repassando o progresso para a fila de eventos
+
+        Returns:
+            RunOutput da fase (None se falhou), evento de erro e duração em segundos
+        """
+        inicio = time.perf_counter()
+        run_output: Optional[RunOutput] = None
+        erro: Optional[RunErrorEvent] = None
+
+        async for evento in agent.arun(prompt, stream=True, stream_events=True, yield_run_output=True):
+            if isinstance(evento, RunOutput):
+                run_output = evento
+            elif evento.event == RunEvent.run_error:
+                erro = evento
+            elif evento.event in EVENTOS_FASE:
+                eventos.put(evento)
+
+        return {"run_output": run_output, "erro": erro, "duracao": time.perf_counter() - inicio}
+
+    async def _gather(self, prompt: str, eventos: queue.Queue):
+        """Executa as duas fases de coleta ao mesmo tempo"""
+        return await asyncio.gather(
+            self._run_phase(self.data_agent, prompt, eventos),
+            self._run_phase(self.context_agent, prompt, eventos),
+        )
+
+    def _run_phases(self, prompt: str, eventos: queue.Queue):
+        """Roda o loop asyncio das fases (numa thread própria) e sinaliza o fim na fila"""
+        try:
+            resultado = asyncio.run(self._gather(prompt, eventos))
+        except BaseException as e:
+            resultado = e
+        eventos.put((_FIM, resultado))
+
+    def _run_stream(
+        self, prompt: str, stream_events: bool, yield_run_output: bool, **kwargs
+    ) -> Iterator[Union[RunOutputEvent, RunOutput]]:
+        """Gera os eventos das fases e, depois, os da síntese"""
+        eventos: queue.Queue = queue.Queue()
+        threading.Thread(
+            target=self._run_phases, args=(prompt, eventos), name="srag-fases", daemon=True
+        ).start()
+
+        while True:
+            evento = eventos.get()
+            if isinstance(evento, tuple) and evento[0] is _FIM:
+                resultado = evento[1]
+                break
+            if stream_events:
+                yield evento
+
+        if isinstance(resultado, BaseException):
+            raise resultado
+        dados, contexto = resultado
+
+        metrics = get_stage_metrics()
+        for origem, fase in (("fase:dados", dados), ("fase:contexto", contexto)):
+            if fase["run_output"] is not None:
+                metrics.record_run(fase["run_output"], origem=origem)
+
+        # Sem dados (guardrail ou erro) não há o que sintetizar
+        if dados["run_output"] is None:
+            yield dados["erro"] or RunErrorEvent(content="A fase de dados não retornou resultado")
+            return
+
+        if contexto["run_output"] is not None:
+            texto_contexto = contexto["run_output"].content
+        else:
+            motivo = contexto["erro"].content if contexto["erro"] else "sem resposta"
+            texto_contexto = f"A busca na web falhou ({motivo}); o contexto externo não pôde ser recuperado."
+
+        fases = {
+            "dados": {"run_id": dados["run_output"].run_id, "duracao": round(dados["duracao"], 3)},
+            "contexto": {
+                "run_id": contexto["run_output"].run_id if contexto["run_output"] else None,
+                "duracao": round(contexto["duracao"], 3),
+            },
+        }
+
+        sintese = self.synthesis_agent.run(
+            SYNTHESIS_PROMPT.format(pergunta=prompt, dados=dados["run_output"].content, contexto=texto_contexto),
+            stream=True,
+            stream_events=stream_events,
+            yield_run_output=True,
+            **kwargs,
+        )
+        for evento in sintese:
+            if isinstance(evento, RunOutput):
+                evento.metadata = {**(evento.metadata or {}), "fases": fases}
+                if yield_run_output:
+                    yield evento
+            else:
+                yield evento
+
+    def run(
+        self,
+        prompt: str,
+        stream: bool = False,
+        stream_events: bool = False,
+        yield_run_output: bool = False,
+        **kwargs,
+    ) -> Union[RunOutput, Iterator[Union[RunOutputEvent, RunOutput]]]:
+        """
+        Responde a pergunta: coleta dados e contexto em paralelo e sintetiza
+
+        Args:
+            prompt: Pergunta do usuário
+            stream: Se True, retorna um iterador de eventos
+            stream_events: Inclui eventos de progresso (guardrails, ferramentas)
+            yield_run_output: Inclui o RunOutput final da síntese no stream
+            **kwargs: Argumentos repassados ao run() do agente de síntese
+
+        Returns:
+            RunOutput final ou iterador de eventos (stream=True)
+        """
+        if stream:
+            return self._run_stream(prompt, stream_events, yield_run_output, **kwargs)
+
+        run_output = None
+        erro = None
+        for evento in self._run_stream(prompt, False, True, **kwargs):
+            if isinstance(evento, RunOutput):
+                run_output = evento
+            elif getattr(evento, "event", None) == RunEvent.run_error:
+                erro = evento
+
+        if run_output is None:
+            run_output = RunOutput(content=erro.content if erro else None, status=RunStatus.error)
+        return run_output
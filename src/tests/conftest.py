@@ -0,0 +1,53 @@
+"""
+Fixtures dos testes: fontes INFLUD sintéticas pequenas e bancos montados com o ingestor
+
+Uso (a partir de src/):
+    python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+import duckdb
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_influd import gerar_dataset
+from data import connection
+
+# Última notificação das fontes de teste: no meio do mês, para que as janelas
+# tenham meses parciais nas pontas
+DATA_MAX = "2025-06-15"
+
+
+@pytest.fixture(scope="session")
+def fontes(tmp_path_factory) -> Dict[int, str]:
+    """Fontes sintéticas de 2023 a 2025, com 2025 cortado em DATA_MAX"""
+    pasta = tmp_path_factory.mktemp("influd")
+    fontes = gerar_dataset(pasta, 60_000, anos=[2023, 2024, 2025])
+
+    cortado = pasta / "INFLUD25-cortado.parquet"
+    duckdb.execute(
+        f"COPY (SELECT * FROM read_parquet('{fontes[2025]}') WHERE DT_NOTIFIC <= '{DATA_MAX}') "
+        f"TO '{cortado}' (FORMAT PARQUET)"
+    )
+    fontes[2025] = str(cortado)
+    return fontes
+
+
+@pytest.fixture
+def usar_banco(monkeypatch):
+    """Aponta o pool compartilhado (usado por data.queries) para um banco de teste"""
+    pools = []
+
+    def usar(db_path: Path):
+        pool = connection.ReadOnlyConnectionPool(db_path)
+        pools.append(pool)
+        monkeypatch.setattr(connection, "_pool", pool)
+
+    yield usar
+
+    for pool in pools:
+        pool.close()
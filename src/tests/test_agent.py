@@ -0,0 +1,56 @@
+"""
+Construção preguiçosa e aquecimento do agente (agent.py)
+"""
+
+import importlib
+import threading
+
+import pytest
+
+# agent.py importa o SqliteDb do agno, que depende do sqlalchemy
+pytest.importorskip("sqlalchemy")
+
+
+@pytest.fixture
+def agente():
+    """Módulo agent recém-importado (singletons zerados)"""
+    import agent
+
+    return importlib.reload(agent)
+
+
+def test_importacao_nao_constroi_nada(agente):
+    assert agente._agent is None
+    assert agente._orchestrator is None
+    assert agente._tracing_db is None
+    assert agente._knowledge is None
+    assert agente._local_index is None
+    assert agente._warmup is None
+
+
+def test_aquecimento_constroi_uma_unica_vez(agente, monkeypatch):
+    chamadas = []
+    liberar = threading.Event()
+
+    def get_runner():
+        chamadas.append(threading.current_thread().name)
+        liberar.wait(5)
+
+    monkeypatch.setattr(agente, "get_runner", get_runner)
+
+    thread = agente.warm_up_agent()
+    assert agente.warm_up_agent() is thread
+    liberar.set()
+    thread.join(5)
+
+    assert agente.warm_up_agent() is thread
+    assert chamadas == ["srag-agent-warmup"]
+
+
+
+def test_indice_local_carregado_uma_vez(agente, monkeypatch, tmp_path):
+    monkeypatch.setattr(agente, "LOCAL_INDEX_PATH", tmp_path / "docs_bm25.json")
+    indice = agente.get_local_index()
+
+    assert agente.get_local_index() is indice
+    assert agente.get_local_index(force=True) is not indice
@@ -0,0 +1,102 @@
+"""
+Resposta em streaming no chat da interface (ui/chat_stream.py)
+"""
+
+from agno.models.response import ToolExecution
+from agno.run import RunStatus
+from agno.run.agent import (
+    PreHookStartedEvent,
+    RunContentEvent,
+    RunErrorEvent,
+    RunOutput,
+    ToolCallStartedEvent,
+)
+
+from observability.metrics import StageMetrics
+from ui.chat_stream import TOOL_PROGRESS, stream_agent_response
+
+
+class Runner:
+    """Agente falso que devolve eventos prontos e guarda os argumentos de run()"""
+
+    def __init__(self, eventos):
+        self.eventos = eventos
+        self.chamadas = []
+
+    def run(self, prompt, **kwargs):
+        self.chamadas.append((prompt, kwargs))
+        return iter(self.eventos)
+
+
+class Container:
+    """Registra as chamadas feitas aos containers do Streamlit (st.status e st.empty)"""
+
+    def __init__(self):
+        self.chamadas = []
+
+    def __getattr__(self, metodo):
+        return lambda *args, **kwargs: self.chamadas.append((metodo, args, kwargs))
+
+
+def _ferramenta(nome):
+    return ToolCallStartedEvent(tool=ToolExecution(tool_name=nome))
+
+
+def test_resposta_completa():
+    runner = Runner([
+        PreHookStartedEvent(),
+        _ferramenta("run_query"),
+        _ferramenta("ferramenta_nova"),
+        RunContentEvent(content="Foram "),
+        RunContentEvent(content=""),
+        RunContentEvent(content="10 casos"),
+        RunOutput(content="Foram 10 casos.", status=RunStatus.completed),
+    ])
+    status, placeholder = Container(), Container()
+    metrics = StageMetrics()
+
+    resposta, run_output = stream_agent_response(runner, "Quantos casos?", status, placeholder, metrics)
+
+    assert resposta == "Foram 10 casos."
+    assert run_output.status == RunStatus.completed
+    assert runner.chamadas == [
+        ("Quantos casos?", {"markdown": True, "stream": True, "stream_events": True, "yield_run_output": True})
+    ]
+    assert [args[0] for metodo, args, _ in status.chamadas if metodo == "write"] == [
+        TOOL_PROGRESS["run_query"], "🔧 Executando ferramenta_nova…"
+    ]
+    assert status.chamadas[0] == ("update", (), {"label": "🛡️ Verificando a pergunta…"})
+    assert status.chamadas[-1] == ("update", (), {"label": "✅ Resposta pronta", "state": "complete"})
+    # Tokens exibidos à medida que chegam, com o cursor; ao final, a resposta do RunOutput
+    assert [args[0] for _, args, _ in placeholder.chamadas] == ["Foram ▌", "Foram 10 casos▌", "Foram 10 casos."]
+
+    etapas = {linha["etapa"]: linha["amostras"] for linha in metrics.summary()}
+    assert etapas["primeira_saida_visivel"] == etapas["resposta_completa"] == 1
+
+
+def test_erro_interrompe_a_resposta():
+    runner = Runner([
+        RunContentEvent(content="Parcial"),
+        RunErrorEvent(content="Pergunta bloqueada pelo guardrail"),
+        RunOutput(content=None, status=RunStatus.error),
+    ])
+    status, placeholder = Container(), Container()
+
+    resposta, run_output = stream_agent_response(runner, "?", status, placeholder, StageMetrics())
+
+    assert resposta == "Pergunta bloqueada pelo guardrail"
+    assert run_output.status == RunStatus.error
+    assert status.chamadas[-1] == ("update", (), {"label": "⚠️ Execução interrompida", "state": "error"})
+    assert placeholder.chamadas[-1][1] == ("Pergunta bloqueada pelo guardrail",)
+
+
+def test_sem_run_output_mostra_o_texto_parcial():
+    runner = Runner([RunContentEvent(content="Resposta parcial")])
+    status, placeholder = Container(), Container()
+    metrics = StageMetrics()
+
+    resposta, run_output = stream_agent_response(runner, "?", status, placeholder, metrics)
+
+    assert (resposta, run_output) == ("Resposta parcial", None)
+    assert status.chamadas[-1][2]["state"] == "error"
+    assert not any(linha["etapa"].startswith("execucao:") for linha in metrics.summary())
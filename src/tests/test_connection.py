@@ -0,0 +1,77 @@
+"""
+Pool de conexões somente leitura (data/connection.py)
+"""
+
+from contextlib import ExitStack
+
+import duckdb
+import pytest
+
+from data.connection import ReadOnlyConnectionPool
+from data.versions import collect_garbage, new_version_path, publish_version
+
+
+def _publicar(db_path, valor):
+    """Grava e publica uma versão do banco com uma única linha"""
+    versao = new_version_path(db_path)
+    conn = duckdb.connect(str(versao))
+    try:
+        conn.execute("CREATE TABLE versao AS SELECT ? AS valor", [valor])
+    finally:
+        conn.close()
+    publish_version(db_path, versao)
+    return versao
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    _publicar(db_path, 1)
+    return db_path
+
+
+def test_emprestimos_limitados_a_max_size(db_path):
+    pool = ReadOnlyConnectionPool(db_path, max_size=2, timeout=0.05)
+    try:
+        with ExitStack() as emprestados:
+            cursores = [emprestados.enter_context(pool.connection()) for _ in range(2)]
+            assert cursores[0] is not cursores[1]
+            with pytest.raises(TimeoutError):
+                with pool.connection():
+                    pass
+
+        # Devolvidos os cursores, há vaga de novo
+        with pool.connection() as cursor:
+            assert cursor.execute("SELECT valor FROM versao").fetchone() == (1,)
+    finally:
+        pool.close()
+
+
+def test_cursores_sao_reaproveitados(db_path):
+    pool = ReadOnlyConnectionPool(db_path)
+    try:
+        with pool.connection() as primeiro:
+            pass
+        with pool.connection() as segundo:
+            assert segundo is primeiro
+    finally:
+        pool.close()
+
+
+def test_pool_segue_a_versao_publicada(db_path):
+    pool = ReadOnlyConnectionPool(db_path)
+    try:
+        with pool.connection() as antigo:
+            primeira = pool._base_path
+            segunda = _publicar(db_path, 2)
+
+            # Novos empréstimos abrem a nova versão; a consulta em andamento segue na antiga
+            with pool.connection() as novo:
+                assert novo.execute("SELECT valor FROM versao").fetchone() == (2,)
+            assert antigo.execute("SELECT valor FROM versao").fetchone() == (1,)
+            assert collect_garbage(db_path) == []
+
+        assert pool._base_path == segunda
+        assert collect_garbage(db_path) == [primeira]
+    finally:
+        pool.close()
@@ -0,0 +1,134 @@
+"""
+Guardrail de conteúdo (guardrails/content_filter.py)
+"""
+
+import random
+import re
+import unicodedata
+
+import pytest
+
+from guardrails.content_filter import ContentFilterGuardrail
+
+CONFIGURACOES = {
+    "padrao": {},
+    "rigoroso": {"strictness": "high"},
+    "sem_politica": {"block_politics": False, "block_violence": False},
+    "customizado": {"custom_keywords": ["Influenza Aviária", "H5N1"], "block_illegal": False},
+}
+
+TEXTOS = [
+    "Qual a taxa de mortalidade por SRAG em São Paulo em 2025?",
+    "Quantos casos de SRAG tivemos no último mês?",
+    "O PT e o PSDB discutiram a vacinação",
+    "Houve uma explosão de casos, quase uma bomba",
+    "arma de fogo e faca na mesma frase",
+    "arma de fogos de artifício",
+    "Como hackear o sistema e roubar senha?",
+    "Relatório sobre influenza aviária e H5N1 no Brasil",
+    "VIOLÊNCIA e Agressão",
+    "conteúdo +18 e nsfw",
+    "Um golpe de estado",
+    "centro-oeste teve mais casos que o sudeste",
+]
+
+
+def _referencia(guardrail, texto):
+    """Busca ingênua, uma palavra-chave por vez (implementação anterior à trie)"""
+    texto = guardrail._normalize_text(texto)
+    for categoria, palavras in guardrail.categories.items():
+        encontradas = [
+            palavra for palavra in palavras
+            if re.search(r"\b" + re.escape(guardrail._normalize_text(palavra)) + r"\b", texto)
+        ]
+        if encontradas:
+            return True, categoria, sorted(encontradas)
+    return False, "", []
+
+
+def _textos_aleatorios(guardrail, quantidade, semente=0):
+    """Frases que misturam palavras-chave (inteiras, cortadas ou coladas) com texto comum"""
+    aleatorio = random.Random(semente)
+    palavras = sorted(palavra for palavras in guardrail.categories.values() for palavra in palavras)
+    comuns = ["casos", "de", "srag", "em", "2025", "taxa", "uti", "óbitos", "-", ",", "no", "estado"]
+
+    textos = []
+    for _ in range(quantidade):
+        partes = []
+        for _ in range(aleatorio.randint(1, 8)):
+            sorteio = aleatorio.random()
+            if sorteio < 0.15:
+                palavra = aleatorio.choice(palavras)
+                partes.append(palavra.upper() if aleatorio.random() < 0.3 else palavra)
+            elif sorteio < 0.25:
+                palavra = aleatorio.choice(palavras)
+                partes.append(palavra[:aleatorio.randint(1, len(palavra))] + aleatorio.choice(["", "s", "x"]))
+            else:
+                partes.append(aleatorio.choice(comuns))
+        textos.append(" ".join(partes))
+    return textos
+
+
+@pytest.mark.parametrize("configuracao", CONFIGURACOES)
+def test_regex_compilado_igual_a_busca_por_palavra(configuracao):
+    guardrail = ContentFilterGuardrail(**CONFIGURACOES[configuracao])
+
+    for texto in TEXTOS + _textos_aleatorios(guardrail, 500):
+        bloqueado, categoria, encontradas = guardrail._check_keywords(texto)
+        assert (bloqueado, categoria, sorted(encontradas)) == _referencia(guardrail, texto), texto
+
+
+def test_palavras_chave_que_sao_prefixo_de_outras():
+    guardrail = ContentFilterGuardrail()
+
+    # "faca" e "facada" começam igual; "arma de fogo" não casa dentro de "fogos"
+    assert guardrail._check_keywords("uma facada") == (True, "violence", ["facada"])
+    assert guardrail._check_keywords("arma de fogos")[0] is False
+    bloqueado, categoria, encontradas = guardrail._check_keywords("faca e arma de fogo")
+    assert (bloqueado, categoria, sorted(encontradas)) == (True, "violence", ["arma de fogo", "faca"])
+
+
+def test_categoria_declarada_primeiro_decide():
+    guardrail = ContentFilterGuardrail()
+
+    # "golpe" está em política e em atividades ilegais: política vem antes
+    assert guardrail._check_keywords("caiu num golpe")[:2] == (True, "politics")
+    sem_politica = ContentFilterGuardrail(block_politics=False)
+    assert sem_politica._check_keywords("caiu num golpe")[:2] == (True, "illegal")
+
+
+def _normalizacao_nfkd(texto):
+    """Referência: minúsculas e NFKD sem marcas combinantes, caractere a caractere"""
+    resultado = []
+    for caractere in texto:
+        dobrado = "".join(
+            c for c in unicodedata.normalize("NFKD", caractere.lower()) if not unicodedata.combining(c)
+        )
+        # Caracteres que não viram um único caractere Latin-1 ficam como estão (ex.: "ß", "½")
+        if ord(caractere) < 0x100 and (len(dobrado) != 1 or ord(dobrado) >= 0x100):
+            dobrado = caractere
+        resultado.append(dobrado)
+    return "".join(resultado)
+
+
+@pytest.mark.parametrize("texto", [
+    "Óbitos por SRAG em São Paulo, Paraná e Goiás",
+    "AÇÃO, ÊXITO, ÍNDICE, ÚLTIMO, ÀS, Ü",
+    unicodedata.normalize("NFD", "Óbitos em Goiás"),  # acentos digitados em forma decomposta
+    "casos 2025 — 10% a mais “entre aspas”",
+    "Ελληνικά, ТЕКСТ, Ẽ e ỹ",
+    "ß ½ ÿ",
+    "",
+])
+def test_normalizacao_igual_a_nfkd(texto):
+    guardrail = ContentFilterGuardrail()
+
+    assert guardrail._normalize_text(texto) == _normalizacao_nfkd(texto)
+
+
+def test_normalizacao_remove_acentos_decompostos():
+    guardrail = ContentFilterGuardrail()
+
+    decomposto = unicodedata.normalize("NFD", "VIOLÊNCIA e AGRESSÃO")
+    assert guardrail._normalize_text(decomposto) == "violencia e agressao"
+    assert guardrail._check_keywords(decomposto)[:2] == (True, "violence")
@@ -0,0 +1,296 @@
+"""
+Cargas, atualização incremental e publicação de versões do ingestor (ingestor.py)
+"""
+
+import itertools
+import os
+import shutil
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from data.versions import VERSOES_DIR, ReaderLease, collect_garbage, pointer_path, resolve_db_path
+from ingestor import SRAGIngestor
+
+
+@pytest.fixture
+def fingerprints_mutaveis(monkeypatch):
+    """Cada consulta a uma fonte devolve uma impressão digital nova, como um arquivo alterado durante a carga"""
+    consultas = []
+    contador = itertools.count()
+
+    def get_fingerprint(self, url):
+        fingerprint = f"{url}#{next(contador)}"
+        consultas.append(fingerprint)
+        return fingerprint
+
+    monkeypatch.setattr(SRAGIngestor, "get_fingerprint", get_fingerprint)
+    return consultas
+
+
+@pytest.mark.parametrize("carga", ["ingest_sql", "ingest_streaming", "ingest_parquet"])
+def test_carga_grava_impressoes_anteriores_a_leitura(carga, fontes, tmp_path, fingerprints_mutaveis):
+    storage = "parquet" if carga == "ingest_parquet" else "duckdb"
+    ingestor = SRAGIngestor(db_path=str(tmp_path / "srag.duckdb"), urls=fontes, storage=storage)
+
+    getattr(ingestor, carga)()
+
+    # Uma única rodada de consultas, antes da leitura, e são essas as gravadas
+    assert len(fingerprints_mutaveis) == len(fontes)
+    assert sorted(ingestor.get_saved_fingerprints().values()) == sorted(fingerprints_mutaveis)
+
+
+def _versoes(db_path):
+    """Arquivos de versão do banco em disco"""
+    return sorted((db_path.parent / VERSOES_DIR).glob(f"*{db_path.suffix}"))
+
+
+@pytest.mark.parametrize("storage", ["duckdb", "parquet"])
+def test_primeira_carga_incremental_sem_fontes_nao_publica(storage, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    urls = {ano: str(tmp_path / f"INFLUD{ano}-inexistente.parquet") for ano in (2024, 2025)}
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=urls, storage=storage)
+
+    with ingestor.new_version() as versao:
+        assert ingestor.refresh_incremental() == []
+
+    assert not versao["publicar"]
+    assert not pointer_path(db_path).exists()
+    assert _versoes(db_path) == []
+
+
+def test_versao_sem_srag_cases_nao_e_publicada(fontes, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage="duckdb")
+
+    # Só o dicionário: a versão não tem srag_cases nem metadata
+    with ingestor.new_version() as versao:
+        ingestor.load_dictionary()
+
+    assert not versao["publicar"]
+    assert not pointer_path(db_path).exists()
+    assert _versoes(db_path) == []
+
+
+def test_publicacao_e_coleta_de_versoes(fontes, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage="duckdb")
+
+    ingestor.update_database(incremental=False)
+    primeira = resolve_db_path(db_path)
+    assert primeira.parent.name == VERSOES_DIR
+    assert ingestor.get_saved_fingerprints().keys() == fontes.keys()
+
+    # Um leitor na versão publicada impede que ela seja apagada na troca seguinte
+    leitor = ReaderLease(primeira)
+    ingestor.update_database(force=True, incremental=False)
+    segunda = resolve_db_path(db_path)
+    assert segunda != primeira
+    assert _versoes(db_path) == [primeira, segunda]
+
+    leitor.release()
+    assert collect_garbage(db_path) == [primeira]
+    assert _versoes(db_path) == [segunda]
+
+
+@pytest.mark.parametrize("storage", ["duckdb", "parquet"])
+def test_atualizacao_incremental(storage, fontes, tmp_path, monkeypatch):
+    db_path = tmp_path / "srag.duckdb"
+    urls = {}
+    for ano, fonte in fontes.items():
+        urls[ano] = str(tmp_path / Path(fonte).name)
+        shutil.copyfile(fonte, urls[ano])
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=urls, storage=storage)
+    ingestor.update_database(incremental=True)
+    publicada = resolve_db_path(db_path)
+    registradas = ingestor.get_saved_fingerprints()
+    assert registradas.keys() == urls.keys()
+
+    # Sem fonte alterada nada é copiado nem publicado
+    with monkeypatch.context() as m:
+        m.setattr(SRAGIngestor, "new_version", lambda *args, **kwargs: pytest.fail("versão criada sem fonte alterada"))
+        ingestor.update_database(force=True, incremental=True)
+    assert resolve_db_path(db_path) == publicada
+    assert _versoes(db_path) == [publicada]
+
+    # Só o ano alterado é recarregado; uma fonte inacessível mantém o ano anterior
+    os.utime(urls[2025], ns=(0, 0))
+    urls[2024] = str(tmp_path / "INFLUD2024-inexistente.parquet")
+    ingestor.urls = urls
+    ingestor.update_database(force=True, incremental=True)
+
+    atualizada = resolve_db_path(db_path)
+    assert atualizada != publicada
+    assert _versoes(db_path) == [atualizada]
+    novas = ingestor.get_saved_fingerprints()
+    assert novas[2023] == registradas[2023]
+    assert novas[2024] == registradas[2024]
+    assert novas[2025] != registradas[2025]
+
+    conn = duckdb.connect(str(atualizada), read_only=True)
+    try:
+        anos = dict(conn.execute("SELECT ano, COUNT(*) FROM srag_cases GROUP BY ano").fetchall())
+    finally:
+        conn.close()
+    assert anos.keys() == {2023, 2024, 2025}
+
+
+def _consulta(db_path, sql):
+    """Linhas ordenadas de uma consulta na versão publicada do banco"""
+    conn = duckdb.connect(str(resolve_db_path(db_path)), read_only=True)
+    try:
+        return sorted(conn.execute(sql).fetchall(), key=repr)
+    finally:
+        conn.close()
+
+
+def test_transformacao_sql_igual_a_pandas(fontes, tmp_path):
+    fontes = {2025: fontes[2025]}
+    sql = SRAGIngestor(db_path=str(tmp_path / "sql" / "srag.duckdb"), urls=fontes, storage="duckdb")
+    sql.ingest_sql()
+    pandas = SRAGIngestor(db_path=str(tmp_path / "pandas" / "srag.duckdb"), urls=fontes, storage="duckdb")
+    pandas.save_to_duckdb(pandas.load_all_data())
+
+    colunas = ", ".join(f"CAST({coluna} AS VARCHAR)" for coluna in pandas.MAPS) + ", SG_UF_NOT::VARCHAR, DT_NOTIFIC, DT_NASC"
+    consulta = f"SELECT {colunas}, COUNT(*) FROM srag_cases GROUP BY ALL"
+    assert _consulta(sql.db_path, consulta) == _consulta(pandas.db_path, consulta)
+
+
+@pytest.mark.parametrize("storage", ["duckdb", "parquet"])
+def test_rollups_apos_recarga_de_um_ano(storage, fontes, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    urls = {ano: str(tmp_path / Path(fonte).name) for ano, fonte in fontes.items()}
+    for ano, fonte in fontes.items():
+        shutil.copyfile(fonte, urls[ano])
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=urls, storage=storage)
+    ingestor.update_database(incremental=True)
+
+    # 2024 passa a ter só o primeiro semestre: a partição e os rollups do ano são substituídos
+    duckdb.execute(
+        f"COPY (SELECT * FROM read_parquet('{fontes[2024]}') WHERE DT_NOTIFIC < '2024-07-01') "
+        f"TO '{urls[2024]}' (FORMAT PARQUET)"
+    )
+    ingestor.update_database(force=True, incremental=True)
+
+    dimensoes = ", ".join(ingestor.ROLLUP_DIMENSOES)
+    assert _consulta(db_path, f"SELECT ano, data, {dimensoes}, casos FROM srag_diario") == _consulta(
+        db_path, f"SELECT ano, DT_NOTIFIC, {dimensoes}, COUNT(*) FROM srag_cases GROUP BY ALL"
+    )
+    assert _consulta(db_path, "SELECT ano, mes, SG_UF_NOT, casos, obitos, uti, vacinados FROM srag_cubo_uf") == _consulta(
+        db_path,
+        """SELECT ano, date_trunc('month', DT_NOTIFIC), SG_UF_NOT, COUNT(*),
+                  COUNT(*) FILTER (WHERE EVOLUCAO = 'Óbito'), COUNT(*) FILTER (WHERE UTI = 'Sim'),
+                  COUNT(*) FILTER (WHERE VACINA = 'Sim')
+           FROM srag_cases GROUP BY ALL"""
+    )
+    assert _consulta(db_path, "SELECT MAX(data) FROM srag_diario WHERE ano = 2024") == [(date(2024, 6, 30),)]
+
+
+def test_streaming_igual_a_carga_sql(fontes, tmp_path):
+    sql = SRAGIngestor(db_path=str(tmp_path / "sql" / "srag.duckdb"), urls=fontes, storage="duckdb")
+    sql.ingest_sql()
+    streaming = SRAGIngestor(db_path=str(tmp_path / "streaming" / "srag.duckdb"), urls=fontes, storage="duckdb")
+
+    # Lotes pequenos e menos workers que anos: os lotes chegam intercalados
+    total = streaming.ingest_streaming(max_workers=2, batch_size=5_000)
+
+    consulta = "SELECT * FROM srag_cases"
+    assert total == len(_consulta(sql.db_path, consulta))
+    assert _consulta(streaming.db_path, consulta) == _consulta(sql.db_path, consulta)
+
+
+def test_streaming_descarta_ano_com_falha(fontes, tmp_path):
+    corrompida = tmp_path / "INFLUD2024-corrompido.parquet"
+    corrompida.write_bytes(b"PAR1 arquivo truncado")
+    urls = {**fontes, 2024: str(corrompida)}
+    ingestor = SRAGIngestor(db_path=str(tmp_path / "srag.duckdb"), urls=urls, storage="duckdb")
+
+    ingestor.ingest_streaming(max_workers=3, batch_size=5_000)
+
+    assert _consulta(ingestor.db_path, "SELECT DISTINCT ano FROM srag_cases") == [(2023,), (2025,)]
+    assert ingestor.get_saved_fingerprints().keys() == {2023, 2025}
+
+
+def test_dataset_parquet_particionado(fontes, tmp_path):
+    sql = SRAGIngestor(db_path=str(tmp_path / "sql" / "srag.duckdb"), urls=fontes, storage="duckdb")
+    sql.ingest_sql()
+    parquet = SRAGIngestor(db_path=str(tmp_path / "parquet" / "srag.duckdb"), urls=fontes, storage="parquet")
+    parquet.ingest_parquet()
+
+    versao = parquet.get_parquet_version()
+    assert versao.parent == parquet.parquet_dir
+    particoes = {
+        arquivo.parent.relative_to(versao / "srag_cases").parts for arquivo in versao.glob("srag_cases/**/*.parquet")
+    }
+    assert ("ano=2024", "mes=3", "SG_UF_NOT=SP") in particoes
+    assert {len(particao) for particao in particoes} == {3}
+
+    tipos = "SELECT table_name, table_type FROM information_schema.tables WHERE table_name IN ('srag_cases', 'srag_diario')"
+    assert _consulta(parquet.db_path, tipos) == [("srag_cases", "VIEW"), ("srag_diario", "VIEW")]
+    assert _consulta(sql.db_path, tipos) == [("srag_cases", "BASE TABLE"), ("srag_diario", "BASE TABLE")]
+
+    # Mesmas linhas e colunas que a carga no próprio DuckDB
+    filtrada = "SELECT * FROM srag_cases WHERE ano = 2024 AND SG_UF_NOT = 'SP'"
+    assert _consulta(parquet.db_path, filtrada) == _consulta(sql.db_path, filtrada)
+    contagem = "SELECT COUNT(*) FROM srag_cases"
+    assert _consulta(parquet.db_path, contagem) == _consulta(sql.db_path, contagem)
+
+
+def test_versoes_antigas_do_dataset_parquet_sao_removidas(fontes, tmp_path):
+    fontes = {2025: fontes[2025]}
+    ingestor = SRAGIngestor(db_path=str(tmp_path / "srag.duckdb"), urls=fontes, storage="parquet")
+
+    gravadas = []
+    for _ in range(4):
+        ingestor.ingest_parquet()
+        gravadas.append(ingestor.get_parquet_version())
+
+    restantes = sorted(p for p in ingestor.parquet_dir.glob("v*") if p.is_dir())
+    assert len(restantes) == ingestor.PARQUET_VERSOES_MANTIDAS
+    assert restantes == gravadas[-ingestor.PARQUET_VERSOES_MANTIDAS:]
+
+
+def _fora_de_ordem(db_path, particao=""):
+    """Registros de srag_cases que vêm, na ordem física (rowid), antes de um registro anterior em ORDEM_FISICA"""
+    return _consulta(db_path, f"""
+        SELECT COUNT(*) FROM (
+            SELECT DT_NOTIFIC, SG_UF_NOT,
+                   lag(DT_NOTIFIC) OVER fisica AS data_anterior, lag(SG_UF_NOT) OVER fisica AS uf_anterior
+            FROM srag_cases
+            WINDOW fisica AS ({particao} ORDER BY rowid)
+        )
+        WHERE data_anterior > DT_NOTIFIC OR (data_anterior = DT_NOTIFIC AND uf_anterior > SG_UF_NOT)
+    """)
+
+
+@pytest.mark.parametrize("carga", ["ingest_sql", "ingest_streaming"])
+def test_srag_cases_ordenada_por_data_e_uf(carga, fontes, tmp_path):
+    ingestor = SRAGIngestor(db_path=str(tmp_path / "srag.duckdb"), urls=fontes, storage="duckdb")
+    getattr(ingestor, carga)()
+
+    assert ingestor.ORDEM_FISICA == ["DT_NOTIFIC", "SG_UF_NOT"]
+    assert _fora_de_ordem(ingestor.db_path) == [(0,)]
+    assert _consulta(ingestor.db_path, "SELECT COUNT(*) FROM duckdb_indexes()") == [(0,)]
+
+
+def test_ano_recarregado_continua_ordenado(fontes, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    urls = {ano: str(tmp_path / Path(fonte).name) for ano, fonte in fontes.items()}
+    for ano, fonte in fontes.items():
+        shutil.copyfile(fonte, urls[ano])
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=urls, storage="duckdb")
+    ingestor.update_database(incremental=True)
+
+    os.utime(urls[2024], ns=(0, 0))
+    ingestor.update_database(force=True, incremental=True)
+
+    # A partição substituída vai para o fim da tabela, contígua e ordenada
+    trocas_de_ano = """
+        SELECT COUNT(*) FILTER (WHERE ano <> ano_anterior)
+        FROM (SELECT ano, lag(ano) OVER (ORDER BY rowid) AS ano_anterior FROM srag_cases)
+    """
+    assert _consulta(db_path, trocas_de_ano) == [(2,)]
+    assert _fora_de_ordem(db_path, "PARTITION BY ano") == [(0,)]
+    assert _consulta(db_path, "SELECT COUNT(*) FROM duckdb_indexes()") == [(0,)]
@@ -0,0 +1,97 @@
+"""
+Indexação incremental do dicionário no ChromaDB (knowledge_indexer.py)
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from agno.knowledge.embedder.base import Embedder
+from agno.vectordb.chroma import ChromaDb
+
+from knowledge_indexer import KnowledgeIndexer
+
+PDF_PATH = Path(__file__).parent.parent / "data" / "knowledge" / "dicionario_variaveis_srag.pdf"
+
+
+@dataclass
+class ContadorEmbedder(Embedder):
+    """Embedder determinístico e local que conta os textos embedados"""
+
+    dimensions: Optional[int] = 8
+    textos: List[str] = field(default_factory=list)
+
+    def get_embedding(self, text: str) -> List[float]:
+        self.textos.append(text)
+        digest = hashlib.sha256(text.encode()).digest()
+        return [byte / 255 for byte in digest[: self.dimensions]]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+@pytest.fixture
+def indexador(tmp_path):
+    """Cria indexadores sobre o mesmo store persistente, cada um com seu embedder"""
+    def criar(embedder: Embedder = None, chunk_size: int = 5000) -> KnowledgeIndexer:
+        vector_db = ChromaDb(
+            collection="docs",
+            path=str(tmp_path / "chromadb"),
+            persistent_client=True,
+            embedder=embedder or ContadorEmbedder(),
+        )
+        return KnowledgeIndexer(vector_db, PDF_PATH, chunk_size=chunk_size)
+    return criar
+
+
+def test_segunda_sincronizacao_nao_reembeda(indexador):
+    primeiro = indexador()
+    resultado = primeiro.sync()
+    assert resultado["adicionados"] > 0
+    assert resultado["removidos"] == 0
+    assert len(primeiro.vector_db.embedder.textos) == resultado["adicionados"]
+
+    # Novo processo, mesmo PDF: a coleção persistida é reaproveitada sem embeddings
+    segundo = indexador()
+    assert segundo.sync() == {"adicionados": 0, "removidos": 0, "mantidos": resultado["adicionados"]}
+    assert segundo.vector_db.embedder.textos == []
+    assert segundo.vector_db.get_count() == resultado["adicionados"]
+
+
+def test_pdf_alterado_embeda_apenas_chunks_novos(indexador, monkeypatch):
+    indexador().sync()
+    atual = indexador()
+    chunks = atual.read_chunks()
+    removido = next(iter(chunks))
+
+    # PDF "editado": um chunk a menos
+    monkeypatch.setattr(KnowledgeIndexer, "get_file_hash", lambda self: "editado")
+    monkeypatch.setattr(KnowledgeIndexer, "read_chunks", lambda self: {k: v for k, v in chunks.items() if k != removido})
+    assert atual.sync() == {"adicionados": 0, "removidos": 1, "mantidos": len(chunks) - 1}
+
+    # O chunk volta: só ele é embedado
+    monkeypatch.setattr(KnowledgeIndexer, "get_file_hash", lambda self: "restaurado")
+    monkeypatch.setattr(KnowledgeIndexer, "read_chunks", lambda self: chunks)
+    assert atual.sync() == {"adicionados": 1, "removidos": 0, "mantidos": len(chunks) - 1}
+    assert atual.vector_db.embedder.textos == [chunks[removido].content]
+
+
+def test_troca_de_chunking_ou_embedder_reindexa(indexador):
+    indexador().sync()
+
+    outro_chunking = indexador(chunk_size=2000)
+    resultado = outro_chunking.sync()
+    assert resultado["adicionados"] > 0
+    assert outro_chunking.vector_db.get_count() == resultado["adicionados"] + resultado["mantidos"]
+
+    # Vetores de outra dimensão: a coleção é recriada e todos os chunks reembedados
+    outro_embedder = indexador(ContadorEmbedder(dimensions=16), chunk_size=2000)
+    resultado = outro_embedder.sync()
+    assert resultado["mantidos"] == 0
+    assert resultado["adicionados"] == outro_embedder.vector_db.get_count() > 0
+    assert len(outro_embedder.vector_db.embedder.textos) == resultado["adicionados"]
@@ -0,0 +1,61 @@
+"""
+Índice BM25 local do dicionário de variáveis (knowledge_local.py)
+"""
+
+from pathlib import Path
+
+import pytest
+
+from knowledge_local import LocalKnowledgeIndex, tokenize
+
+PDF_PATH = Path(__file__).parent.parent / "data" / "knowledge" / "dicionario_variaveis_srag.pdf"
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return tmp_path / "docs_bm25.json"
+
+
+def test_tokenize_remove_acentos_e_caixa():
+    assert tokenize("Óbito por SRAG, CLASSI_FIN = 5") == ["obito", "por", "srag", "classi_fin", "5"]
+
+
+def test_busca_encontra_a_variavel(index_path):
+    indice = LocalKnowledgeIndex(PDF_PATH, index_path).load()
+
+    resultados = indice.search("classificação final CLASSI_FIN", num_documents=3)
+    assert 0 < len(resultados) <= 3
+    assert "CLASSI_FIN" in resultados[0]["content"]
+    assert {"name", "meta_data", "content"} <= resultados[0].keys()
+    assert len(indice.search("CLASSI_FIN")) <= indice.max_results
+    assert indice.search("termoquenaoexistenodicionario") == []
+
+
+def test_segunda_carga_le_do_disco(index_path, monkeypatch):
+    construido = LocalKnowledgeIndex(PDF_PATH, index_path).load()
+    assert index_path.exists()
+
+    monkeypatch.setattr(LocalKnowledgeIndex, "build", lambda self, file_hash: pytest.fail("índice reconstruído"))
+    carregado = LocalKnowledgeIndex(PDF_PATH, index_path).load()
+    assert carregado.search("CLASSI_FIN") == construido.search("CLASSI_FIN")
+
+
+@pytest.mark.parametrize("parametros", [{"chunk_size": 500}, {"k1": 1.5}, {"b": 0.5}])
+def test_parametros_alterados_reconstroem(index_path, monkeypatch, parametros):
+    LocalKnowledgeIndex(PDF_PATH, index_path).load()
+    construcoes = []
+    build = LocalKnowledgeIndex.build
+
+    def contar(self, file_hash):
+        construcoes.append(file_hash)
+        return build(self, file_hash)
+
+    monkeypatch.setattr(LocalKnowledgeIndex, "build", contar)
+    LocalKnowledgeIndex(PDF_PATH, index_path, **parametros).load()
+    assert len(construcoes) == 1
+
+    # O índice gravado passa a refletir os novos parâmetros
+    LocalKnowledgeIndex(PDF_PATH, index_path, **parametros).load()
+    assert len(construcoes) == 1
+    LocalKnowledgeIndex(PDF_PATH, index_path, **parametros).load(force=True)
+    assert len(construcoes) == 2
@@ -0,0 +1,111 @@
+"""
+Latência por etapa (observability/metrics.py)
+"""
+
+import json
+
+import pytest
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ToolExecution
+from agno.run.agent import RunOutput
+
+from observability.metrics import StageMetrics, percentile, timed_function
+
+
+@pytest.mark.parametrize("p, esperado", [(0, 1), (50, 2.5), (95, 3.85), (99, 3.97), (100, 4)])
+def test_percentil_interpolado(p, esperado):
+    assert percentile([4, 1, 3, 2], p) == pytest.approx(esperado)
+
+
+def test_percentil_sem_amostras():
+    assert percentile([], 50) is None
+    assert percentile([7], 99) == 7
+
+
+def test_resumo_por_etapa():
+    metrics = StageMetrics()
+    for ms in (10, 20, 30, 40):
+        metrics.record("duckdb", ms / 1000, linhas=ms, erro=None)
+    metrics.record("llm", 1.0, tokens_saida=100)
+
+    duckdb, llm = metrics.summary()
+    assert duckdb == {
+        "etapa": "duckdb",
+        "amostras": 4,
+        "media_ms": 25.0,
+        "p50_ms": 25.0,
+        "p95_ms": 38.5,
+        "p99_ms": 39.7,
+        "linhas_medio": 25.0,
+    }
+    assert (llm["etapa"], llm["tokens_saida_medio"]) == ("llm", 100)
+
+
+def test_amostras_limitadas_a_max_samples():
+    metrics = StageMetrics(max_samples=3)
+    for duracao in (1, 2, 3, 4, 5):
+        metrics.record("etapa", duracao)
+
+    (linha,) = metrics.summary()
+    assert linha["amostras"] == 3
+    assert linha["media_ms"] == 4000
+
+
+def test_timed_registra_contadores_do_bloco():
+    metrics = StageMetrics()
+
+    with pytest.raises(ValueError):
+        with metrics.timed("duckdb", cache=0) as extras:
+            extras["erro"] = 1
+            raise ValueError("falha")
+
+    (linha,) = metrics.summary()
+    assert (linha["amostras"], linha["cache_medio"], linha["erro_medio"]) == (1, 0, 1)
+
+
+def test_timed_function_conta_resultados():
+    metrics = StageMetrics()
+
+    @timed_function("conhecimento", metrics)
+    def buscar(consulta):
+        return [consulta] * 3
+
+    assert buscar("x") == ["x", "x", "x"]
+    assert buscar.__name__ == "buscar"
+    (linha,) = metrics.summary()
+    assert (linha["etapa"], linha["resultados_medio"]) == ("conhecimento", 3)
+
+
+def test_record_run():
+    metrics = StageMetrics()
+    run_output = RunOutput(
+        metrics=Metrics(duration=2.0, time_to_first_token=0.5, input_tokens=100, output_tokens=20),
+        tools=[ToolExecution(tool_name="run_query", metrics=Metrics(duration=0.1))],
+        messages=[
+            Message(role="user", content="?"),
+            Message(role="assistant", content="!", metrics=Metrics(duration=1.5, input_tokens=100, output_tokens=20)),
+        ],
+    )
+
+    metrics.record_run(run_output, origem="fase:dados")
+
+    etapas = {linha["etapa"]: linha for linha in metrics.summary()}
+    assert set(etapas) == {"execucao:fase:dados", "primeiro_token:fase:dados", "ferramenta:run_query", "llm"}
+    assert etapas["execucao:fase:dados"]["ferramentas_medio"] == 1
+    assert etapas["ferramenta:run_query"]["erro_medio"] == 0
+    assert etapas["llm"]["media_ms"] == 1500
+
+
+def test_exportacao_e_reset(tmp_path):
+    metrics = StageMetrics()
+    metrics.record("duckdb", 0.002, linhas=5)
+
+    dados = json.loads(metrics.save_json(tmp_path / "metricas.json", include_samples=True).read_text(encoding="utf-8"))
+    assert [linha["etapa"] for linha in dados["etapas"]] == ["duckdb"]
+    (amostra,) = dados["amostras"]["duckdb"]
+    assert (amostra["duracao_ms"], amostra["linhas"]) == (2.0, 5)
+    assert "amostras" not in metrics.export()
+
+    metrics.reset()
+    assert metrics.summary() == []
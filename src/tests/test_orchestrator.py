@@ -0,0 +1,99 @@
+"""
+Orquestração paralela das fases de dados e de contexto (orchestrator.py)
+"""
+
+import asyncio
+import time
+
+from agno.models.response import ToolExecution
+from agno.run import RunStatus
+from agno.run.agent import RunContentEvent, RunErrorEvent, RunEvent, RunOutput, ToolCallStartedEvent
+
+from orchestrator import ParallelOrchestrator
+
+# Duração simulada de cada fase
+DURACAO = 0.3
+
+
+class FaseAgente:
+    """Agente de fase falso: demora DURACAO e devolve um RunOutput (ou um erro)"""
+
+    def __init__(self, conteudo=None, erro=None, ferramenta=None):
+        self.conteudo = conteudo
+        self.erro = erro
+        self.ferramenta = ferramenta
+
+    async def arun(self, prompt, stream, stream_events, yield_run_output):
+        if self.ferramenta:
+            yield ToolCallStartedEvent(tool=ToolExecution(tool_name=self.ferramenta))
+        await asyncio.sleep(DURACAO)
+        if self.erro:
+            yield RunErrorEvent(content=self.erro)
+            return
+        yield RunOutput(run_id=f"run-{self.ferramenta}", content=self.conteudo, status=RunStatus.completed)
+
+
+class SinteseAgente:
+    """Agente de síntese falso que guarda o prompt recebido"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def run(self, prompt, stream, stream_events, yield_run_output, **kwargs):
+        self.prompts.append(prompt)
+        yield RunContentEvent(content="Resposta")
+        yield RunOutput(content="Resposta final", status=RunStatus.completed)
+
+
+def test_fases_em_paralelo_e_sintese():
+    sintese = SinteseAgente()
+    orquestrador = ParallelOrchestrator(
+        FaseAgente("10 casos em SP", ferramenta="run_query"),
+        FaseAgente("Boletim InfoGripe de setembro", ferramenta="search_news"),
+        sintese,
+    )
+
+    inicio = time.perf_counter()
+    eventos = list(orquestrador.run("Casos em SP?", stream=True, stream_events=True, yield_run_output=True))
+    duracao = time.perf_counter() - inicio
+
+    # As fases se sobrepõem: o total fica abaixo da soma das duas
+    assert duracao < 2 * DURACAO
+    assert {evento.tool.tool_name for evento in eventos if getattr(evento, "event", None) == RunEvent.tool_call_started} == {
+        "run_query", "search_news"
+    }
+
+    (prompt,) = sintese.prompts
+    assert "Casos em SP?" in prompt and "10 casos em SP" in prompt and "Boletim InfoGripe de setembro" in prompt
+
+    run_output = eventos[-1]
+    assert isinstance(run_output, RunOutput) and run_output.content == "Resposta final"
+    fases = run_output.metadata["fases"]
+    assert fases["dados"]["run_id"] == "run-run_query"
+    assert fases["contexto"]["run_id"] == "run-search_news"
+    assert all(fase["duracao"] >= DURACAO for fase in fases.values())
+
+
+def test_falha_do_contexto_vira_aviso_na_sintese():
+    sintese = SinteseAgente()
+    orquestrador = ParallelOrchestrator(FaseAgente("10 casos"), FaseAgente(erro="sem rede"), sintese)
+
+    run_output = orquestrador.run("Casos?")
+
+    assert run_output.content == "Resposta final"
+    assert "A busca na web falhou (sem rede)" in sintese.prompts[0]
+    assert run_output.metadata["fases"]["contexto"]["run_id"] is None
+
+
+def test_falha_da_fase_de_dados_nao_sintetiza():
+    sintese = SinteseAgente()
+    orquestrador = ParallelOrchestrator(FaseAgente(erro="Pergunta bloqueada"), FaseAgente("contexto"), sintese)
+
+    eventos = list(orquestrador.run("?", stream=True, stream_events=True, yield_run_output=True))
+    assert [evento.content for evento in eventos] == ["Pergunta bloqueada"]
+    assert eventos[0].event == RunEvent.run_error
+
+    run_output = orquestrador.run("?")
+    assert run_output.status == RunStatus.error
+    assert run_output.content == "Pergunta bloqueada"
+    assert sintese.prompts == []
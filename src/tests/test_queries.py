@@ -0,0 +1,104 @@
+"""
+Consultas do painel (data/queries.py) sobre bancos sintéticos
+"""
+
+from datetime import date
+
+import duckdb
+import pytest
+
+from data import queries
+from data.queries import BRASIL
+from data.ufs import REGIOES, UFS
+from data.versions import resolve_db_path
+from ingestor import SRAGIngestor
+
+# Recorte do drill-down -> UFs equivalentes em get_metrics_data
+RECORTES = {**{uf: [uf] for uf in UFS}, **REGIOES, BRASIL: None}
+
+
+@pytest.fixture(scope="module", params=["duckdb", "parquet"])
+def banco(request, fontes, tmp_path_factory):
+    """Banco carregado por completo em cada armazenamento"""
+    db_path = tmp_path_factory.mktemp(request.param) / "srag.duckdb"
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage=request.param)
+    if request.param == "parquet":
+        ingestor.ingest_parquet()
+    else:
+        ingestor.ingest_sql()
+    return db_path
+
+
+def test_intervalo_gravado_em_metadata(banco, usar_banco):
+    usar_banco(banco)
+    limites = queries.get_data_bounds()
+
+    assert limites["data_min"] == date(2023, 1, 1)
+    assert limites["data_max"] == date(2025, 6, 15)
+    assert set(limites["registros_por_ano"]) == {2023, 2024, 2025}
+
+
+@pytest.mark.parametrize("inicio, fim", [
+    (None, None),
+    ("2024-03-10", "2025-02-20"),
+    ("2023-11-01", "2024-01-31"),
+])
+def test_drilldown_igual_a_get_metrics_data(banco, usar_banco, inicio, fim):
+    usar_banco(banco)
+    drilldown = queries.get_drilldown_metrics(inicio, fim)
+
+    assert set(RECORTES) <= set(drilldown)
+    for recorte, ufs in RECORTES.items():
+        assert drilldown[recorte] == queries.get_metrics_data(inicio, fim, ufs), recorte
+
+
+def test_drilldown_inclui_meses_parciais(banco, usar_banco):
+    usar_banco(banco)
+    brasil = queries.get_drilldown_metrics()[BRASIL]
+    mensal = queries.get_monthly_cases()
+
+    # Janela padrão: de 15/06/2024 a 15/06/2025, com os dois junhos parciais
+    assert len(brasil["taxa_mortalidade_mensal"]) == len(mensal) == 13
+    assert brasil["total_casos"] == mensal["casos"].sum()
+
+
+@pytest.mark.parametrize("ufs", [None, ["AC"], REGIOES["Norte"]])
+def test_janela_sem_casos(banco, usar_banco, ufs):
+    usar_banco(banco)
+    com_casos = queries.get_metrics_data(ufs=ufs)
+    vazia = queries.get_metrics_data("2020-01-01", "2020-12-31", ufs=ufs)
+
+    assert vazia.keys() == com_casos.keys()
+    assert vazia["total_casos"] == 0
+    assert vazia["taxa_aumento"] == 0
+    assert vazia["casos_mensais"] == []
+    assert all(vazia[nome] == 0 and vazia[f"{nome}_mensal"] == [] for nome in queries.TAXAS)
+    assert queries.get_drilldown_metrics("2020-01-01", "2020-12-31") == {}
+
+
+@pytest.mark.parametrize("ufs", [None, ["SP", "RJ"]])
+def test_metricas_iguais_a_srag_cases(banco, usar_banco, ufs):
+    usar_banco(banco)
+    inicio, fim = "2024-03-10", "2025-02-20"
+    metricas = queries.get_metrics_data(inicio, fim, ufs)
+
+    # Mesmas métricas contadas direto nos casos, sem os rollups
+    filtros = ", ".join(f"COUNT(*) FILTER (WHERE {condicao})" for condicao in queries.TAXAS.values())
+    conn = duckdb.connect(str(resolve_db_path(banco)), read_only=True)
+    try:
+        rows = conn.execute(
+            f"""SELECT date_trunc('month', DT_NOTIFIC) AS mes, COUNT(*), {filtros}
+                FROM srag_cases
+                WHERE DT_NOTIFIC BETWEEN $inicio AND $fim
+                  AND ($ufs IS NULL OR list_contains($ufs::VARCHAR[], SG_UF_NOT))
+                GROUP BY mes ORDER BY mes""",
+            {"inicio": inicio, "fim": fim, "ufs": ufs},
+        ).fetchall()
+    finally:
+        conn.close()
+
+    total = sum(row[1] for row in rows)
+    assert metricas["total_casos"] == total
+    for i, nome in enumerate(queries.TAXAS, start=2):
+        assert metricas[nome] == pytest.approx(sum(row[i] for row in rows) / total * 100, abs=0.1)
+        assert metricas[f"{nome}_mensal"] == pytest.approx([row[i] / row[1] * 100 for row in rows], abs=0.1)
@@ -0,0 +1,34 @@
+"""
+Chaves do cache de respostas do agente (cache/response_cache.py)
+"""
+
+import pytest
+
+from cache.response_cache import ResponseCache, normalize_prompt
+
+
+def test_ignora_caixa_acentos_e_pontuacao():
+    assert normalize_prompt("Quantos casos em Setembro de 2025?") == "quantos casos em setembro de 2025"
+    assert normalize_prompt("  Óbitos por covid-19 em São Paulo!  ") == "obitos por covid 19 em sao paulo"
+
+
+@pytest.mark.parametrize("a, b", [
+    ("variação acima de 2.5", "variação acima de 25"),
+    ("variação acima de 2,5", "variação acima de 25"),
+    ("queda de -10%", "queda de 10%"),
+    ("aumento de 10%", "aumento de 10"),
+])
+def test_numeros_diferentes_nao_compartilham_chave(a, b):
+    assert normalize_prompt(a) != normalize_prompt(b)
+
+
+def test_numeros_preservados():
+    assert normalize_prompt("Taxa subiu +2,5% (de -1.5%)?") == "taxa subiu +2,5% de -1.5%"
+
+
+def test_cache_separa_prompts_numericos():
+    cache = ResponseCache()
+    cache.put("casos com variação acima de 2.5", "v1", "resposta 2.5")
+
+    assert cache.get("Casos com variação acima de 2.5?", "v1") == "resposta 2.5"
+    assert cache.get("casos com variação acima de 25", "v1") is None
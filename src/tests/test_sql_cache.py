@@ -0,0 +1,72 @@
+"""
+Cache de resultados SQL das ferramentas DuckDB do agente (cache/sql_cache.py, tools/srag_duckdb.py)
+"""
+
+import pytest
+
+from cache.sql_cache import SQLResultCache, canonicalize_sql
+from data.connection import ReadOnlyConnectionPool
+from ingestor import SRAGIngestor
+from tools.srag_duckdb import SRAGDuckDbTools
+
+
+def test_sql_canonico():
+    assert canonicalize_sql("select  SUM(x) from t -- total\n;") == canonicalize_sql("SELECT sum(x)\nFROM t")
+    assert canonicalize_sql("SELECT * FROM t WHERE uf = 'SP'") != canonicalize_sql("SELECT * FROM t WHERE uf = 'sp'")
+    assert canonicalize_sql("SELECT random()") is None
+    assert canonicalize_sql("DELETE FROM t") is None
+
+
+@pytest.fixture
+def ferramentas(fontes, tmp_path):
+    """Ferramentas DuckDB sobre um banco com 2025 carregado, com cache próprio"""
+    db_path = tmp_path / "srag.duckdb"
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage="duckdb")
+    ingestor.ingest_sql(anos=[2025])
+
+    pool = ReadOnlyConnectionPool(db_path)
+    yield ingestor, SRAGDuckDbTools(pool=pool, cache=SQLResultCache())
+    pool.close()
+
+
+def test_resultado_memorizado_por_versao_dos_dados(ferramentas):
+    ingestor, tools = ferramentas
+    consulta = "SELECT COUNT(*) FROM srag_cases WHERE ano = 2025"
+
+    resultado = tools.run_query(consulta)
+    assert tools.run_query("select count(*) from srag_cases where ano = 2025;") == resultado
+    assert tools.cache.stats()["acertos"] == 1
+
+    # Nova carga: a versão dos dados muda e o resultado é recalculado
+    tools.pool.close()
+    ingestor.ingest_sql(anos=[2024, 2025])
+    assert tools.run_query(consulta) == resultado
+    assert tools.cache.stats()["acertos"] == 1
+
+
+def test_erro_nao_e_memorizado(ferramentas):
+    _, tools = ferramentas
+
+    tools.run_query("SELECT * FROM tabela_inexistente")
+    tools.run_query("SELECT * FROM tabela_inexistente")
+
+    assert tools.cache.stats()["entradas"] == 0
+    assert tools.cache.stats()["acertos"] == 0
+
+
+def test_falha_do_pool_volta_como_texto(ferramentas, tmp_path):
+    _, tools = ferramentas
+
+    # Banco inexistente: a abertura falha antes da consulta
+    ausente = SRAGDuckDbTools(pool=ReadOnlyConnectionPool(tmp_path / "ausente.duckdb"), cache=SQLResultCache())
+    assert isinstance(ausente.run_query("SELECT 1"), str)
+    ausente.pool.close()
+
+    # Pool esgotado: o empréstimo expira
+    esgotado = ReadOnlyConnectionPool(tools.pool.db_path, max_size=1, timeout=0.01)
+    try:
+        with esgotado.connection():
+            resposta = SRAGDuckDbTools(pool=esgotado, cache=SQLResultCache()).run_query("SELECT 1")
+    finally:
+        esgotado.close()
+    assert "Nenhuma conexão livre" in resposta
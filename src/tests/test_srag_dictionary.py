@@ -0,0 +1,59 @@
+"""
+Ferramenta de consulta ao dicionário de variáveis (tools/srag_dictionary.py)
+"""
+
+import json
+
+import duckdb
+
+from data.connection import ReadOnlyConnectionPool
+from ingestor import SRAGIngestor
+from tools.srag_dictionary import SRAGDictionaryTools
+
+
+def test_banco_sem_dicionario_retorna_erro(fontes, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage="duckdb")
+    ingestor.ingest_sql(anos=[2025])
+
+    pool = ReadOnlyConnectionPool(db_path)
+    try:
+        resposta = json.loads(SRAGDictionaryTools(pool=pool).lookup_dictionary("CLASSI_FIN", "5"))
+    finally:
+        pool.close()
+
+    assert "não carregado" in resposta["erro"]
+
+
+def test_consulta_codigo(fontes, tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    ingestor = SRAGIngestor(db_path=str(db_path), urls=fontes, storage="duckdb")
+    ingestor.load_dictionary()
+
+    pool = ReadOnlyConnectionPool(db_path)
+    try:
+        resposta = json.loads(SRAGDictionaryTools(pool=pool).lookup_dictionary("classi_fin", "05"))
+    finally:
+        pool.close()
+
+    assert resposta["variavel"] == "CLASSI_FIN"
+    assert list(resposta["categorias"]) == ["5"]
+    assert "erro" not in resposta
+
+
+def test_categorias_em_ordem_numerica(tmp_path):
+    db_path = tmp_path / "srag.duckdb"
+    conn = duckdb.connect(str(db_path))
+    conn.execute("CREATE TABLE dicionario_variaveis AS SELECT 'FATOR_RISC' AS variavel, 'Fatores de risco' AS descricao")
+    conn.execute("""CREATE TABLE dicionario_categorias AS
+                    SELECT 'FATOR_RISC' AS variavel, codigo, 'Rótulo ' || codigo AS rotulo
+                    FROM unnest(['10', '2', 'X', '1', '9']) AS t(codigo)""")
+    conn.close()
+
+    pool = ReadOnlyConnectionPool(db_path)
+    try:
+        resposta = json.loads(SRAGDictionaryTools(pool=pool).lookup_dictionary("FATOR_RISC"))
+    finally:
+        pool.close()
+
+    assert list(resposta["categorias"]) == ["1", "2", "9", "10", "X"]
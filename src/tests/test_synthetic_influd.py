@@ -0,0 +1,61 @@
+"""
+Gerador de arquivos INFLUD sintéticos (benchmarks/synthetic_influd.py)
+"""
+
+from pathlib import Path
+
+import duckdb
+import pyarrow.parquet as pq
+import pytest
+
+from benchmarks.synthetic_influd import DISTRIBUICOES, PESOS_UF, distribuir_linhas, gerar_dataset
+from ingestor import SRAGIngestor
+
+ANOS = [2020, 2024, 2030]
+
+
+@pytest.mark.parametrize("linhas", [0, 1, 999, 10_001])
+def test_distribuicao_soma_o_total(linhas):
+    por_ano = distribuir_linhas(linhas, ANOS)
+
+    assert list(por_ano) == ANOS
+    assert sum(por_ano.values()) == linhas
+    # Pandemia pesa mais; anos fora de PESOS_ANO recebem o peso médio
+    if linhas > 1000:
+        assert por_ano[2020] > por_ano[2030] > por_ano[2024]
+
+
+def test_dataset_deterministico_e_reaproveitado(tmp_path):
+    fontes = gerar_dataset(tmp_path / "a", 6_000, anos=ANOS, bloco=1_000)
+    mesmas = gerar_dataset(tmp_path / "b", 6_000, anos=ANOS, bloco=1_000)
+
+    assert list(fontes) == ANOS
+    for ano in ANOS:
+        assert pq.read_table(fontes[ano]).equals(pq.read_table(mesmas[ano]))
+
+    # Arquivo com a quantidade esperada de registros não é regerado
+    modificados = {ano: Path(fontes[ano]).stat().st_mtime_ns for ano in ANOS}
+    assert gerar_dataset(tmp_path / "a", 6_000, anos=ANOS) == fontes
+    assert {ano: Path(fontes[ano]).stat().st_mtime_ns for ano in ANOS} == modificados
+
+
+def test_formato_bruto_do_opendatasus(tmp_path):
+    fontes = gerar_dataset(tmp_path, 6_000, anos=ANOS, bloco=1_000)
+    por_ano = distribuir_linhas(6_000, ANOS)
+
+    for ano, fonte in fontes.items():
+        tabela = pq.read_table(fonte)
+        assert tabela.column_names == SRAGIngestor.COLUNAS
+        assert tabela.num_rows == por_ano[ano]
+
+        notificacoes, datas_validas, ano_min, ano_max = duckdb.execute(
+            f"""SELECT COUNT(DISTINCT NU_NOTIFIC), COUNT(TRY_CAST(DT_NOTIFIC AS DATE)),
+                       MIN(year(DT_NOTIFIC::DATE)), MAX(year(DT_NOTIFIC::DATE))
+                FROM read_parquet('{fonte}')"""
+        ).fetchone()
+        assert notificacoes == datas_validas == tabela.num_rows
+        assert ano_min == ano_max == ano
+
+        assert set(tabela.column("SG_UF_NOT").to_pylist()) <= set(PESOS_UF)
+        for coluna, distribuicao in DISTRIBUICOES.items():
+            assert set(tabela.column(coluna).to_pylist()) <= set(distribuicao), coluna
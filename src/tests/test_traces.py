@@ -0,0 +1,72 @@
+"""
+Resumo das execuções e banco de traces (observability/traces.py)
+"""
+
+import json
+import sqlite3
+
+import pytest
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ToolExecution
+from agno.run import RunStatus
+from agno.run.agent import RunOutput
+
+from observability.traces import MAX_TOOL_ARGS_CHARS, create_traces_db, summarize_run
+
+
+def test_resumo_sem_mensagens_e_com_argumentos_truncados():
+    sql = "SELECT COUNT(*) FROM srag_cases WHERE " + " OR ".join(f"SG_UF_NOT = 'UF{i}'" for i in range(100))
+    run_output = RunOutput(
+        run_id="run-1",
+        session_id="sessao-1",
+        model="gpt-5.1",
+        status=RunStatus.completed,
+        content="Foram 10 casos.",
+        messages=[Message(role="user", content="Quantos casos?"), Message(role="assistant", content="Foram 10 casos.")],
+        metrics=Metrics(input_tokens=1200, output_tokens=80, total_tokens=1280, duration=2.34567, time_to_first_token=0.4321),
+        tools=[
+            ToolExecution(tool_name="run_query", tool_args={"query": sql}, metrics=Metrics(duration=0.01234)),
+            ToolExecution(tool_name="search_news", tool_args={"query": "SRAG SP"}, tool_call_error=True),
+        ],
+        metadata={"fases": {"dados": {"duracao": 1.2}}},
+    )
+
+    resumo = summarize_run(run_output)
+
+    assert resumo["run_id"] == "run-1"
+    assert resumo["status"] == "COMPLETED"
+    assert resumo["tokens"] == {"entrada": 1200, "saida": 80, "total": 1280}
+    assert (resumo["duracao"], resumo["tempo_primeiro_token"]) == (2.346, 0.432)
+    assert resumo["metadata"] == run_output.metadata
+
+    consulta, busca = resumo["ferramentas"]
+    assert consulta["nome"] == "run_query"
+    assert len(consulta["argumentos"]) == MAX_TOOL_ARGS_CHARS + 1 and consulta["argumentos"].endswith("…")
+    assert (consulta["duracao"], consulta["erro"]) == (0.012, False)
+    assert busca == {"nome": "search_news", "argumentos": "{'query': 'SRAG SP'}", "duracao": None, "erro": True}
+
+    # Mensagens e conteúdo completos ficam só no banco de traces
+    serializado = json.dumps(resumo, ensure_ascii=False)
+    assert "Quantos casos?" not in serializado and "Foram 10 casos." not in serializado
+
+
+def test_resumo_de_execucao_sem_metricas():
+    resumo = summarize_run(RunOutput(run_id="run-2", status=RunStatus.error))
+
+    assert resumo == {"run_id": "run-2", "session_id": None, "status": "ERROR", "modelo": None, "ferramentas": []}
+
+
+def test_banco_de_traces_em_wal(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    db_file = tmp_path / "traces" / "traces.db"
+
+    db = create_traces_db(db_file)
+    with db.db_engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+
+    conn = sqlite3.connect(db_file)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    finally:
+        conn.close()
@@ -0,0 +1,56 @@
+"""
+Normalização das buscas do cache web (cache/web_cache.py)
+"""
+
+from datetime import date
+
+import pytest
+
+from cache.web_cache import WebSearchCache, parse_search_query
+from data.ufs import UFS
+from tools.srag_websearch import get_prefetch_queries
+
+
+@pytest.mark.parametrize("consulta, uf", [
+    ("InfoGripe SP setembro 2025", "SP"),
+    ("boletim infogripe de São Paulo 09/2025", "SP"),
+    ("boletim MS SRAG junho 2025", ""),
+    ("nota técnica do MS sobre SRAG", ""),
+    ("SRAG no estado MS junho 2025", "MS"),
+    ("SRAG UF PE 2025", "PE"),
+    ("SRAG Mato Grosso do Sul junho 2025", "MS"),
+])
+def test_uf_da_busca(consulta, uf):
+    assert parse_search_query(consulta)[0] == uf
+
+
+def test_mesma_busca_escrita_de_outra_forma():
+    assert parse_search_query("InfoGripe SP setembro 2025") == ("SP", "2025-09", "infogripe")
+    assert parse_search_query("boletim infogripe de São Paulo 09/2025") == ("SP", "2025-09", "infogripe")
+
+
+def test_pre_carga_cobre_nacional_e_cada_uf():
+    ufs = {parse_search_query(consulta)[0] for consulta in get_prefetch_queries(date(2025, 6, 1))}
+    assert ufs == {""} | set(UFS)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return WebSearchCache(path=tmp_path / "web_cache.db")
+
+
+def test_reaproveita_busca_escrita_de_outra_forma(cache):
+    cache.put("news", "InfoGripe SP setembro 2025", 5, [{"title": "InfoGripe SP"}])
+
+    assert cache.get("news", "boletim infogripe de São Paulo 09/2025", 5) == [{"title": "InfoGripe SP"}]
+
+
+@pytest.mark.parametrize("guardada, consulta", [
+    ("boletim InfoGripe SRAG influenza SP setembro 2025", "boletim InfoGripe SRAG VSR SP setembro 2025"),
+    ("surto influenza A", "surto influenza B"),
+])
+def test_termos_parecidos_nao_compartilham_resultado(cache, guardada, consulta):
+    cache.put("news", guardada, 5, [{"title": guardada}])
+
+    assert cache.get("news", consulta, 5) is None
+    assert cache.get("news", guardada, 5) == [{"title": guardada}]
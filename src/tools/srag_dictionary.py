@@ -0,0 +1,86 @@
+"""
+Consulta exata ao dicionário de variáveis SRAG gravado no DuckDB
+"""
+
+import json
+from typing import Optional
+
+import duckdb
+from agno.tools import Toolkit
+
+from data.connection import ReadOnlyConnectionPool, get_pool
+from observability.metrics import get_stage_metrics
+
+
+class SRAGDictionaryTools(Toolkit):
+    """
+    Traduz variáveis e códigos do SRAG com uma leitura indexada no DuckDB.
+
+    Substitui a busca vetorial no PDF do dicionário quando a pergunta é sobre
+    o significado de um código (ex.: CLASSI_FIN = 5), devolvendo só a linha
+    necessária em vez de vários chunks do documento.
+    """
+
+    def __init__(self, pool: Optional[ReadOnlyConnectionPool] = None, **kwargs):
+        """
+        Inicializa o toolkit
+
+        Args:
+            pool: Pool de conexões (None = pool compartilhado do processo)
+            **kwargs: Argumentos repassados ao Toolkit
+        """
+        self.pool = pool or get_pool()
+        super().__init__(name="srag_dictionary_tools", tools=[self.lookup_dictionary], **kwargs)
+
+    def lookup_dictionary(self, variable: str, code: Optional[str] = None) -> str:
+        """
+        Consulta o dicionário de variáveis do SRAG (DATASUS) por nome exato.
+
+        Use para traduzir códigos técnicos em termos humanos, por exemplo
+        CLASSI_FIN = 5 → "SRAG por covid-19", ou para saber o que uma coluna significa.
+
+        Args:
+            variable: Nome da variável/coluna (ex.: CLASSI_FIN, EVOLUCAO, SUPORT_VEN)
+            code: Código da categoria (ex.: "5"). Se omitido, retorna todas as categorias.
+
+        Returns:
+            JSON com a descrição da variável e suas categorias (código → rótulo)
+        """
+        variavel = variable.strip().upper()
+        codigo = str(code).strip() if code is not None else None
+        if codigo is not None and codigo.isdigit():
+            codigo = str(int(codigo))
+
+        try:
+            with get_stage_metrics().timed("dicionario"), self.pool.connection() as conn:
+                linha = conn.execute(
+                    "SELECT descricao FROM dicionario_variaveis WHERE variavel = ?", [variavel]
+                ).fetchone()
+
+                if linha is None:
+                    return json.dumps({"erro": f"Variável {variavel} não encontrada no dicionário"}, ensure_ascii=False)
+
+                if codigo is None:
+                    categorias = conn.execute(
+                        "SELECT codigo, rotulo FROM dicionario_categorias WHERE variavel = ? "
+                        "ORDER BY TRY_CAST(codigo AS INTEGER) NULLS LAST, codigo",
+                        [variavel]
+                    ).fetchall()
+                else:
+                    categorias = conn.execute(
+                        "SELECT codigo, rotulo FROM dicionario_categorias WHERE variavel = ? AND codigo = ?",
+                        [variavel, codigo]
+                    ).fetchall()
+
+        except duckdb.CatalogException:
+            # Banco montado sem load_dictionary(): as tabelas do dicionário não existem
+            return json.dumps(
+                {"erro": "Dicionário de variáveis não carregado no banco (execute python src/ingestor.py --dicionario)"},
+                ensure_ascii=False
+            )
+
+        resultado = {"variavel": variavel, "descricao": linha[0], "categorias": dict(categorias)}
+        if codigo is not None and not categorias:
+            resultado["erro"] = f"Código {codigo} não consta nas categorias de {variavel}"
+
+        return json.dumps(resultado, ensure_ascii=False)
@@ -0,0 +1,127 @@
+"""
+DuckDbTools do agente apoiado no pool de conexões somente leitura compartilhado
+e no cache de resultados SQL
+"""
+
+import threading
+from typing import Optional, Tuple
+
+import duckdb
+from agno.tools.duckdb import DuckDbTools
+from agno.utils.log import log_debug, log_info
+
+from cache.sql_cache import SQLResultCache, get_sql_cache
+from data.connection import ReadOnlyConnectionPool, get_pool
+from data.queries import read_data_version
+from observability.metrics import get_stage_metrics
+
+# Ferramentas de leitura expostas ao agente (as de carga/exportação ficam de fora)
+READ_ONLY_TOOLS = ["show_tables", "describe_table", "inspect_query", "run_query", "summarize_table"]
+
+
+class SRAGDuckDbTools(DuckDbTools):
+    """
+    DuckDbTools que empresta um cursor do pool compartilhado a cada consulta.
+
+    O agente, o dashboard e demais consumidores passam a dividir o mesmo pool,
+    em vez de cada um abrir (e manter) o seu próprio handle para o arquivo.
+    Resultados de consultas de leitura são memorizados por SQL canônico e
+    versão dos dados; erros nunca são cacheados.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ReadOnlyConnectionPool] = None,
+        cache: Optional[SQLResultCache] = None,
+        use_cache: bool = True,
+        **kwargs
+    ):
+        """
+        Inicializa o toolkit
+
+        Args:
+            pool: Pool de conexões (None = pool compartilhado do processo)
+            cache: Cache de resultados (None = cache compartilhado do processo)
+            use_cache: Se False, toda consulta vai ao banco
+            **kwargs: Argumentos repassados ao DuckDbTools
+        """
+        kwargs.setdefault("include_tools", READ_ONLY_TOOLS)
+        super().__init__(read_only=True, **kwargs)
+        self.pool = pool or get_pool()
+        self.cache = (cache or get_sql_cache()) if use_cache else None
+        self.metrics = get_stage_metrics()
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> duckdb.DuckDBPyConnection:
+        """Cursor emprestado pela chamada em andamento nesta thread"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            raise RuntimeError("SRAGDuckDbTools só acessa o banco dentro de run_query")
+        return cursor
+
+    def _execute(self, formatted_sql: str) -> Tuple[str, int]:
+        """
+        Executa a consulta e formata a saída como o DuckDbTools (exceções são propagadas)
+
+        Returns:
+            Saída formatada e quantidade de linhas retornadas
+        """
+        query_result = self.connection.sql(formatted_sql)
+        if query_result is None:
+            return "No output", 0
+
+        try:
+            result_rows = []
+            for row in query_result.fetchall():
+                if len(row) == 1:
+                    result_rows.append(str(row[0]))
+                else:
+                    result_rows.append(",".join(str(x) for x in row))
+            return ",".join(query_result.columns) + "\n" + "\n".join(result_rows), len(result_rows)
+        except AttributeError:
+            return str(query_result), 0
+
+    def run_query(self, query: str) -> str:
+        """Function that runs a query and returns the result.
+
+        :param query: SQL query to run
+        :return: Result of the query
+        """
+        # Mesma formatação do DuckDbTools: sem crases e só a primeira instrução
+        formatted_sql = query.replace("`", "").split(";")[0]
+
+        with self.metrics.timed("duckdb") as extras:
+            # Como no DuckDbTools, qualquer erro (pool esgotado, banco ausente,
+            # SQL inválido) volta ao agente como texto
+            try:
+                with self.pool.connection() as cursor:
+                    chave = None
+                    if self.cache is not None:
+                        try:
+                            chave = self.cache.make_key(formatted_sql, read_data_version(cursor))
+                        except duckdb.Error:
+                            # Sem tabela metadata não há versão confiável: consulta direto
+                            chave = None
+                    if chave is not None:
+                        resultado = self.cache.get(chave)
+                        if resultado is not None:
+                            log_info(f"Running (cache): {formatted_sql}")
+                            extras["cache"] = 1
+                            return resultado
+
+                    log_info(f"Running: {formatted_sql}")
+                    self._local.cursor = cursor
+                    try:
+                        resultado, extras["linhas"] = self._execute(formatted_sql)
+                    finally:
+                        self._local.cursor = None
+            except Exception as e:
+                extras["erro"] = 1
+                return str(e)
+            extras["cache"] = 0
+
+        log_debug(f"Query result: {resultado}")
+        if chave is not None:
+            self.cache.put(chave, resultado)
+        return resultado
@@ -0,0 +1,238 @@
+"""
+Busca na web do agente com cache persistente, backends intercambiáveis e
+pré-carga dos boletins mais consultados
+"""
+
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from agno.tools import Toolkit
+from agno.utils.log import log_debug
+
+from cache.web_cache import WebSearchCache, get_web_cache, parse_search_query, term_similarity
+from data.ufs import MESES, UFS
+from observability.metrics import get_stage_metrics
+
+logger = logging.getLogger(__name__)
+
+# "ddgs": meta-busca real (DuckDuckGo, Bing...); "local": resultados fixos, sem rede (testes/offline)
+WEBSEARCH_BACKEND = os.getenv("SRAG_WEBSEARCH_BACKEND", "ddgs")
+
+# Buscas pré-carregadas após cada ingestão ({uf} vazio = nacional)
+PREFETCH_QUERIES = [
+    "boletim InfoGripe Fiocruz SRAG {uf} {mes} {ano}",
+    "Ministério da Saúde síndrome respiratória aguda grave {uf} {mes} {ano}",
+]
+
+
+class DDGSBackend:
+    """Backend de busca real, via meta-busca DDGS (mesmo usado pelo WebSearchTools)"""
+
+    def __init__(self, backend: str = "auto", proxy: Optional[str] = None, timeout: Optional[int] = 10, verify_ssl: bool = True):
+        self.backend = backend
+        self.proxy = proxy
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+
+    def search(self, tipo: str, consulta: str, max_resultados: int) -> List[Dict]:
+        """Executa a busca ("text" ou "news")"""
+        # Import tardio: o backend local não depende do ddgs
+        from ddgs import DDGS
+
+        with DDGS(proxy=self.proxy, timeout=self.timeout, verify=self.verify_ssl) as ddgs:
+            buscar = ddgs.news if tipo == "news" else ddgs.text
+            return buscar(query=consulta, max_results=max_resultados, backend=self.backend)
+
+
+class LocalSearchBackend:
+    """
+    Backend sem rede para testes e ambientes offline
+
+    Devolve os resultados de um arquivo JSON ({"consulta": [resultados]}),
+    escolhendo a entrada de mesma UF e período com mais termos em comum; sem
+    correspondência, gera resultados sintéticos determinísticos.
+    """
+
+    def __init__(self, path: Optional[Path] = None, resultados: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Args:
+            path: Arquivo JSON com os resultados fixos
+            resultados: Resultados fixos em memória (somados aos do arquivo)
+        """
+        self.resultados: Dict[str, List[Dict]] = {}
+        if path is not None and Path(path).exists():
+            with open(path, encoding="utf-8") as f:
+                self.resultados.update(json.load(f))
+        self.resultados.update(resultados or {})
+        self.buscas: List[str] = []
+
+    def search(self, tipo: str, consulta: str, max_resultados: int) -> List[Dict]:
+        """Retorna os resultados fixos mais próximos da consulta"""
+        self.buscas.append(consulta)
+        uf, periodo, termos = parse_search_query(consulta)
+
+        candidatos = []
+        for chave, resultados in self.resultados.items():
+            c_uf, c_periodo, c_termos = parse_search_query(chave)
+            if (c_uf, c_periodo) == (uf, periodo):
+                candidatos.append((term_similarity(termos, c_termos), resultados))
+        if candidatos:
+            return max(candidatos, key=lambda c: c[0])[1][:max_resultados]
+
+        return [
+            {
+                "title": f"Resultado {i + 1} para {consulta}",
+                "href": f"https://exemplo.local/{tipo}/{i + 1}",
+                "body": f"Resultado local de teste ({tipo}) para a busca: {consulta}",
+            }
+            for i in range(max_resultados)
+        ]
+
+
+def get_search_backend(**kwargs):
+    """Backend de busca configurado em SRAG_WEBSEARCH_BACKEND"""
+    if WEBSEARCH_BACKEND == "local":
+        return LocalSearchBackend(path=os.getenv("SRAG_WEBSEARCH_FIXTURES"))
+    return DDGSBackend(**kwargs)
+
+
+class SRAGWebSearchTools(Toolkit):
+    """
+    Busca na web e de notícias com cache persistente por consulta normalizada.
+
+    Mantém os nomes e a assinatura das funções do WebSearchTools (web_search,
+    search_news); apenas a origem dos resultados muda: primeiro o cache local,
+    depois o backend configurado.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        cache: Optional[WebSearchCache] = None,
+        use_cache: bool = True,
+        fixed_max_results: Optional[int] = None,
+        modifier: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Inicializa o toolkit
+
+        Args:
+            backend: Backend de busca (None = get_search_backend())
+            cache: Cache de resultados (None = cache compartilhado do processo)
+            use_cache: Se False, toda busca vai ao backend
+            fixed_max_results: Quantidade fixa de resultados por busca
+            modifier: Texto prefixado às buscas na web
+            **kwargs: Argumentos repassados ao Toolkit
+        """
+        self.backend = backend or get_search_backend()
+        self.cache = (cache or get_web_cache()) if use_cache else None
+        self.fixed_max_results = fixed_max_results
+        self.modifier = modifier
+        super().__init__(name="websearch", tools=[self.web_search, self.search_news], **kwargs)
+
+    def search(self, tipo: str, consulta: str, max_resultados: int) -> List[Dict]:
+        """Busca no cache e, se não houver resultado válido, no backend"""
+        with get_stage_metrics().timed("busca_web") as extras:
+            if self.cache is not None:
+                resultados = self.cache.get(tipo, consulta, max_resultados)
+                if resultados is not None:
+                    log_debug(f"Web search ({tipo}) from cache: {consulta}")
+                    extras.update(cache=1, resultados=len(resultados))
+                    return resultados
+
+            log_debug(f"Searching web ({tipo}) for: {consulta}")
+            resultados = self.backend.search(tipo, consulta, max_resultados)
+            extras.update(cache=0, resultados=len(resultados))
+            # Buscas sem resultado não são guardadas: podem ser falha momentânea
+            if self.cache is not None and resultados:
+                self.cache.put(tipo, consulta, max_resultados, resultados)
+            return resultados
+
+    def web_search(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search the web for a query.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The search results from the web.
+        """
+        search_query = f"{self.modifier} {query}" if self.modifier else query
+        return json.dumps(self.search("text", search_query, self.fixed_max_results or max_results), indent=2)
+
+    def search_news(self, query: str, max_results: int = 5) -> str:
+        """Use this function to get the latest news from the web.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The latest news from the web.
+        """
+        return json.dumps(self.search("news", query, self.fixed_max_results or max_results), indent=2)
+
+
+def get_prefetch_queries(referencia: Optional[date] = None) -> List[str]:
+    """
+    Buscas pré-carregadas: boletins do mês de referência, nacionais e por UF
+
+    Args:
+        referencia: Data cujo mês é usado (None = hoje)
+
+    Returns:
+        Lista de consultas
+    """
+    referencia = referencia or date.today()
+    mes, ano = MESES[referencia.month - 1], referencia.year
+
+    consultas = []
+    for modelo in PREFETCH_QUERIES:
+        # Nome por extenso: siglas como MS só valem como UF com contexto explícito
+        for uf in [""] + list(UFS.values()):
+            consultas.append(re.sub(r"\s+", " ", modelo.format(uf=uf, mes=mes, ano=ano)).strip())
+    return consultas
+
+
+def prefetch_news(
+    tools: Optional[SRAGWebSearchTools] = None,
+    referencia: Optional[date] = None,
+    max_workers: int = 4,
+) -> int:
+    """
+    Aquece o cache com as buscas de notícias mais comuns
+
+    Consultas já presentes no cache (dentro do TTL) não são refeitas.
+
+    Args:
+        tools: Toolkit usado nas buscas (None = um com backend e cache padrão)
+        referencia: Data cujo mês é pré-carregado (None = hoje)
+        max_workers: Buscas simultâneas
+
+    Returns:
+        Quantidade de consultas que resultaram em resultados no cache
+    """
+    tools = tools or SRAGWebSearchTools(fixed_max_results=5)
+    consultas = get_prefetch_queries(referencia)
+    max_resultados = tools.fixed_max_results or 5
+
+    def buscar(consulta: str) -> bool:
+        try:
+            return bool(tools.search("news", consulta, max_resultados))
+        except Exception as e:
+            logger.warning(f"Falha ao pré-carregar '{consulta}': {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        total = sum(executor.map(buscar, consultas))
+
+    logger.info(f"📰 Cache de notícias aquecido: {total}/{len(consultas)} buscas")
+    return total
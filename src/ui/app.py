@@ -8,13 +8,26 @@ import json
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data.queries import get_metrics_data, get_daily_cases, get_monthly_cases
-from agent import agent
-from agno.db.sqlite import SqliteDb
+from data.queries import (
+    BRASIL, get_metrics_data, get_daily_cases, get_monthly_cases, get_data_version, get_drilldown_metrics
+)
+from data.ufs import REGIOES, UFS
+from agent import get_runner, warm_up_agent
+from cache.response_cache import get_response_cache
+from observability.traces import summarize_run
+from agno.run import RunStatus
+from ui.chat_stream import stream_agent_response
 
 get_metrics_data = st.cache_data(ttl=3600)(get_metrics_data)
 get_daily_cases = st.cache_data(ttl=3600)(get_daily_cases)
 get_monthly_cases = st.cache_data(ttl=3600)(get_monthly_cases)
+get_drilldown_metrics = st.cache_data(ttl=3600)(get_drilldown_metrics)
+
+# Recortes do painel: Brasil, macrorregiões e UFs
+RECORTES = [BRASIL, *REGIOES, *sorted(UFS)]
+
+# Respostas da sessão que mantêm o resumo do trace (as mais antigas o descartam)
+MAX_SESSION_TRACES = 20
 
 st.set_page_config(
     page_title="Indicium HealthCare Inc.",
@@ -24,8 +37,18 @@ st.set_page_config(
 
 st.title("🏥 Indicium HealthCare Inc.")
 
-# Carrega dados das métricas
-metrics = get_metrics_data()
+col_recorte, _ = st.columns([1, 3])
+with col_recorte:
+    recorte = st.selectbox(
+        "📍 Recorte", RECORTES,
+        format_func=lambda r: f"{r} - {UFS[r]}" if r in UFS else r
+    )
+ufs_recorte = None if recorte == BRASIL else [recorte] if recorte in UFS else REGIOES[recorte]
+sufixo_recorte = "" if recorte == BRASIL else f" - {recorte}"
+
+# Carrega dados das métricas: todos os recortes saem de uma leitura do cubo
+# srag_cubo_uf, na mesma janela dos gráficos; sem o cubo, consulta os rollups
+metrics = get_drilldown_metrics().get(recorte) or get_metrics_data(ufs=ufs_recorte)
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -54,7 +77,7 @@ col_graficos, col_chat = st.columns([65, 35])
 with col_graficos:
 
     # ----------------- GRÁFICO DIÁRIO -----------------
-    df_diario = get_daily_cases()
+    df_diario = get_daily_cases(ufs=ufs_recorte)
     
     if df_diario.empty:
         st.warning("Nenhum dado disponível para o gráfico diário.")
@@ -81,7 +104,7 @@ with col_graficos:
     )
 
     fig_diario.update_layout(
-        title="Número diário de casos de SRAG (últimos 30 dias)",
+        title=f"Número diário de casos de SRAG (últimos 30 dias){sufixo_recorte}",
         template="plotly_white",
         height=380,
         dragmode=False,
@@ -106,7 +129,7 @@ with col_graficos:
     )
 
     # ----------------- GRÁFICO MENSAL -----------------
-    df_mensal = get_monthly_cases()
+    df_mensal = get_monthly_cases(ufs=ufs_recorte)
     
     if df_mensal.empty:
         st.warning("Nenhum dado disponível para o gráfico mensal.")
@@ -130,7 +153,7 @@ with col_graficos:
     )
 
     fig_mensal.update_layout(
-        title="Número mensal de casos de SRAG (últimos 12 meses)",
+        title=f"Número mensal de casos de SRAG (últimos 12 meses){sufixo_recorte}",
         template="plotly_white",
         height=380,
         dragmode=False,
@@ -160,6 +183,12 @@ with col_chat:
 
     show_traces = st.toggle("🔍 Mostrar Traces", value=False, help="Exibe os traces de execução em JSON")
 
+    cache_stats = get_response_cache().stats()
+    st.caption(
+        f"⚡ Cache de respostas: {cache_stats['taxa_acerto']:.0f}% de acerto "
+        f"({cache_stats['acertos']}/{cache_stats['acertos'] + cache_stats['falhas']} perguntas)"
+    )
+
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
@@ -173,35 +202,49 @@ with col_chat:
 
     prompt = st.chat_input("Digite sua mensagem...")
 
+    # O dashboard já foi desenhado: o agente termina de carregar em segundo plano
+    warm_up_agent()
+
     if prompt:
         st.session_state.messages.append({
             "role": "user",
             "content": prompt
         })
 
-        with st.spinner("🤔 Analisando sua pergunta..."):
-            try:
-                run_output = agent.run(prompt, markdown=True)
-                response = run_output.content
-                
-                trace_data = {}
-                
-                if hasattr(run_output, 'model_dump'):
-                    trace_data = run_output.model_dump()
-                elif hasattr(run_output, '__dict__'):
-                    trace_data = {
-                        k: v for k, v in run_output.__dict__.items() 
-                        if not k.startswith('_')
-                    }
-                
+        # Perguntas repetidas sobre a mesma versão dos dados saem do cache
+        response_cache = get_response_cache()
+        versao_dados = get_data_version()
+        resposta_cache = response_cache.get(prompt, versao_dados)
+
+        if resposta_cache is not None:
+            response = resposta_cache["content"]
+            trace_data = {**resposta_cache["trace"], "cache": "hit"}
+        else:
+            with st.chat_message("user"):
+                st.markdown(prompt)
+
+            with st.chat_message("assistant"):
+                status = st.status("🤔 Analisando sua pergunta...", expanded=False)
+                placeholder = st.empty()
                 try:
-                    db = SqliteDb(db_file="tmp/traces.db")
-                except Exception as db_error:
-                    trace_data["db_error"] = str(db_error)
-                
-            except Exception as e:
-                response = f"❌ Desculpe, ocorreu um erro ao processar sua pergunta: {str(e)}"
-                trace_data = {"error": str(e)}
+                    response, run_output = stream_agent_response(get_runner(), prompt, status, placeholder)
+                    
+                    # O trace completo é gravado em segundo plano no banco de traces;
+                    # a sessão guarda apenas o resumo
+                    if run_output is None:
+                        trace_data = {"error": response}
+                    else:
+                        trace_data = summarize_run(run_output)
+                    
+                    # Só respostas completas (sem bloqueio de guardrail ou erro) vão para o cache
+                    if getattr(run_output, "status", None) == RunStatus.completed:
+                        response_cache.put(prompt, versao_dados, {"content": response, "trace": trace_data})
+                    
+                except Exception as e:
+                    response = f"❌ Desculpe, ocorreu um erro ao processar sua pergunta: {str(e)}"
+                    trace_data = {"error": str(e)}
+                    status.update(label="⚠️ Execução interrompida", state="error")
+                    placeholder.markdown(response)
 
         # Armazena a mensagem com trace
         message_data = {
@@ -214,4 +257,9 @@ with col_chat:
             
         st.session_state.messages.append(message_data)
 
+        # Só as respostas mais recentes mantêm o trace na sessão
+        respostas = [m for m in st.session_state.messages if m["role"] == "assistant"]
+        for msg in respostas[:-MAX_SESSION_TRACES]:
+            msg.pop("trace", None)
+
         st.rerun()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Exibição em streaming da resposta do agente no chat da interface
+
+Separado de app.py (script do Streamlit) para poder ser usado e testado sem
+a interface: recebe quem responde (agente ou orquestrador) e os containers
+onde o progresso e a resposta são escritos.
+"""
+
+import time
+from typing import Any, Optional, Tuple
+
+from agno.run import RunStatus
+from agno.run.agent import RunEvent, RunOutput
+
+from observability.metrics import StageMetrics, get_stage_metrics
+
+# Progresso exibido enquanto o agente executa cada ferramenta
+TOOL_PROGRESS = {
+    "run_query": "🦆 Consultando DuckDB…",
+    "show_tables": "🦆 Consultando DuckDB…",
+    "describe_table": "🦆 Consultando DuckDB…",
+    "inspect_query": "🦆 Consultando DuckDB…",
+    "summarize_table": "🦆 Consultando DuckDB…",
+    "lookup_dictionary": "📖 Consultando o dicionário de variáveis…",
+    "search_knowledge_base": "📖 Consultando o dicionário de variáveis…",
+    "web_search": "📰 Buscando notícias…",
+    "search_news": "📰 Buscando notícias…",
+}
+
+
+def stream_agent_response(
+    runner, prompt: str, status, placeholder, metrics: Optional[StageMetrics] = None
+) -> Tuple[str, Optional[RunOutput]]:
+    """
+    Executa o agente em modo streaming, exibindo os tokens e o progresso das ferramentas
+
+    Args:
+        runner: Agente ou orquestrador (ver agent.get_runner)
+        prompt: Pergunta do usuário
+        status: Container st.status que recebe o progresso
+        placeholder: Container st.empty onde a resposta é escrita
+        metrics: Registro de latências (None = registro compartilhado do processo)
+
+    Returns:
+        Texto da resposta e RunOutput final (None se a execução falhou)
+    """
+    partes = []
+    run_output = None
+    erro: Any = None
+    metrics = metrics or get_stage_metrics()
+    inicio = time.perf_counter()
+
+    eventos = runner.run(prompt, markdown=True, stream=True, stream_events=True, yield_run_output=True)
+    for evento in eventos:
+        if isinstance(evento, RunOutput):
+            run_output = evento
+            continue
+
+        tipo = getattr(evento, "event", None)
+        if tipo == RunEvent.pre_hook_started:
+            status.update(label="🛡️ Verificando a pergunta…")
+        elif tipo == RunEvent.tool_call_started:
+            nome = evento.tool.tool_name if evento.tool else None
+            rotulo = TOOL_PROGRESS.get(nome, f"🔧 Executando {nome}…")
+            status.update(label=rotulo)
+            status.write(rotulo)
+        elif tipo == RunEvent.run_content and evento.content:
+            if not partes:
+                metrics.record("primeira_saida_visivel", time.perf_counter() - inicio)
+            partes.append(str(evento.content))
+            placeholder.markdown("".join(partes) + "▌")
+        elif tipo == RunEvent.run_error:
+            erro = evento.content
+
+    if run_output is not None and run_output.status == RunStatus.completed:
+        resposta = run_output.content if run_output.content is not None else "".join(partes)
+        status.update(label="✅ Resposta pronta", state="complete")
+    else:
+        resposta = erro or (run_output.content if run_output is not None else None) or "".join(partes)
+        status.update(label="⚠️ Execução interrompida", state="error")
+
+    placeholder.markdown(resposta)
+
+    metrics.record("resposta_completa", time.perf_counter() - inicio)
+    if run_output is not None:
+        # No modo paralelo o RunOutput final é o da síntese (as fases são registradas pelo orquestrador)
+        metrics.record_run(run_output, origem="sintese" if "fases" in (run_output.metadata or {}) else "agente")
+
+    return resposta, run_output
@@ -0,0 +1,56 @@
+import streamlit as st
+import pandas as pd
+from pathlib import Path
+import sys
+import json
+
+# Adiciona o diretório src ao path para importar módulos
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from observability.metrics import get_stage_metrics
+from cache.response_cache import get_response_cache
+from cache.sql_cache import get_sql_cache
+
+st.set_page_config(
+    page_title="Painel administrativo | SRAG Agent",
+    page_icon="🛠️",
+    layout="wide"
+)
+
+st.title("🛠️ Latência por etapa")
+st.caption(
+    "Guardrails, consultas ao DuckDB, busca na web, base de conhecimento e chamadas ao LLM "
+    "desde o início do processo (amostras mais recentes de cada etapa)."
+)
+
+metrics = get_stage_metrics()
+resumo = metrics.summary()
+
+if not resumo:
+    st.info("Nenhuma execução registrada ainda. Faça uma pergunta ao agente no chat.")
+else:
+    df = pd.DataFrame(resumo).set_index("etapa")
+
+    st.dataframe(df, use_container_width=True)
+
+    st.subheader("p95 por etapa (ms)")
+    st.bar_chart(df["p95_ms"].sort_values(ascending=False))
+
+col_exportar, col_caches, col_limpar = st.columns(3)
+
+with col_exportar:
+    incluir_amostras = st.checkbox("Incluir amostras individuais", value=False)
+    st.download_button(
+        "⬇️ Exportar JSON",
+        data=json.dumps(metrics.export(include_samples=incluir_amostras), ensure_ascii=False, indent=2),
+        file_name="latencia_etapas.json",
+        mime="application/json"
+    )
+
+with col_caches:
+    st.json({"respostas": get_response_cache().stats(), "sql": get_sql_cache().stats()}, expanded=False)
+
+with col_limpar:
+    if st.button("🗑️ Zerar amostras"):
+        metrics.reset()
+        st.rerun()